@@ -12,7 +12,7 @@ from abc import abstractmethod
 from collections.abc import Callable
 from copy import deepcopy
 from enum import Enum
-from typing import Any, Collection, Dict, Mapping, Optional, TypeVar, overload
+from typing import Any, Collection, Dict, Mapping, Optional, Sequence, TypeVar, overload
 
 import pandas as pd
 from lories._core._configurations import Configurations
@@ -121,8 +121,9 @@ class _Channel(_Resource):
     @abstractmethod
     def to_series(self, state: bool = False) -> pd.Series: ...
 
+    # noinspection PyShadowingBuiltins
     @abstractmethod
-    def from_logger(self) -> Channel: ...
+    def from_logger(self, id: Optional[str] = None) -> Channel: ...
 
     @abstractmethod
     def has_logger(self, *ids: Optional[str]) -> bool: ...
@@ -188,7 +189,11 @@ class _Channel(_Resource):
                 _type = _key
             if _type not in configs:
                 return
-            configs[_type] = _Channel.__build_member(configs[_type], _key)
+            if _type == "logger" and isinstance(configs[_type], Sequence) and not isinstance(configs[_type], str):
+                # Several loggers may be configured, to log the channel to more than one connector
+                configs[_type] = [_Channel._build_member(c, _key) for c in configs[_type]]
+            else:
+                configs[_type] = _Channel._build_member(configs[_type], _key)
 
         _build_wrapper("converter")
         _build_wrapper("connector")
@@ -196,7 +201,7 @@ class _Channel(_Resource):
         return configs
 
     @staticmethod
-    def __build_member(configs: Optional[Dict[str, Any] | str], key: str) -> Optional[Dict[str, Any]]:
+    def _build_member(configs: Optional[Dict[str, Any] | str], key: str) -> Optional[Dict[str, Any]]:
         if isinstance(configs, str) or configs is None:
             return {key: configs}
         elif not isinstance(configs, Mapping):
@@ -10,7 +10,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from collections.abc import Callable
-from typing import Iterable, TypeVar, Union
+from typing import Iterable, Optional, TypeVar, Union
 
 import pandas as pd
 from lories._core._channel import ChannelState, _Channel
@@ -35,8 +35,9 @@ class _Channels(_Resources[_Channel]):
         unique: bool = False,
     ) -> None: ...
 
+    # noinspection PyShadowingBuiltins
     @abstractmethod
-    def from_logger(self) -> Channels: ...
+    def from_logger(self, id: Optional[str] = None) -> Channels: ...
 
     @abstractmethod
     def to_frame(self, unique: bool = False, states: bool = False) -> pd.DataFrame: ...
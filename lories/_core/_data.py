@@ -10,6 +10,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from collections.abc import Callable
+from concurrent.futures import Future
 from typing import Any, List, Optional, Tuple, TypeAlias, TypeVar, overload
 
 import pandas as pd
@@ -104,6 +105,16 @@ class _DataContext(_Context[Channel]):
         start: Optional[Timestamp] = None,
         end: Optional[Timestamp] = None,
         timeout: Optional[float] = None,
+        freq: Optional[str] = None,
+    ) -> pd.DataFrame: ...
+
+    def query(
+        self,
+        channels: Optional[ChannelsArgument] = None,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        timeout: Optional[float] = None,
+        freq: Optional[str] = None,
     ) -> pd.DataFrame: ...
 
     @overload
@@ -152,7 +163,8 @@ class _DataContext(_Context[Channel]):
         data: pd.DataFrame,
         channels: Optional[ChannelsArgument] = None,
         timeout: Optional[float] = None,
-    ) -> None: ...
+        blocking: bool = True,
+    ) -> Optional[Future]: ...
 
     @abstractmethod
     def to_frame(self, **kwargs) -> pd.DataFrame: ...
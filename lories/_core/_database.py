@@ -9,7 +9,7 @@ lories._core._database
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import Any, Optional, TypeVar, overload
+from typing import Any, Iterator, Optional, Sequence, Tuple, TypeVar, overload
 
 import pandas as pd
 from lories._core._connector import _Connector
@@ -32,10 +32,17 @@ class _Database(_Connector):
         resources: Resources,
         start: Optional[Timestamp] = None,
         end: Optional[Timestamp] = None,
-        method: Literal["MD5", "SHA1", "SHA256", "SHA512"] = "MD5",
+        method: Literal["MD5", "SHA1", "SHA256", "SHA512", "BLAKE2B", "XXH3"] = "MD5",
         encoding: str = "UTF-8",
     ) -> Optional[str]: ...
 
+    def count(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> int: ...
+
     def exists(
         self,
         resources: Resources,
@@ -62,6 +69,19 @@ class _Database(_Connector):
         end: Optional[Timestamp] = None,
     ) -> pd.DataFrame: ...
 
+    def read_iter(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        chunk: Optional[int | str] = None,
+    ) -> Iterator[pd.DataFrame]: ...
+
+    def read_many(
+        self,
+        requests: Sequence[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]],
+    ) -> Iterator[pd.DataFrame]: ...
+
     @abstractmethod
     def read_first(self, resources: Resources) -> Optional[pd.DataFrame]: ...
 
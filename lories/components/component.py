@@ -90,11 +90,7 @@ class Component(_Component, Registrator, Activator):
         start = to_date(start)
         end = to_date(end)
 
-        data = self.__data.to_frame(unique=False)
-        if data.empty or (start is not None and start < data.index[0]) or (end is not None and end > data.index[-1]):
-            logged = self.__data.from_logger(start=start, end=end, unique=False)
-            if not logged.empty:
-                data = logged if data.empty else data.combine_first(logged)
+        data = self.__data.query(start=start, end=end, unique=False)
         return self._get_range(data, start, end, **kwargs)
 
     @staticmethod
@@ -8,8 +8,9 @@ lories.connector.weather.dwd.brightsky
 
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 
@@ -17,12 +18,18 @@ import numpy as np
 import pandas as pd
 from lories import ConfigurationError
 from lories.components.weather import Weather
-from lories.connectors import Connector
+from lories.connectors import AsyncConnector
 from lories.location import Location
 from lories.typing import Configurations, Resources, Timestamp
 
+try:
+    import aiohttp
 
-class Brightsky(Connector):
+except ImportError:
+    aiohttp = None
+
+
+class Brightsky(AsyncConnector):
     location: Location
     address: str = "https://api.brightsky.dev/"
     horizon: int = 10
@@ -46,6 +53,25 @@ class Brightsky(Connector):
         end: Optional[Timestamp] = None,
     ) -> pd.DataFrame:
         response, sources = self._request(start, end)
+        return self._process(resources, response, sources, start, end)
+
+    async def read_async(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> pd.DataFrame:
+        response, sources = await self._request_async(start, end)
+        return self._process(resources, response, sources, start, end)
+
+    def _process(
+        self,
+        resources: Resources,
+        response: pd.DataFrame,
+        sources: pd.DataFrame,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> pd.DataFrame:
         response_sources = sources.loc[response["source_id"], ["observation_type", "first_record", "last_record"]]
         response_source_columns = ["source_type", "source_first_record", "source_last_record"]
         response_sources.columns = response_source_columns
@@ -88,26 +114,54 @@ class Brightsky(Connector):
         date: Optional[Timestamp] = None,
         date_last: Optional[Timestamp] = None,
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        parameters = self._get_parameters(date, date_last)
+        response = requests.get(self.address + "weather", params=parameters)
+
+        if response.status_code != 200:
+            raise requests.HTTPError(
+                "Response returned with error " + str(response.status_code) + ": " + response.reason
+            )
+
+        return self._parse(json.loads(response.text))
+
+    # noinspection PyPackageRequirements
+    async def _request_async(
+        self,
+        date: Optional[Timestamp] = None,
+        date_last: Optional[Timestamp] = None,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        if aiohttp is None:
+            return await asyncio.to_thread(self._request, date, date_last)
+
+        parameters = self._get_parameters(date, date_last)
+        async with aiohttp.ClientSession() as session:
+            async with session.get(self.address + "weather", params=parameters) as response:
+                if response.status != 200:
+                    raise requests.HTTPError(
+                        "Response returned with error " + str(response.status) + ": " + str(response.reason)
+                    )
+                response_text = await response.text()
+
+        return self._parse(json.loads(response_text))
+
+    def _get_parameters(
+        self,
+        date: Optional[Timestamp] = None,
+        date_last: Optional[Timestamp] = None,
+    ) -> Dict[str, Any]:
         if date is None:
             date = pd.Timestamp.now(tz=self.location.timezone)
         if date_last is None:
             date_last = date + pd.Timedelta(days=self.horizon)
-        parameters = {
+        return {
             "date": date.strftime("%Y-%m-%d"),
             "last_date": date_last.strftime("%Y-%m-%d"),
             "lat": self.location.latitude,
             "lon": self.location.longitude,
             "tz": self.location.timezone.zone,
         }
-        response = requests.get(self.address + "weather", params=parameters)
-
-        if response.status_code != 200:
-            raise requests.HTTPError(
-                "Response returned with error " + str(response.status_code) + ": " + response.reason
-            )
-
-        response_json = json.loads(response.text)
 
+    def _parse(self, response_json: Dict[str, Any]) -> Tuple[pd.DataFrame, pd.DataFrame]:
         sources = pd.DataFrame(response_json["sources"])
         sources = sources.set_index("id")
         sources["first_record"] = pd.to_datetime(sources["first_record"], utc=True)
@@ -130,3 +184,6 @@ class Brightsky(Connector):
 
     def write(self, data: pd.DataFrame) -> None:
         raise NotImplementedError("Brightsky connector does not support writing")
+
+    async def write_async(self, data: pd.DataFrame) -> None:
+        raise NotImplementedError("Brightsky connector does not support writing")
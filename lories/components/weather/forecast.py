@@ -17,7 +17,7 @@ from lories.components.weather import Weather
 from lories.core.errors import ResourceError
 from lories.core.typing import Component, Configurations
 from lories.location import Location
-from lories.util import floor_date, to_date, to_timezone
+from lories.util import to_date, to_timezone
 
 
 class WeatherForecast(Weather):
@@ -82,8 +82,6 @@ class WeatherForecast(Weather):
         :rtype:
             :class:`pandas.DataFrame`
         """
-        forecast = self.data.to_frame(unique=False)
-
         # Calculate the available forecast start and end times
         if timezone is None:
             timezone = self.location.timezone
@@ -94,14 +92,5 @@ class WeatherForecast(Weather):
         if start is None:
             start = pd.Timestamp.now(tz=timezone)
 
-        if forecast.empty or start < forecast.index[0] or end > forecast.index[-1]:
-            start_schedule = floor_date(start, self.location.timezone, freq=f"{self.interval}T")
-            start_schedule += pd.Timedelta(minutes=self.offset)
-            if start_schedule > start:
-                start_schedule -= pd.Timedelta(minutes=self.interval)
-
-            logged = self.data.from_logger(start=start, end=end, unique=False)
-            if not logged.empty:
-                forecast = logged if forecast.empty else forecast.combine_first(logged)
-
+        forecast = self.data.query(start=start, end=end, unique=False)
         return self._get_range(forecast, start, end, **kwargs)
@@ -31,6 +31,9 @@ from .context import (  # noqa: F401
 from . import connector  # noqa: F401
 from .connector import Connector  # noqa: F401
 
+from . import asynchronous  # noqa: F401
+from .asynchronous import AsyncConnector  # noqa: F401
+
 from ..data import database  # noqa: F401
 from ..data.database import Database  # noqa: F401
 
@@ -45,6 +48,7 @@ CONNECTORS = [
     "sql",
     "influx",
     "tables",
+    "parquet",
     "cameras",
     "modbus",
     "revpi",
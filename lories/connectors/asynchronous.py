@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+lories.connectors.asynchronous
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+from abc import abstractmethod
+from collections.abc import AsyncIterator, Coroutine
+from contextlib import asynccontextmanager
+from threading import Lock, Thread
+from typing import Any, Optional, TypeVar
+
+import pandas as pd
+from lories.connectors.connector import Connector
+from lories.connectors.errors import ConnectorError
+from lories.core import Resources
+
+T = TypeVar("T")
+
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_event_loop_lock = Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop, all asynchronous connectors and the asyncio runtime are running in.
+
+    The event loop is started in a daemon thread on first access, as asynchronous clients are bound to
+    the loop they were created in and need to be shared between synchronous and asynchronous callers.
+    """
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None or _event_loop.is_closed():
+            _event_loop = asyncio.new_event_loop()
+            _event_loop_thread = Thread(name="lories-asyncio", target=_event_loop.run_forever, daemon=True)
+            _event_loop_thread.start()
+        return _event_loop
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    event_loop = get_event_loop()
+    if _is_running(event_loop):
+        coroutine.close()
+        raise RuntimeError("Unable to block on a coroutine from within the running event loop")
+    return asyncio.run_coroutine_threadsafe(coroutine, event_loop).result(timeout)
+
+
+def _is_running(event_loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is event_loop
+    except RuntimeError:
+        return False
+
+
+# noinspection PyAbstractClass
+class AsyncConnector(Connector):
+    """
+    Connector implementing its connection, reads and writes as asyncio coroutines.
+
+    Synchronous calls to the connector are delegated to the shared event loop, while the asyncio runtime
+    of the :class:`DataManager` awaits the coroutines directly, to avoid occupying a thread per device.
+    Asynchronous callers need to await the wrapping ``_do_*_async`` coroutines, to share the lock and the
+    connection state handling with synchronous calls.
+
+    """
+
+    async def connect_async(self, resources: Resources) -> None:
+        pass
+
+    async def disconnect_async(self) -> None:
+        pass
+
+    @abstractmethod
+    async def read_async(self, resources: Resources) -> pd.DataFrame: ...
+
+    @abstractmethod
+    async def write_async(self, data: pd.DataFrame) -> None: ...
+
+    def connect(self, resources: Resources) -> None:
+        run_sync(self.connect_async(resources))
+
+    def disconnect(self) -> None:
+        run_sync(self.disconnect_async())
+
+    def read(self, resources: Resources, *args, **kwargs) -> pd.DataFrame:
+        return run_sync(self.read_async(resources, *args, **kwargs))
+
+    def write(self, data: pd.DataFrame) -> None:
+        run_sync(self.write_async(data))
+
+    @asynccontextmanager
+    async def _acquire_lock_async(self) -> AsyncIterator[None]:
+        # Acquire the same lock as synchronous calls, e.g. writes of the write queue, in a worker thread,
+        # to exclude them from asynchronous reads without blocking the event loop
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._lock.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            acquire.add_done_callback(_release_acquired(self._lock))
+            raise
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    async def _do_connect_async(self, resources: Resources, *args, **kwargs) -> None:
+        async with self._acquire_lock_async():
+            with self._connecting(resources) as connect:
+                if connect:
+                    await self.connect_async(resources, *args, **kwargs)
+
+    async def _do_disconnect_async(self) -> None:
+        async with self._acquire_lock_async():
+            with self._disconnecting() as disconnect:
+                if disconnect:
+                    await self.disconnect_async()
+
+    async def _do_read_async(self, resources: Resources, *args, **kwargs) -> pd.DataFrame:
+        async with self._acquire_lock_async():
+            if not self._is_connected():
+                raise ConnectorError(self, f"Trying to read from unconnected {type(self).__name__}: {self.id}")
+
+            data = await self.read_async(resources, *args, **kwargs)
+            data = self._validate(resources, data)
+            return data
+
+    async def _do_write_async(self, data: pd.DataFrame, *args, **kwargs) -> None:
+        async with self._acquire_lock_async():
+            if not self._is_connected():
+                raise ConnectorError(self, f"Trying to write to unconnected {type(self).__name__}: {self.id}")
+            unknown = [c for c in data.columns if c not in self.resources]
+            if len(unknown) > 0:
+                raise ConnectorError(
+                    self,
+                    f"Trying to write unknown resource{'s' if len(unknown) > 0 else ''} '{', '.join(unknown)}' for "
+                    f"{type(self).__name__}: {self.id}",
+                )
+
+            await self.write_async(data, *args, **kwargs)
+
+
+def _release_acquired(lock: Lock):
+    def _release(acquire: asyncio.Future) -> None:
+        if not acquire.cancelled() and acquire.exception() is None:
+            lock.release()
+
+    return _release
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+lories.connectors.capabilities
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import inspect
+from functools import lru_cache
+from typing import Collection, Type
+
+from lories._core._connector import Connector  # noqa
+
+
+class ConnectorCapabilities:
+    """
+    Describes which arguments and data shapes a connector type supports.
+
+    Capabilities are resolved once per connector type via :func:`get_capabilities`, to avoid
+    introspecting the connector methods for every executed task.
+
+    """
+
+    __slots__ = ("read_arguments", "read_range", "write_bulk", "asynchronous")
+
+    read_arguments: Collection[str]
+    read_range: bool
+    write_bulk: bool
+    asynchronous: bool
+
+    def __init__(
+        self,
+        read_arguments: Collection[str],
+        write_bulk: bool = False,
+        asynchronous: bool = False,
+    ) -> None:
+        self.read_arguments = frozenset(read_arguments)
+        self.read_range = all(argument in self.read_arguments for argument in ["start", "end"])
+        self.write_bulk = write_bulk
+        self.asynchronous = asynchronous
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}("
+            f"read_arguments=[{', '.join(sorted(self.read_arguments))}], "
+            f"read_range={self.read_range}, "
+            f"write_bulk={self.write_bulk}, "
+            f"asynchronous={self.asynchronous})"
+        )
+
+
+# noinspection PyShadowingBuiltins
+@lru_cache(maxsize=None)
+def get_capabilities(type: Type[Connector]) -> ConnectorCapabilities:
+    # Connectors may implement their reads natively as asyncio coroutines
+    read_async = getattr(type, "read_async", None)
+    asynchronous = read_async is not None and inspect.iscoroutinefunction(read_async)
+
+    # Inspect the class method, as instance methods get wrapped by the connector meta class
+    signature = inspect.signature(type.read if not asynchronous else read_async)
+    arguments = [p.name for p in signature.parameters.values() if p.kind == p.POSITIONAL_OR_KEYWORD]
+
+    # Connector types declare explicitly, whether they persist whole time series or only write the latest values
+    write_bulk = getattr(type, "_write_bulk", False)
+
+    return ConnectorCapabilities(arguments, write_bulk=write_bulk, asynchronous=asynchronous)
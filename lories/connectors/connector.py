@@ -10,9 +10,10 @@ from __future__ import annotations
 
 import datetime as dt
 from collections import OrderedDict
+from contextlib import contextmanager
 from functools import wraps
 from threading import Lock
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 import pandas as pd
 import pytz as tz
@@ -20,19 +21,21 @@ from lories._core._configurations import Configurations  # noqa
 from lories._core._connector import ConnectType, _Connector  # noqa
 from lories._core._context import _Context  # noqa
 from lories._core._registrator import RegistratorContext  # noqa
+from lories.connectors.capabilities import ConnectorCapabilities, get_capabilities
 from lories.connectors.errors import ConnectorError
 from lories.core import Resource, ResourceError, Resources
 from lories.core.configs.configurator import Configurator, ConfiguratorMeta
 from lories.core.configs.errors import ConfigurationError
 from lories.core.register.registrator import Registrator
 from lories.data.channels import Channel, Channels, ChannelState
-from lories.data.validation import validate_index
+from lories.data.validation import is_arrow, validate_arrow, validate_index
 
 
 class ConnectorMeta(ConfiguratorMeta):
     # noinspection PyProtectedMember
     def __call__(cls, *args, **kwargs):
         connector = super().__call__(*args, **kwargs)
+        connector._capabilities = get_capabilities(cls)
         cls._wrap_method(connector, "connect")
         cls._wrap_method(connector, "disconnect")
         cls._wrap_method(connector, "read")
@@ -49,6 +52,11 @@ class Connector(_Connector, Registrator, metaclass=ConnectorMeta):
     _timestamp_connect: pd.Timestamp = pd.NaT
     _timestamp_disconnect: pd.Timestamp = pd.NaT
     _interval_reconnect: pd.Timedelta = pd.Timedelta(minutes=1)
+    _interval_write: pd.Timedelta = pd.Timedelta(0)
+
+    # Connectors persisting whole time series, instead of only the latest values, may enable bulk writes
+    _write_bulk: bool = False
+    _capabilities: ConnectorCapabilities
 
     __resources: Resources
 
@@ -84,6 +92,7 @@ class Connector(_Connector, Registrator, metaclass=ConnectorMeta):
 
         # Channels are a subset of resources, hence omit them from printing
         vars.pop("channels", None)
+        vars.pop("capabilities", None)
         return vars
 
     # noinspection PyShadowingBuiltins
@@ -116,6 +125,10 @@ class Connector(_Connector, Registrator, metaclass=ConnectorMeta):
         values["enabled"] = str(self.is_enabled())
         return values
 
+    @property
+    def capabilities(self) -> ConnectorCapabilities:
+        return self._capabilities
+
     @property
     def resources(self) -> Resources:
         return self.__resources
@@ -133,6 +146,7 @@ class Connector(_Connector, Registrator, metaclass=ConnectorMeta):
     def configure(self, configs: Configurations) -> None:
         super().configure(configs)
         self._connect_type = ConnectType.get(configs.get("connect", default=True))
+        self._interval_write = pd.Timedelta(seconds=configs.get_float("write_interval", default=0))
 
     def _is_disconnected(self) -> bool:
         return not self._is_connected()
@@ -159,24 +173,32 @@ class Connector(_Connector, Registrator, metaclass=ConnectorMeta):
     # noinspection PyUnresolvedReferences, PyTypeChecker
     @wraps(_Connector.connect, updated=())
     def _do_connect(self, resources: Resources, *args, **kwargs) -> None:
-        with self._lock:
-            if not self.is_enabled():
-                raise ConfigurationError(f"Trying to connect disabled {type(self).__name__}: {self.id}")
-            if not self.is_configured():
-                raise ConfigurationError(f"Trying to connect unconfigured {type(self).__name__}: {self.id}")
-
-            self._timestamp_connect = pd.Timestamp.now(tz.UTC)
-            self._timestamp_disconnect = pd.NaT
-
-            if not self._is_connected():
-                self._at_connect(resources)
+        with self._lock, self._connecting(resources) as connect:
+            if connect:
                 self._run_connect(resources, *args, **kwargs)
-                self._on_connect(resources)
-                self.__resources = resources
-            else:
-                self._logger.warning(f"{type(self).__name__} '{self.id}' already connected")
 
-            self._connected = True
+    @contextmanager
+    def _connecting(self, resources: Resources) -> Iterator[bool]:
+        # Connection state handling, shared by synchronous and asynchronous connects, that need to hold the lock.
+        # Yields whether the connection needs to be opened, before the connection state gets updated
+        if not self.is_enabled():
+            raise ConfigurationError(f"Trying to connect disabled {type(self).__name__}: {self.id}")
+        if not self.is_configured():
+            raise ConfigurationError(f"Trying to connect unconfigured {type(self).__name__}: {self.id}")
+
+        self._timestamp_connect = pd.Timestamp.now(tz.UTC)
+        self._timestamp_disconnect = pd.NaT
+
+        if not self._is_connected():
+            self._at_connect(resources)
+            yield True
+            self._on_connect(resources)
+            self.__resources = resources
+        else:
+            self._logger.warning(f"{type(self).__name__} '{self.id}' already connected")
+            yield False
+
+        self._connected = True
 
     def _at_connect(self, resources: Resources) -> None:
         pass
@@ -187,16 +209,23 @@ class Connector(_Connector, Registrator, metaclass=ConnectorMeta):
     # noinspection PyUnresolvedReferences, PyTypeChecker
     @wraps(_Connector.disconnect, updated=())
     def _do_disconnect(self) -> None:
-        with self._lock:
-            self._timestamp_connect = pd.NaT
-            self._timestamp_disconnect = pd.Timestamp.now(tz.UTC)
-
-            if not self._is_disconnected():
-                self._at_disconnect()
+        with self._lock, self._disconnecting() as disconnect:
+            if disconnect:
                 self._run_disconnect()
-                self._on_disconnect()
 
-            self._connected = False
+    @contextmanager
+    def _disconnecting(self) -> Iterator[bool]:
+        self._timestamp_connect = pd.NaT
+        self._timestamp_disconnect = pd.Timestamp.now(tz.UTC)
+
+        if not self._is_disconnected():
+            self._at_disconnect()
+            yield True
+            self._on_disconnect()
+        else:
+            yield False
+
+        self._connected = False
 
     def _at_disconnect(self) -> None:
         pass
@@ -217,6 +246,8 @@ class Connector(_Connector, Registrator, metaclass=ConnectorMeta):
 
     # noinspection PyMethodMayBeStatic
     def _validate(self, resources: Resources, data: pd.DataFrame) -> pd.DataFrame:
+        if is_arrow(data):
+            data = validate_arrow(data)
         if not data.empty:
             data = validate_index(data)
             for resource in resources:
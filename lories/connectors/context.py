@@ -91,7 +91,9 @@ class ConnectorContext(_ConnectorContext, RegistratorContext[Connector]):
         self._logger.debug(f"Connecting {type(connector).__name__} '{connector.name}': {connector.id}")
         if channels is None:
             channels = self.context.filter(lambda c: c.has_connector(connector.id))
-            channels.update(self.context.filter(lambda c: c.has_logger(connector.id)).apply(lambda c: c.from_logger()))
+            channels.update(
+                self.context.filter(lambda c: c.has_logger(connector.id)).apply(lambda c: c.from_logger(connector.id))
+            )
 
         return ConnectTask(connector, channels)
 
@@ -9,7 +9,7 @@ lories.connectors.csv
 from __future__ import annotations
 
 import os
-from typing import Mapping, Optional, Tuple
+from typing import Iterator, Mapping, Optional, Tuple
 
 import pandas as pd
 from lories.connectors import ConnectionError, Database, register_connector_type
@@ -18,6 +18,12 @@ from lories.io import csv
 from lories.typing import Configurations, Resources, Timestamp
 from lories.util import ceil_date, floor_date, parse_freq
 
+try:
+    import pyarrow as pa
+
+except ImportError:
+    pa = None
+
 
 # noinspection PyShadowingBuiltins
 @register_connector_type("csv")
@@ -25,6 +31,7 @@ class CsvDatabase(Database):
     _data: Optional[pd.DataFrame] = None
     _data_path: Optional[str] = None
     _data_dir: str
+    _data_files: Optional[csv.CsvFileCache] = None
 
     index_column: str = "timestamp"
     index_type: str = "timestamp"
@@ -42,6 +49,9 @@ class CsvDatabase(Database):
     columns: Mapping[str, str] = {}
     pretty: bool = False
 
+    engine: Optional[str] = None
+    workers: Optional[int] = None
+
     # noinspection PyTypeChecker
     def configure(self, configs: Configurations) -> None:
         super().configure(configs)
@@ -102,6 +112,24 @@ class CsvDatabase(Database):
         self.pretty = configs.get_bool("pretty", default=False)
         self.columns = configs.get("columns", default=CsvDatabase.columns)
 
+        # Parsed files are cached, to avoid parsing unchanged files again on every read
+        files_cache = configs.get_int("files_cache", default=32)
+        if files_cache < 0:
+            raise ConfigurationError(f"Invalid number of cached files: {files_cache}")
+        self._data_files = csv.CsvFileCache(files_cache) if files_cache > 0 else None
+
+        self.engine = configs.get("engine", default=CsvDatabase.engine)
+        if self.engine is not None:
+            self.engine = self.engine.lower()
+            if self.engine not in ["c", "python", "pyarrow"]:
+                raise ConfigurationError(f"Unknown CSV parser engine: {self.engine}")
+            if self.engine == "pyarrow" and pa is None:
+                raise ConfigurationError("Parsing CSV files with the pyarrow engine requires pyarrow to be installed")
+
+        self.workers = configs.get_int("workers", default=CsvDatabase.workers)
+        if self.workers is not None and self.workers < 1:
+            raise ConfigurationError(f"Invalid number of CSV parser workers: {self.workers}")
+
     def _build_columns(self, resources: Optional[Resources] = None) -> Mapping[str, str]:
         columns = {r.id: self.columns[r.key] for r in resources if r.key in self.columns}
         if self.pretty:
@@ -114,6 +142,11 @@ class CsvDatabase(Database):
                 columns.update({r.id: r.get("column", default=r.key) for r in resources})
         return columns
 
+    def _build_dtypes(self, resources: Resources) -> Mapping[str, str]:
+        # Only declare floating point values explicitly, as other types may contain empty values or need inference
+        columns = self._build_columns(resources)
+        return {columns[r.id]: "float64" for r in resources if r.type is float}
+
     def connect(self, resources: Resources) -> None:
         if not os.path.isdir(self._data_dir):
             os.makedirs(self._data_dir, exist_ok=True)
@@ -133,6 +166,8 @@ class CsvDatabase(Database):
 
     def disconnect(self) -> None:
         self._data = None
+        if self._data_files is not None:
+            self._data_files.clear()
 
     def is_connected(self) -> bool:
         return True
@@ -159,11 +194,16 @@ class CsvDatabase(Database):
                     self.freq,
                     self.format,
                     *_infer_dates(),
+                    cache=self._data_files,
+                    workers=self.workers,
                     index_column=self.index_column,
                     index_type=self.index_type,
                     timezone=self.timezone,
                     separator=self.separator,
                     decimal=self.decimal,
+                    usecols=list(self._build_columns(resources).values()),
+                    dtype=self._build_dtypes(resources),
+                    engine=self.engine,
                 )
 
             if self.index_type in ["timestamp", "unix"] and all(pd.isna(d) for d in [start, end]):
@@ -186,6 +226,49 @@ class CsvDatabase(Database):
         except IOError as e:
             raise ConnectionError(self, str(e))
 
+    def read_iter(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        chunk: Optional[int | str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        if self._data is not None or isinstance(chunk, str):
+            yield from super().read_iter(resources, start, end, chunk)
+            return
+        try:
+            files = csv.iter_files(
+                self._data_dir,
+                self.freq,
+                self.format,
+                start,
+                end,
+                chunksize=chunk,
+                cache=self._data_files,
+                index_column=self.index_column,
+                index_type=self.index_type,
+                timezone=self.timezone,
+                separator=self.separator,
+                decimal=self.decimal,
+                usecols=list(self._build_columns(resources).values()),
+                dtype=self._build_dtypes(resources),
+            )
+            columns = self._build_columns(resources)
+            for data in files:
+                results = []
+                for resource in resources:
+                    resource_column = columns[resource.id]
+                    if resource_column not in data.columns:
+                        results.append(pd.Series(name=resource.id, index=data.index, dtype=float))
+                        continue
+                    resource_data = data.loc[:, resource_column].copy()
+                    resource_data.name = resource.id
+                    results.append(resource_data)
+                yield pd.concat(results, axis="columns")
+
+        except IOError as e:
+            raise ConnectionError(self, str(e))
+
     # noinspection PyTypeChecker
     def read_first(self, resources: Resources) -> Optional[pd.DataFrame]:
         try:
@@ -200,7 +283,8 @@ class CsvDatabase(Database):
                 )
                 if len(files) == 0:
                     return None
-                data = csv.read_file(
+                _read_file = self._data_files.read if self._data_files is not None else csv.read_file
+                data = _read_file(
                     files[0],
                     index_column=self.index_column,
                     index_type=self.index_type,
@@ -241,7 +325,8 @@ class CsvDatabase(Database):
                 )
                 if len(files) == 0:
                     return None
-                data = csv.read_file(
+                # Only the last line of the newest file is needed, to avoid parsing the whole file
+                data = csv.read_file_tail(
                     files[-1],
                     index_column=self.index_column,
                     index_type=self.index_type,
@@ -9,7 +9,7 @@ lories.connectors.influx
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Collection, Dict, Iterator, Optional, Tuple
 
 from influxdb_client import BucketRetentionRules, InfluxDBClient
 from influxdb_client.client.exceptions import InfluxDBError
@@ -20,8 +20,9 @@ from urllib3.exceptions import HTTPError, NewConnectionError
 import pandas as pd
 from lories.connectors import ConnectionError, Database, DatabaseException, register_connector_type
 from lories.core.configs import ConfigurationError
-from lories.data.util import hash_value
+from lories.data.util import AGGREGATE_METHODS, BINARY_HASH_METHODS, hash_value
 from lories.typing import Configurations, Resource, Resources, Timestamp
+from lories.util import to_timedelta
 
 # FIXME: Remove this once Python >= 3.9 is a requirement
 try:
@@ -30,6 +31,9 @@ try:
 except ImportError:
     from typing_extensions import Literal
 
+# Flux selects the last value of each window as well, in addition to the aggregates of other databases
+_AGGREGATE_METHODS = [*AGGREGATE_METHODS, "last"]
+
 
 @register_connector_type("influx", "influxdb")
 class InfluxDatabase(Database):
@@ -125,9 +129,12 @@ class InfluxDatabase(Database):
         resources: Resources,
         start: Optional[Timestamp] = None,
         end: Optional[Timestamp] = None,
-        method: Literal["MD5", "SHA1", "SHA256", "SHA512"] = "MD5",
+        method: Literal["MD5", "SHA1", "SHA256", "SHA512", "BLAKE2B", "XXH3"] = "MD5",
         encoding: str = "UTF-8",
     ) -> Optional[str]:
+        if method.lower() in BINARY_HASH_METHODS:
+            # Binary checksums can not be generated server-side and are hashed from the read data instead
+            return super().hash(resources, start, end, method=method, encoding=encoding)
         if method.lower() not in ["md5", "sha1", "sha256"]:
             raise ValueError(f"Invalid checksum method '{method}'")
         hashes = []
@@ -233,13 +240,39 @@ class InfluxDatabase(Database):
                 """
                 try:
                     data = query_api.query_data_frame(query, data_frame_index=["_time"])
-                    if sorted(data["_fields"]) != sorted(fields):
+                    if data.empty or sorted(data["_field"]) != sorted(fields):
                         return False
 
                 except (ApiException, InfluxDBError, HTTPError) as e:
                     self._raise(e)
         return True
 
+    def count(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> int:
+        count = 0
+        query_api = self._client.query_api()
+        for measurement, measurement_resources in resources.groupby(lambda r: r.get("measurement", default=r.group)):
+            for tag, tagged_resources in measurement_resources.groupby("tag"):
+                query = f"""
+                {self._build_query(tagged_resources, measurement, tag, *_to_isoformat(start, end))}
+                    |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+                    |> group()
+                    |> count(column: "_time")
+                """
+                try:
+                    data = query_api.query_data_frame(query)
+                    if data.empty:
+                        continue
+                    count += int(data["_time"].iloc[0])
+
+                except (ApiException, InfluxDBError, HTTPError) as e:
+                    self._raise(e)
+        return count
+
     # noinspection PyUnresolvedReferences, PyTypeChecker
     def read(
         self,
@@ -249,6 +282,41 @@ class InfluxDatabase(Database):
     ) -> pd.DataFrame:
         return self._read(resources, start, end)
 
+    # noinspection PyUnresolvedReferences, PyTypeChecker
+    def read_iter(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        chunk: Optional[int | str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        groups = [
+            (measurement, tag, tagged_resources)
+            for measurement, measurement_resources in resources.groupby(lambda r: r.get("measurement", default=r.group))
+            for tag, tagged_resources in measurement_resources.groupby("tag")
+        ]
+        if len(groups) != 1 or isinstance(chunk, str):
+            # Only the results of a single query can be streamed in time order
+            yield from super().read_iter(resources, start, end, chunk)
+            return
+
+        measurement, tag, tagged_resources = groups[0]
+        query = f"""
+            {self._build_query(tagged_resources, measurement, tag, *_to_isoformat(start, end))}
+            |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+        """
+        query_api = self._client.query_api()
+        try:
+            # The streamed frames are sized by the response chunks of the server, the chunk argument is not applicable
+            for data in query_api.query_data_frame_stream(query, data_frame_index=["_time"]):
+                if data.empty:
+                    continue
+                data = data.rename(columns={_get_field(r): r.id for r in tagged_resources})
+                yield data.loc[:, [r.id for r in tagged_resources if r.id in data.columns]]
+
+        except (ApiException, InfluxDBError, HTTPError) as e:
+            self._raise(e)
+
     # noinspection PyUnresolvedReferences, PyTypeChecker
     def read_first(self, resources: Resources) -> pd.DataFrame:
         first = self._read_boundaries(resources, "first")
@@ -331,6 +399,65 @@ class InfluxDatabase(Database):
         results = results.loc[:, [r.id for r in resources if r.id in results.columns]]
         return results
 
+    # noinspection PyUnresolvedReferences, PyTypeChecker
+    def _read_aggregates(
+        self,
+        resources: Resources,
+        freq: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        methods: Collection[str],
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        aggregates = {}
+        every = f"{int(to_timedelta(freq).total_seconds())}s"
+
+        # Windows of the aggregateWindow function include their start, shift values by a nanosecond to aggregate
+        # buckets that include their right edge instead
+        windows = ",\n".join(
+            f"""
+                    data
+                        |> aggregateWindow(every: {every}, fn: {f}, createEmpty: false, timeSrc: "_stop")
+                        |> toFloat()
+                        |> set(key: "_aggregate", value: "{f}")"""
+            for f in _AGGREGATE_METHODS
+        )
+
+        query_api = self._client.query_api()
+        for measurement, measurement_resources in resources.groupby(lambda r: r.get("measurement", default=r.group)):
+            for tag, tagged_resources in measurement_resources.groupby("tag"):
+                query = f"""
+                    data = {self._build_query(tagged_resources, measurement, tag, *_to_isoformat(start, end))}
+                        |> timeShift(duration: -1ns)
+
+                    union(tables: [{windows}
+                    ])
+                        |> map(fn: (r) => ({{r with _field: r._field + ":" + r._aggregate}}))
+                        |> group()
+                        |> keep(columns: ["_time", "_field", "_value"])
+                        |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+                """
+                try:
+                    data = query_api.query_data_frame(query, data_frame_index=["_time"])
+                    if data.empty:
+                        continue
+
+                    # Windows truncated by the queried range are labeled by the range stop and need to be aligned
+                    data.index = pd.DatetimeIndex(data.index).tz_convert("UTC").ceil(every)
+                    for resource in tagged_resources:
+                        field = _get_field(resource)
+                        if f"{field}:count" not in data.columns:
+                            continue
+                        resource_aggregates = pd.DataFrame(
+                            {f: data[f"{field}:{f}"] for f in _AGGREGATE_METHODS}, index=data.index
+                        )
+                        resource_aggregates = resource_aggregates.dropna(subset=["count"])
+                        resource_aggregates["count"] = resource_aggregates["count"].astype(int)
+                        aggregates[resource.id] = resource_aggregates[resource_aggregates["count"] > 0]
+
+                except (ApiException, InfluxDBError, HTTPError) as e:
+                    self._raise(e)
+        return aggregates
+
     # noinspection PyTypeChecker
     def write(self, data: pd.DataFrame) -> None:
         write_api = self._client.write_api(write_options=SYNCHRONOUS)
@@ -8,5 +8,11 @@ lories.connectors.modbus
 
 from .register import ModbusRegister  # noqa: F401
 
+from . import base  # noqa: F401
+from .base import ModbusBase  # noqa: F401
+
 from . import client  # noqa: F401
 from .client import ModbusClient  # noqa: F401
+
+from . import asynchronous  # noqa: F401
+from .asynchronous import AsyncModbusClient  # noqa: F401
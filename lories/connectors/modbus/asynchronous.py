@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+lories.connectors.modbus.asynchronous
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+from pymodbus import ModbusException
+from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient, AsyncModbusUdpClient
+
+import pandas as pd
+from lories.connectors import AsyncConnector, ConnectionError, ConnectorError, register_connector_type
+from lories.connectors.modbus.base import ModbusBase
+from lories.typing import Resources
+
+
+@register_connector_type("modbus_async")
+class AsyncModbusClient(ModbusBase, AsyncConnector):
+    _client_types = {
+        "tcp": AsyncModbusTcpClient,
+        "udp": AsyncModbusUdpClient,
+        "serial": AsyncModbusSerialClient,
+    }
+
+    async def connect_async(self, resources: Resources) -> None:
+        await super().connect_async(resources)
+        try:
+            self._logger.info(f"Connecting to '{self._client}'")
+            await self._client.connect()
+            self._registers = self._build_registers(resources)
+
+        except ModbusException as e:
+            self._logger.warning(f"Error connecting to '{self._client}': {e}")
+            raise ConnectionError(self, e)
+        except IOError as e:
+            raise ConnectorError(self, e)
+
+    async def disconnect_async(self) -> None:
+        await super().disconnect_async()
+        self._client.close()
+
+    async def read_async(self, resources: Resources) -> pd.DataFrame:
+        data = self._build_frame(resources)
+        with self._handle_errors():
+            for resource, register, request in self._build_read_requests(resources, data):
+                self._read_result(data, resource, register, await request())
+        return data
+
+    async def write_async(self, data: pd.DataFrame) -> None:
+        with self._handle_errors():
+            for register, values, device in self._build_write_requests(data):
+                await self._client.write_registers(register.address, values, slave=device)
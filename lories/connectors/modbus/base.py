@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+lories.connectors.modbus.base
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Iterator, List, Mapping, Tuple, Type
+
+from pymodbus import FramerType, ModbusException
+from pymodbus.client import ModbusBaseClient
+
+import pandas as pd
+import pytz as tz
+from lories._core import ChannelState  # noqa
+from lories.connectors import ConnectionError, ConnectorError
+from lories.connectors.modbus import ModbusRegister
+from lories.core.configs import ConfigurationError
+from lories.typing import Configurations, Resource, Resources
+
+# FIXME: Remove this once Python >= 3.9 is a requirement
+try:
+    from typing import Literal
+
+except ImportError:
+    from typing_extensions import Literal
+
+
+class ModbusBase:
+    """
+    Configuration and register conversions, shared by the synchronous and asynchronous Modbus clients.
+
+    Implementations only need to declare their client types per protocol and perform the transport calls.
+
+    """
+
+    _client_types: Mapping[Literal["tcp", "udp", "serial"], Type[ModbusBaseClient]]
+    _client: ModbusBaseClient
+    _registers: Mapping[str, ModbusRegister]
+
+    _endian: Literal["big", "little"]
+
+    # noinspection SpellCheckingInspection
+    def configure(self, configs: Configurations) -> None:
+        super().configure(configs)
+        _endian = configs.get("endian", default="big").lower()
+        if _endian not in ["big", "little"]:
+            raise ConnectorError(self, f"Invalid modbus word order '{_endian}'")
+        self._endian = _endian
+
+        timeout = configs.get_int("timeout", default=3)
+        retries = configs.get_int("retries", default=3)
+
+        protocol = configs.get("protocol").lower()
+        if protocol == "tcp":
+            self._client = self._client_types["tcp"](
+                host=configs.get("host"),
+                port=configs.get_int("port", 502),
+                framer=FramerType.SOCKET,
+                timeout=timeout,
+                retries=retries,
+                # source_address=("localhost", 0),
+            )
+        elif protocol == "udp":
+            self._client = self._client_types["udp"](
+                host=configs.get("host"),
+                port=configs.get_int("port", 502),
+                framer=FramerType.SOCKET,
+                timeout=timeout,
+                retries=retries,
+                # source_address=None,
+            )
+        elif protocol in ["rtu", "serial"]:
+            self._client = self._client_types["serial"](
+                port=configs.get("port"),
+                framer=FramerType.RTU,
+                timeout=timeout,
+                retries=retries,
+                baudrate=configs.get_int("baudrate"),
+                bytesize=configs.get_int("bytesize", default=8),
+                stopbits=configs.get_int("stopbits", default=1),
+                parity=configs.get("parity", default="N"),
+                # handle_local_echo=False,
+            )
+        else:
+            raise ConnectorError(self, f"Unknown modbus protocol type '{protocol}'")
+
+    # noinspection PyUnresolvedReferences
+    def is_connected(self) -> bool:
+        return self._client.connected
+
+    @staticmethod
+    def _build_registers(resources: Resources) -> Mapping[str, ModbusRegister]:
+        return {r.id: ModbusRegister.from_resource(r) for r in resources}
+
+    @contextmanager
+    def _handle_errors(self) -> Iterator[None]:
+        try:
+            yield
+
+        except ModbusException as e:
+            raise ConnectionError(self, e)
+        except IOError as e:
+            raise ConnectorError(self, e)
+
+    @staticmethod
+    def _build_frame(resources: Resources) -> pd.DataFrame:
+        timestamp = pd.Timestamp.now(tz.UTC).floor(freq="s")
+        return pd.DataFrame(index=[timestamp], columns=resources.ids)
+
+    def _build_read_requests(
+        self,
+        resources: Resources,
+        data: pd.DataFrame,
+    ) -> Iterator[Tuple[Resource, ModbusRegister, Callable[[], Any]]]:
+        timestamp = data.index[0]
+        for device, device_resources in resources.groupby("device"):
+            if device is None:
+                device = 1
+
+            # TODO: Implement reading adjacent blocks of registers of same device ID
+            for resource in device_resources:
+                try:
+                    register = self._registers[resource.id]
+                    function = getattr(self._client, f"read_{register.function}s")
+
+                except KeyError:
+                    data.at[timestamp, resource.id] = ChannelState.NOT_AVAILABLE
+                    continue
+                yield resource, register, partial(function, register.address, count=register.length, slave=device)
+
+    def _read_result(self, data: pd.DataFrame, resource: Resource, register: ModbusRegister, result: Any) -> None:
+        timestamp = data.index[0]
+        if result.isError():
+            data.at[timestamp, resource.id] = ChannelState.UNKNOWN_ERROR
+            self._logger.warning(f"Error reading register '{resource.id}'")
+            return
+        try:
+            value = self._client.convert_from_registers(result.registers, register.type, word_order=self._endian)
+            data.at[timestamp, resource.id] = value
+
+            self._logger.debug(f"Read {register.type} value of register {register.address}: {value}")
+
+        except ConfigurationError as e:
+            data.at[timestamp, resource.id] = ChannelState.ARGUMENT_SYNTAX_ERROR
+            self._logger.warning(f"Invalid register configuration for resource '{resource.id}': {e}")
+
+    def _build_write_requests(self, data: pd.DataFrame) -> Iterator[Tuple[ModbusRegister, List[int], int]]:
+        for device, device_channels in self.channels.groupby("device"):
+            if device is None:
+                device = 1
+
+            for channel in device_channels:
+                if channel.id not in data.columns:
+                    continue
+                channel_data = data.loc[:, channel.id].dropna(axis="index", how="all")
+                if channel_data.empty:
+                    continue
+                register = self._registers[channel.id]
+                try:
+                    values = self._client.convert_to_registers(
+                        channel_data.iloc[-1], register.type, word_order=self._endian
+                    )
+                except ConfigurationError as e:
+                    self._logger.warning(f"Invalid register configuration for channel '{channel.id}': {e}")
+                    continue
+                yield register, values, device
@@ -0,0 +1,512 @@
+# -*- coding: utf-8 -*-
+"""
+lories.connectors.parquet
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from threading import Event, Thread
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import pandas as pd
+import pytz as tz
+from lories.connectors import ConnectionError, Database, register_connector_type
+from lories.core.configs import ConfigurationError
+from lories.typing import Configurations, Resource, Resources, Timestamp
+from lories.util import parse_freq
+
+# FIXME: Remove this once Python >= 3.9 is a requirement
+try:
+    from typing import Literal
+
+except ImportError:
+    from typing_extensions import Literal
+
+PARTITION_FORMATS = {
+    "Y": "%Y",
+    "M": "%Y-%m",
+    "D": "%Y-%m-%d",
+}
+
+_INDEX = "timestamp"
+
+
+# noinspection PyShadowingBuiltins
+@register_connector_type("parquet")
+class ParquetDatabase(Database):
+    """
+    Database storing the values of each group of resources in Parquet files, partitioned by time.
+
+    Every write adds a new file to each partition it touches, while partitions with many files get compacted to a
+    single file in the background. Reads only parse the partitions, columns and row groups of the requested range,
+    and the first and last index of resources are looked up in the statistics of the file footers.
+
+    """
+
+    _data_dir: str
+    _data_open: bool = False
+
+    _compactor: Optional[Thread] = None
+    _compactor_stop: Optional[Event] = None
+
+    freq: str = "D"
+    compression: str = "snappy"
+
+    compaction_files: int = 8
+    compaction_interval: int = 900
+
+    # noinspection PyTypeChecker
+    def configure(self, configs: Configurations) -> None:
+        super().configure(configs)
+
+        data_dir = configs.get("dir", default="parquet")
+        if "~" in data_dir:
+            data_dir = os.path.expanduser(data_dir)
+        if not os.path.isabs(data_dir):
+            data_dir = os.path.join(configs.dirs.data, data_dir)
+        self._data_dir = data_dir
+
+        self.freq = parse_freq(configs.get("freq", default=ParquetDatabase.freq))
+        if self.freq not in PARTITION_FORMATS:
+            raise ConfigurationError(f"Invalid Parquet partition frequency: {self.freq}")
+
+        self.compression = configs.get("compression", default=ParquetDatabase.compression)
+
+        self.compaction_files = configs.get_int("compaction_files", default=ParquetDatabase.compaction_files)
+        if self.compaction_files < 2:
+            raise ConfigurationError(f"Invalid number of Parquet files to compact: {self.compaction_files}")
+        self.compaction_interval = configs.get_int("compaction_interval", default=ParquetDatabase.compaction_interval)
+
+    def is_connected(self) -> bool:
+        return self._data_open and os.path.isdir(self._data_dir)
+
+    def connect(self, resources: Resources) -> None:
+        super().connect(resources)
+        try:
+            os.makedirs(self._data_dir, exist_ok=True)
+        except IOError as e:
+            raise ConnectionError(self, str(e))
+        self._data_open = True
+
+        if self.compaction_interval > 0:
+            self._compactor_stop = Event()
+            self._compactor = Thread(
+                name=f"lories-parquet-{self.id}",
+                target=self.__run_compaction,
+                args=(self._compactor_stop,),
+                daemon=True,
+            )
+            self._compactor.start()
+
+    def disconnect(self) -> None:
+        super().disconnect()
+        self._data_open = False
+        # The compaction is not joined, as it may wait for the lock held while disconnecting
+        if self._compactor_stop is not None:
+            self._compactor_stop.set()
+        self._compactor = None
+        self._compactor_stop = None
+
+    # noinspection PyTypeChecker
+    def read(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> pd.DataFrame:
+        try:
+            return self.__read(resources, start, end)
+        except (IOError, pa.ArrowException) as e:
+            raise ConnectionError(self, str(e))
+
+    def read_many(
+        self,
+        requests: Sequence[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]],
+    ) -> Iterator[pd.DataFrame]:
+        # Merge adjacent ranges into fewer reads, to avoid opening the same files for each range
+        return self._read_merged(requests)
+
+    def read_first(self, resources: Resources) -> Optional[pd.DataFrame]:
+        return self.__read_boundary(resources, "first")
+
+    def read_last(self, resources: Resources) -> Optional[pd.DataFrame]:
+        return self.__read_boundary(resources, "last")
+
+    def read_first_index(self, resources: Resources) -> Optional[Any]:
+        try:
+            return self.__read_index(resources, "first")
+        except (IOError, pa.ArrowException) as e:
+            raise ConnectionError(self, str(e))
+
+    def read_last_index(self, resources: Resources) -> Optional[Any]:
+        try:
+            return self.__read_index(resources, "last")
+        except (IOError, pa.ArrowException) as e:
+            raise ConnectionError(self, str(e))
+
+    def __read_boundary(self, resources: Resources, mode: Literal["first", "last"]) -> Optional[pd.DataFrame]:
+        try:
+            index = self.__read_index(resources, mode)
+            if index is None:
+                return pd.DataFrame()
+            return self.__read(resources, index, index)
+
+        except (IOError, pa.ArrowException) as e:
+            raise ConnectionError(self, str(e))
+
+    def __read(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> pd.DataFrame:
+        data = []
+        for group, group_resources in resources.groupby("group"):
+            files = self.__get_files(group, start, end)
+            group_data = self.__read_files(group_resources, files, start, end)
+            if not group_data.empty:
+                data.append(group_data)
+
+        if len(data) == 0:
+            return pd.DataFrame()
+        data = sorted(data, key=lambda d: min(d.index))
+        return pd.concat(data, axis="columns")
+
+    def __read_index(self, resources: Resources, mode: Literal["first", "last"]) -> Optional[pd.Timestamp]:
+        indices = [i for i in (self.__get_index(r, mode) for r in resources) if i is not None]
+        if len(indices) == 0:
+            return None
+        return min(indices) if mode == "first" else max(indices)
+
+    # noinspection PyTypeChecker
+    def __get_index(self, resource: Resource, mode: Literal["first", "last"]) -> Optional[pd.Timestamp]:
+        column = _get_column(resource)
+        partitions = self.__get_partitions(resource.group)
+        if mode == "last":
+            partitions = reversed(partitions)
+        for partition in partitions:
+            indices = []
+            for path in _get_files(partition):
+                index = _read_index(path, column, mode)
+                if index is not None:
+                    indices.append(index)
+            if len(indices) > 0:
+                return min(indices) if mode == "first" else max(indices)
+        return None
+
+    def delete(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> None:
+        start = _to_utc(start)
+        end = _to_utc(end)
+        try:
+            for group, _ in resources.groupby("group"):
+                group_dir = os.path.join(self._data_dir, _format_key(group))
+                if not os.path.isdir(group_dir):
+                    continue
+                if start is None and end is None:
+                    shutil.rmtree(group_dir)
+                    continue
+
+                for partition in self.__get_partitions(group, start, end):
+                    for path in _get_files(partition):
+                        self.__delete_file(path, start, end)
+                    if len(_get_files(partition)) == 0:
+                        shutil.rmtree(partition)
+
+        except (IOError, pa.ArrowException) as e:
+            raise ConnectionError(self, str(e))
+
+    def __delete_file(self, path: str, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> None:
+        first, last = _read_statistics(path)
+        if first is None or ((end is not None and first > end) or (start is not None and last < start)):
+            return
+        if (start is None or first >= start) and (end is None or last <= end):
+            os.remove(path)
+            return
+
+        index = ds.field(_INDEX)
+        expression = None
+        if start is not None:
+            expression = index < start
+        if end is not None:
+            expression = index > end if expression is None else expression | (index > end)
+        table = ds.dataset(path, format="parquet").to_table(filter=expression)
+        if table.num_rows == 0:
+            os.remove(path)
+            return
+        _write_table(table, path, self.compression)
+
+    def write(self, data: pd.DataFrame) -> None:
+        try:
+            for group, group_resources in self.resources.filter(lambda c: c.id in data.columns).groupby("group"):
+                group_data = data[group_resources.ids].dropna(axis="index", how="all").dropna(axis="columns", how="all")
+                if group_data.empty:
+                    continue
+
+                group_data = group_data.rename(columns={r.id: _get_column(r) for r in group_resources})
+                group_data.index = _to_utc_index(group_data.index)
+                group_data.index.name = _INDEX
+                group_data = group_data.sort_index()
+
+                # Every write adds a new file to each partition, instead of rewriting the existing files
+                partitions = group_data.index.strftime(PARTITION_FORMATS[self.freq])
+                for partition, partition_data in group_data.groupby(partitions):
+                    partition_dir = os.path.join(self._data_dir, _format_key(group), partition)
+                    os.makedirs(partition_dir, exist_ok=True)
+
+                    table = pa.Table.from_pandas(partition_data.reset_index(), preserve_index=False)
+                    _write_table(table, os.path.join(partition_dir, _build_filename()), self.compression)
+
+        except (IOError, pa.ArrowException) as e:
+            raise ConnectionError(self, str(e))
+
+    def compact(self, full: bool = False) -> None:
+        """
+        Compact partitions to a single file, sorted by their index and with duplicate timestamps merged.
+
+        :param full:
+            the flag, whether all partitions with more than one file should be compacted, instead of only those
+            exceeding the configured number of files.
+        :type full:
+            bool
+        """
+        self.__compact(full=full)
+
+    def __compact(self, full: bool = False, stop: Optional[Event] = None) -> None:
+        if not os.path.isdir(self._data_dir):
+            return
+        for group_key in sorted(os.listdir(self._data_dir)):
+            group_dir = os.path.join(self._data_dir, group_key)
+            if not os.path.isdir(group_dir):
+                continue
+            for partition in _get_partitions(group_dir):
+                files = _get_files(partition)
+                if len(files) < (2 if full else self.compaction_files):
+                    continue
+                with self._lock:
+                    if stop is not None and stop.is_set():
+                        return
+                    self.__compact_partition(partition)
+
+    def __compact_partition(self, partition: str) -> None:
+        files = _get_files(partition)
+        if len(files) < 2:
+            return
+        data = _merge([ds.dataset(f, format="parquet").to_table().to_pandas().set_index(_INDEX) for f in files])
+        data = data.dropna(axis="index", how="all")
+        if data.empty:
+            for file in files:
+                os.remove(file)
+            return
+        # The compacted file is written before removing the existing files, to not lose data if interrupted
+        table = pa.Table.from_pandas(data.reset_index(), preserve_index=False)
+        _write_table(table, os.path.join(partition, _build_filename()), self.compression)
+        for file in files:
+            os.remove(file)
+
+        self._logger.debug(f"Compacted {len(files)} files of Parquet partition '{partition}'")
+
+    # noinspection PyBroadException
+    def __run_compaction(self, stop: Event) -> None:
+        while not stop.wait(self.compaction_interval):
+            try:
+                self.__compact(stop=stop)
+
+            except Exception as e:
+                self._logger.warning(f"Error compacting Parquet database '{self.id}': {str(e)}")
+                if self._logger.getEffectiveLevel() <= logging.DEBUG:
+                    self._logger.exception(e)
+
+    def __read_files(
+        self,
+        resources: Resources,
+        files: List[str],
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> pd.DataFrame:
+        start = _to_utc(start)
+        end = _to_utc(end)
+
+        # Only the row groups within the range are read, by pushing down the range to the statistics of each file
+        index = ds.field(_INDEX)
+        expression = None
+        if start is not None:
+            expression = index >= start
+        if end is not None:
+            expression = index <= end if expression is None else expression & (index <= end)
+
+        columns = [_get_column(r) for r in resources]
+        data = []
+        for path in files:
+            dataset = ds.dataset(path, format="parquet")
+            file_columns = [c for c in columns if c in dataset.schema.names]
+            if len(file_columns) == 0:
+                continue
+            file_data = dataset.to_table(columns=[_INDEX, *file_columns], filter=expression).to_pandas()
+            if not file_data.empty:
+                data.append(file_data.set_index(_INDEX))
+
+        data = _merge(data)
+        data = data.dropna(axis="columns", how="all").dropna(axis="index", how="all")
+        return data.rename(columns={_get_column(r): r.id for r in resources})
+
+    def __get_files(self, group: str, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> List[str]:
+        return [f for p in self.__get_partitions(group, start, end) for f in _get_files(p)]
+
+    def __get_partitions(
+        self,
+        group: str,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> List[str]:
+        group_dir = os.path.join(self._data_dir, _format_key(group))
+        if not os.path.isdir(group_dir):
+            return []
+
+        # Partition names sort in time order, and are compared to the partitions of the range boundaries
+        partition_format = PARTITION_FORMATS[self.freq]
+        partitions = []
+        for partition in _get_partitions(group_dir):
+            partition_name = os.path.basename(partition)
+            if start is not None and partition_name < _to_utc(start).strftime(partition_format):
+                continue
+            if end is not None and partition_name > _to_utc(end).strftime(partition_format):
+                continue
+            partitions.append(partition)
+        return partitions
+
+
+def _format_key(key: Optional[str]) -> str:
+    if key is None:
+        key = "default"
+    return re.sub(r"\W", "_", key).lower()
+
+
+def _get_column(resource: Resource) -> str:
+    return resource.get("column", default=resource.key)
+
+
+def _get_partitions(group_dir: str) -> List[str]:
+    return [os.path.join(group_dir, p) for p in sorted(os.listdir(group_dir)) if not p.startswith(".")]
+
+
+def _get_files(partition: str) -> List[str]:
+    # File names start with the time they were written at, to sort them in write order
+    return [os.path.join(partition, f) for f in sorted(os.listdir(partition)) if f.endswith(".parquet")]
+
+
+def _build_filename() -> str:
+    return f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+
+
+def _write_table(table: pa.Table, path: str, compression: str) -> None:
+    pq.write_table(table, f"{path}.tmp", compression=compression)
+    os.replace(f"{path}.tmp", path)
+
+
+def _merge(data: List[pd.DataFrame]) -> pd.DataFrame:
+    if len(data) == 0:
+        return pd.DataFrame()
+    data = pd.concat(data, axis="index") if len(data) > 1 else data[0]
+    if data.index.has_duplicates:
+        # Values written later take precedence over earlier ones, while keeping values of other columns
+        return data.groupby(level=0, sort=True).last()
+    return data.sort_index()
+
+
+def _read_statistics(path: str) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    metadata = pq.ParquetFile(path).metadata
+    first = None
+    last = None
+    for row_group in range(metadata.num_row_groups):
+        statistics = _get_statistics(metadata.row_group(row_group), _INDEX)
+        if statistics is None or not statistics.has_min_max:
+            return _read_boundaries(path)
+        first = min(first, _to_timestamp(statistics.min)) if first is not None else _to_timestamp(statistics.min)
+        last = max(last, _to_timestamp(statistics.max)) if last is not None else _to_timestamp(statistics.max)
+    return first, last
+
+
+def _read_boundaries(path: str) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    index = pq.read_table(path, columns=[_INDEX]).column(_INDEX).to_pandas()
+    if index.empty:
+        return None, None
+    return _to_timestamp(index.min()), _to_timestamp(index.max())
+
+
+def _read_index(path: str, column: str, mode: Literal["first", "last"]) -> Optional[pd.Timestamp]:
+    file = pq.ParquetFile(path)
+    metadata = file.metadata
+    if column not in file.schema_arrow.names:
+        return None
+
+    indices = []
+    for row_group in range(metadata.num_row_groups):
+        row_group_metadata = metadata.row_group(row_group)
+        index_statistics = _get_statistics(row_group_metadata, _INDEX)
+        value_statistics = _get_statistics(row_group_metadata, column)
+        if value_statistics is not None and value_statistics.null_count == row_group_metadata.num_rows:
+            continue
+        if (
+            index_statistics is not None
+            and index_statistics.has_min_max
+            and value_statistics is not None
+            and value_statistics.null_count == 0
+        ):
+            # Footer statistics are only exact, if the column has a value in every row
+            indices.append(_to_timestamp(index_statistics.min if mode == "first" else index_statistics.max))
+            continue
+
+        data = file.read_row_group(row_group, columns=[_INDEX, column]).to_pandas()
+        index = data.loc[data[column].notna(), _INDEX]
+        if not index.empty:
+            indices.append(_to_timestamp(index.min() if mode == "first" else index.max()))
+
+    if len(indices) == 0:
+        return None
+    return min(indices) if mode == "first" else max(indices)
+
+
+def _get_statistics(row_group: pq.RowGroupMetaData, column: str) -> Optional[pq.Statistics]:
+    for index in range(row_group.num_columns):
+        column_metadata = row_group.column(index)
+        if column_metadata.path_in_schema == column:
+            return column_metadata.statistics if column_metadata.is_stats_set else None
+    return None
+
+
+def _to_timestamp(date: Any) -> pd.Timestamp:
+    date = pd.Timestamp(date)
+    if date.tzinfo is None:
+        return date.tz_localize(tz.UTC)
+    return date.tz_convert(tz.UTC)
+
+
+def _to_utc(date: Optional[Timestamp]) -> Optional[pd.Timestamp]:
+    if date is None or pd.isna(date):
+        return None
+    return _to_timestamp(date)
+
+
+def _to_utc_index(index: pd.Index) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(index)
+    if index.tzinfo is None:
+        return index.tz_localize(tz.UTC)
+    return index.tz_convert(tz.UTC)
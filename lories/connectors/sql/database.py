@@ -9,7 +9,7 @@ lories.connectors.sql.database
 from __future__ import annotations
 
 from collections import OrderedDict
-from typing import Any, Dict, Iterator, Mapping, Optional
+from typing import Any, Collection, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 from sqlalchemy import Connection, Dialect, Engine, create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
@@ -19,9 +19,9 @@ import pytz as tz
 from lories.connectors import ConnectionError, Database, DatabaseException, register_connector_type
 from lories.connectors.sql import Schema, Table
 from lories.core.configs import ConfigurationError
-from lories.data.util import hash_value
+from lories.data.util import BINARY_HASH_METHODS, hash_value
 from lories.typing import Configurations, Resources, Timestamp
-from lories.util import to_timezone
+from lories.util import to_timedelta, to_timezone
 
 # FIXME: Remove this once Python >= 3.9 is a requirement
 try:
@@ -141,7 +141,7 @@ class SqlDatabase(Database, Mapping[str, Table]):
             self._connection.close()
             self._logger.debug("Disconnected from the database")
 
-    def _select_timezone(self) -> tz.BaseTzInfo:
+    def _select_timezone(self, connection: Optional[Connection] = None) -> tz.BaseTzInfo:
         if self.dialect.name == "postgresql":
             query = "SHOW TIMEZONE"
         elif self.dialect.name in ("mariadb", "mysql"):
@@ -151,7 +151,9 @@ class SqlDatabase(Database, Mapping[str, Table]):
         else:
             raise NotImplementedError(f"Timezone setting not implemented for dialect: {self.dialect.name}")
         try:
-            result = self.connection.execute(text(query))
+            if connection is None:
+                connection = self.connection
+            result = connection.execute(text(query))
             timezone = result.scalar()
             return to_timezone(timezone)
         except KeyError:
@@ -159,7 +161,7 @@ class SqlDatabase(Database, Mapping[str, Table]):
         except SQLAlchemyError as e:
             raise RuntimeError(f"Error fetching timezone: {e}")
 
-    def _set_timezone(self, timezone: tz.BaseTzInfo) -> None:
+    def _set_timezone(self, timezone: tz.BaseTzInfo, connection: Optional[Connection] = None) -> None:
         # tz_offset = pd.Timestamp.now(timezone).strftime("%:z")
         tz_offset = pd.Timestamp.now(timezone).strftime("%z")
         tz_offset = tz_offset[:3] + ":" + tz_offset[3:]
@@ -171,17 +173,22 @@ class SqlDatabase(Database, Mapping[str, Table]):
         else:
             raise NotImplementedError(f"Timezone setting not implemented for dialect: {self.dialect.name}")
 
-        self.connection.execute(text(query))
-        self.connection.commit()
+        if connection is None:
+            connection = self.connection
+        connection.execute(text(query))
+        connection.commit()
 
     def hash(
         self,
         resources: Resources,
         start: Optional[Timestamp] = None,
         end: Optional[Timestamp] = None,
-        method: Literal["MD5", "SHA1", "SHA256", "SHA512"] = "MD5",
+        method: Literal["MD5", "SHA1", "SHA256", "SHA512", "BLAKE2B", "XXH3"] = "MD5",
         encoding: str = "UTF-8",
     ) -> Optional[str]:
+        if method.lower() in BINARY_HASH_METHODS:
+            # Binary checksums can not be generated server-side and are hashed from the read data instead
+            return super().hash(resources, start, end, method=method, encoding=encoding)
         hashes = []
         try:
             for table_schema, schema_resources in resources.groupby("schema"):
@@ -214,6 +221,33 @@ class SqlDatabase(Database, Mapping[str, Table]):
 
         return hash_value(",".join(hashes), method, encoding)
 
+    def count(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> int:
+        count = 0
+        try:
+            for table_schema, schema_resources in resources.groupby("schema"):
+                for table_name, table_resources in schema_resources.groupby(lambda c: c.get("table", default=c.group)):
+                    if table_name not in self.__tables:
+                        raise DatabaseException(self, f"Table '{table_name}' not available")
+
+                    table = self.get(table_name)
+                    select = table.count(table_resources, start, end)
+                    result = self.connection.execute(select)
+
+                    # noinspection PyTypeChecker
+                    if result.rowcount < 1:
+                        continue
+                    table_count = result.scalar()
+                    if table_count is not None:
+                        count += int(table_count)
+        except SQLAlchemyError as e:
+            self._raise(e)
+        return count
+
     def exists(
         self,
         resources: Resources,
@@ -234,7 +268,7 @@ class SqlDatabase(Database, Mapping[str, Table]):
                     if result.rowcount < 1:
                         continue
                     count = result.scalar()
-                    if count is None or int(count) > 1:
+                    if count is not None and int(count) > 0:
                         return True
         except SQLAlchemyError as e:
             self._raise(e)
@@ -274,6 +308,89 @@ class SqlDatabase(Database, Mapping[str, Table]):
         results = sorted(results, key=lambda d: min(d.index))
         return pd.concat(results, axis="columns")
 
+    def read_many(
+        self,
+        requests: Sequence[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]],
+    ) -> Iterator[pd.DataFrame]:
+        # Merge adjacent ranges into fewer queries, to avoid paying the query latency for each range
+        return self._read_merged(requests)
+
+    # noinspection PyUnresolvedReferences, PyTypeChecker
+    def read_iter(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        chunk: Optional[int | str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        tables = self.__get_tables(resources)
+        if len(tables) != 1 or isinstance(chunk, str):
+            # Results of several tables can not be streamed in time order with a single cursor
+            yield from super().read_iter(resources, start, end, chunk)
+            return
+        if chunk is None:
+            chunk = 10000
+
+        table, table_resources = tables[0]
+        try:
+            # Stream the results with a server-side cursor of a dedicated connection, as other queries may be executed
+            # in between chunks with the shared connection
+            with self.engine.connect() as connection:
+                self._set_timezone(tz.UTC, connection)
+
+                select = table.read(table_resources, start, end)
+                result = connection.execution_options(stream_results=True, yield_per=chunk).execute(select)
+                keys = list(result.keys())
+                for rows in result.partitions(chunk):
+                    result_data = table.extract_rows(table_resources, rows, keys)
+                    if not result_data.empty:
+                        yield result_data
+
+        except SQLAlchemyError as e:
+            self._raise(e)
+
+    # noinspection PyUnresolvedReferences, PyTypeChecker
+    def _read_aggregates(
+        self,
+        resources: Resources,
+        freq: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        methods: Collection[str],
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        if "last" in methods:
+            # The last value of each bucket can not be selected with a generic GROUP BY clause
+            return None
+
+        seconds = int(to_timedelta(freq).total_seconds())
+        aggregates = {}
+        try:
+            if self.dialect.name in ["mariadb", "mysql"]:
+                # UNIX_TIMESTAMP() interprets datetime indices in the session time zone, which needs to be UTC
+                # for buckets to be aligned, even if the session time zone was changed since connecting
+                self._set_timezone(tz.UTC)
+
+            for table, table_resources in self.__get_tables(resources):
+                select = table.aggregate(table_resources, seconds, start, end)
+                if select is None:
+                    return None
+
+                result = self.connection.execute(select)
+                aggregates.update(table.extract_aggregates(table_resources, result))
+        except SQLAlchemyError as e:
+            self._raise(e)
+        return aggregates
+
+    def __get_tables(self, resources: Resources) -> List[Tuple[Table, Resources]]:
+        tables = []
+        for table_schema, schema_resources in resources.groupby("schema"):
+            for table_name, table_resources in schema_resources.groupby(lambda c: c.get("table", default=c.group)):
+                table_key = table_name if table_schema is None else f"{table_schema}.{table_name}"
+                if table_key not in self.__tables:
+                    raise DatabaseException(self, f"Table '{table_key}' not available")
+                tables.append((self.get(table_key), table_resources))
+        return tables
+
     # noinspection PyUnresolvedReferences, PyTypeChecker
     def read_first(self, resources: Resources) -> pd.DataFrame:
         results = []
@@ -8,10 +8,10 @@ lories.connectors.sql.table
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import sqlalchemy as sql
-from sqlalchemy import ClauseElement, Dialect, Result, UnaryExpression
+from sqlalchemy import ClauseElement, Dialect, Result, Row, UnaryExpression
 from sqlalchemy.sql import Delete, Insert, Select, and_, asc, between, desc, func, literal, not_, or_, text
 from sqlalchemy.types import BLOB, DATETIME, TIMESTAMP
 
@@ -21,6 +21,7 @@ import pytz as tz
 from lories.connectors.sql.columns import Column, DatetimeColumn, SurrogateKeyColumn
 from lories.connectors.sql.index import DatetimeIndexType
 from lories.core import ResourceError, Resources
+from lories.data.util import AGGREGATE_METHODS
 from lories.typing import Resource, Timestamp
 
 # FIXME: Remove this once Python >= 3.9 is a requirement
@@ -31,6 +32,9 @@ except ImportError:
     from typing_extensions import Literal
 
 
+_AGGREGATE_BUCKET = "aggregate_bucket"
+
+
 class Table(sql.Table):
     def __init__(
         self,
@@ -108,14 +112,17 @@ class Table(sql.Table):
         return clauses
 
     def extract(self, resources: Resources, result: Result[Any]) -> pd.DataFrame:
-        result_columns = [r.id for r in resources]
-        results = []
-
         # noinspection PyUnresolvedReferences
         if result.rowcount < 1:
-            return pd.DataFrame(columns=result_columns)
+            return pd.DataFrame(columns=[r.id for r in resources])
 
-        data = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+        return self.extract_rows(resources, result.fetchall(), list(result.keys()))
+
+    def extract_rows(self, resources: Resources, rows: Sequence[Row[Any]], keys: Sequence[str]) -> pd.DataFrame:
+        result_columns = [r.id for r in resources]
+        results = []
+
+        data = pd.DataFrame(rows, columns=keys)
         for group, group_resources in self._groupby(resources):
 
             def _is_group(row: pd.Series) -> bool:
@@ -167,7 +174,7 @@ class Table(sql.Table):
             results.loc[:, [result_column]] = np.nan
         return results
 
-    def exists(
+    def count(
         self,
         resources: Resources,
         start: Optional[Timestamp] = None,
@@ -176,6 +183,19 @@ class Table(sql.Table):
         columns = self.__get_columns(resources)
         select = sql.select(*columns)
         select = select.where(and_(*self._primary_clauses(resources, start, end)))
+        select = select.subquery(name="count_range")
+        query = sql.select(func.count().label("count")).select_from(select)
+        return query
+
+    def exists(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> Select:
+        columns = self.__get_columns(resources)
+        select = sql.select(*columns)
+        select = select.where(and_(*self._primary_clauses(resources, start, end))).limit(1)
         select = select.subquery(name="exists_range")
         query = sql.select(func.count().label("count")).select_from(select)
         return query
@@ -197,8 +217,7 @@ class Table(sql.Table):
             if column.type == DATETIME or isinstance(column.type, DATETIME):
                 # TODO: Verify if there is a more generic way to implement time
                 raise ValueError(
-                    f"Unable to generate consistent hashes for table '{self.name}' "
-                    f"with DATETIME column: {column.name}",
+                    f"Unable to generate consistent hashes for table '{self.name}' with DATETIME column: {column.name}",
                 )
             if column.type == TIMESTAMP or isinstance(column.type, TIMESTAMP):
                 return func.unix_timestamp(column)
@@ -233,6 +252,70 @@ class Table(sql.Table):
         query = query.where(and_(*self._primary_clauses(resources, start, end)))
         return query.order_by(*self._primary_order(order_by))
 
+    def aggregate(
+        self,
+        resources: Resources,
+        seconds: int,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> Optional[Select]:
+        """
+        Select the minimum, maximum, sum and count of resource values, grouped in buckets of the passed seconds.
+
+        Buckets are labeled by their right edge as UNIX timestamp, which they include. Returns None, if the dialect or
+        datetime index of the table does not allow to group values in time buckets. MySQL and MariaDB interpret
+        datetime indices in the session time zone, which needs to be UTC for buckets to be aligned to UTC.
+        """
+        primary_index = self.primary_index
+        if self.datetime_index_type == DatetimeIndexType.TIMESTAMP_UNIX:
+            epoch = primary_index
+        elif self.datetime_index_type in (DatetimeIndexType.TIMESTAMP, DatetimeIndexType.DATETIME):
+            if self.dialect.name == "postgresql":
+                epoch = func.extract("epoch", primary_index)
+            elif self.dialect.name in ["mariadb", "mysql"]:
+                epoch = func.unix_timestamp(primary_index)
+            else:
+                return None
+        else:
+            return None
+        bucket = (func.ceil(epoch / seconds) * seconds).label(_AGGREGATE_BUCKET)
+
+        surrogate_columns = [c for c in self.primary_key.columns if isinstance(c, SurrogateKeyColumn)]
+        aggregate_columns = []
+        for column in self.__get_resource_columns(resources):
+            for method in AGGREGATE_METHODS:
+                aggregate_columns.append(getattr(func, method)(column).label(f"{column.name}:{method}"))
+
+        query = sql.select(*surrogate_columns, bucket, *aggregate_columns)
+        query = query.where(and_(*self._primary_clauses(resources, start, end)))
+        return query.group_by(*surrogate_columns, bucket).order_by(bucket)
+
+    def extract_aggregates(self, resources: Resources, result: Result[Any]) -> Dict[str, pd.DataFrame]:
+        aggregates = {}
+
+        data = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+        if data.empty:
+            return aggregates
+
+        for group, group_resources in self._groupby(resources):
+            group_data = data
+            for column, value in group.items():
+                group_data = group_data[group_data[column] == value]
+
+            index = pd.DatetimeIndex(pd.to_datetime(group_data[_AGGREGATE_BUCKET].astype(float), unit="s", utc=True))
+            for resource in group_resources:
+                column = resource.get("column", default=resource.key)
+                if f"{column}:count" not in group_data.columns:
+                    continue
+                resource_aggregates = pd.DataFrame(
+                    {m: group_data[f"{column}:{m}"].astype(float).values for m in AGGREGATE_METHODS},
+                    index=index,
+                )
+                resource_aggregates["count"] = resource_aggregates["count"].astype(int)
+                resource_aggregates["last"] = np.nan
+                aggregates[resource.id] = resource_aggregates[resource_aggregates["count"] > 0]
+        return aggregates
+
     # noinspection PyUnresolvedReferences
     def write(self, resources: Resources, data: pd.DataFrame) -> Insert:
         resources = resources.filter(lambda r: r.id in data.columns)
@@ -10,10 +10,11 @@ from __future__ import annotations
 
 import os
 import re
-from typing import Optional, Sequence
+from typing import Iterator, Optional, Sequence, Tuple
 
 import pandas as pd
 from lories.connectors import ConnectionError, Database, register_connector_type
+from lories.data.dtypes import from_epoch, to_epoch
 from lories.typing import Configurations, Resources, Timestamp
 from pandas import HDFStore
 
@@ -102,7 +103,7 @@ class HDFDatabase(Database):
 
                 group_data = self.__store.select(
                     group_key,
-                    where=_build_where(start, end),
+                    where=_build_where(start, end, epoch=self.__is_epoch()),
                     columns=self.__build_columns(group_resources),
                 )
                 group_data = self.__extract_data(group_resources, group_data)
@@ -116,6 +117,46 @@ class HDFDatabase(Database):
         data = sorted(data, key=lambda d: min(d.index))
         return pd.concat(data, axis="columns")
 
+    def read_many(
+        self,
+        requests: Sequence[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]],
+    ) -> Iterator[pd.DataFrame]:
+        # Merge adjacent ranges into fewer queries, to avoid paying the query latency for each range
+        return self._read_merged(requests)
+
+    # noinspection PyTypeChecker, PyUnresolvedReferences
+    def read_iter(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        chunk: Optional[int | str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        groups = [(g, r) for g, r in resources.groupby("group") if _format_key(g) in self.__store]
+        if len(groups) != 1 or isinstance(chunk, str):
+            # Only a single table can be iterated in time order
+            yield from super().read_iter(resources, start, end, chunk)
+            return
+        if chunk is None:
+            chunk = 100000
+
+        group, group_resources = groups[0]
+        try:
+            group_iterator = self.__store.select(
+                _format_key(group),
+                where=_build_where(start, end, epoch=self.__is_epoch()),
+                columns=self.__build_columns(group_resources),
+                iterator=True,
+                chunksize=chunk,
+            )
+            for group_data in group_iterator:
+                group_data = self.__extract_data(group_resources, group_data)
+                if not group_data.empty:
+                    yield group_data
+
+        except IOError as e:
+            raise ConnectionError(self, str(e))
+
     # noinspection PyTypeChecker, PyUnresolvedReferences
     def read_first(self, resources: Resources) -> Optional[pd.DataFrame]:
         data = []
@@ -170,7 +211,10 @@ class HDFDatabase(Database):
                 if group_key not in self.__store:
                     continue
 
-                self.__store.remove(group_key)
+                if start is None and end is None:
+                    self.__store.remove(group_key)
+                else:
+                    self.__store.remove(group_key, where=_build_where(start, end, epoch=self.__is_epoch()))
 
         except IOError as e:
             raise ConnectionError(self, str(e))
@@ -181,6 +225,8 @@ class HDFDatabase(Database):
                 group_key = _format_key(group)
                 group_data = data[group_resources.ids].dropna(axis="index", how="all").dropna(axis="columns", how="all")
 
+                if self.__is_epoch():
+                    group_data.index = to_epoch(group_data.index)
                 if not self._columns_unique:
                     group_data.rename(
                         columns={r.id: r.get("column", default=r.key) for r in group_resources},
@@ -199,8 +245,13 @@ class HDFDatabase(Database):
             return [r.id for r in resources]
         return [r.get("column", default=r.key) for r in resources]
 
+    def __is_epoch(self) -> bool:
+        return self.dtypes is not None and self.dtypes.is_epoch()
+
     def __extract_data(self, resources: Resources, data: pd.DataFrame) -> pd.DataFrame:
         data.dropna(axis="columns", how="all", inplace=True)
+        if self.__is_epoch():
+            data.index = from_epoch(data.index)
         if not self._columns_unique:
             return data.rename(columns={r.get("column", default=r.key): r.id for r in resources})
         return data
@@ -214,10 +265,11 @@ def _format_key(key: str) -> str:
 def _build_where(
     start: Optional[Timestamp] = None,
     end: Optional[Timestamp] = None,
+    epoch: bool = False,
 ) -> Optional[str]:
     where = []
     if start is not None:
-        where.append(f'index>=Timestamp("{start.isoformat()}")')
+        where.append(f"index>={pd.Timestamp(start).value}" if epoch else f'index>="{pd.Timestamp(start).isoformat()}"')
     if end is not None:
-        where.append(f'index<=Timestamp("{end.isoformat()}")')
+        where.append(f"index<={pd.Timestamp(end).value}" if epoch else f'index<="{pd.Timestamp(end).isoformat()}"')
     return " & ".join(where) if len(where) > 0 else None
@@ -8,6 +8,7 @@ lories.connectors.tasks
 
 from .connect import ConnectTask  # noqa: F401
 from .check import CheckTask  # noqa: F401
-from .read import ReadTask  # noqa: F401
+from .read import ReadTask, ResampleTask  # noqa: F401
 from .write import WriteTask  # noqa: F401
 from .log import LogTask  # noqa: F401
+from .queue import WriteQueue  # noqa: F401
@@ -16,6 +16,8 @@ from lories.connectors.tasks.task import ConnectorTask
 
 
 class CheckTask(ConnectorTask):
+    __slots__ = ()
+
     def run(
         self,
         start: Optional[Timestamp] = None,
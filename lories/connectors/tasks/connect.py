@@ -12,6 +12,8 @@ from lories.connectors.tasks.task import ConnectorTask
 
 
 class ConnectTask(ConnectorTask):
+    __slots__ = ()
+
     # noinspection PyProtectedMember
     def run(self) -> Connector:
         self.connector.set_channels(ChannelState.CONNECTING)
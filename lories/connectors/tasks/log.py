@@ -6,15 +6,30 @@ lories.connectors.tasks.log
 
 """
 
+from typing import Optional
+
+import pandas as pd
+from lories._core._channels import Channels  # noqa
+from lories._core._connector import Connector  # noqa
 from lories.connectors.tasks.write import WriteTask
+from lories.data.channels.filter import LogFilterStates
 
 
 class LogTask(WriteTask):
-    def run(self) -> None:
+    __slots__ = ("filters",)
+
+    filters: Optional[LogFilterStates]
+
+    def __init__(self, connector: Connector, channels: Channels, filters: Optional[LogFilterStates] = None) -> None:
+        super().__init__(connector, channels)
+        self.filters = filters
+
+    def run(self, data: Optional[pd.DataFrame] = None) -> None:
         self._logger.debug(
             f"Logging {len(self.channels)} channels of '{type(self.connector).__name__}': {self.connector.id}"
         )
-        # Pass copied connectors instead of actual objects, including parsed logger specific connector configurations
-        channels = self.channels.from_logger()
+        self._run_write(self.channels, data)
 
-        self._run_write(channels)
+    def to_frame(self) -> pd.DataFrame:
+        # Pass copied connectors instead of actual objects, including parsed logger specific connector configurations
+        return self.channels.from_logger(self.connector.id).to_frame(unique=True)
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+lories.connectors.tasks.queue
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future
+from functools import partial
+from threading import Condition, Lock, Timer, current_thread
+from typing import Callable, List, Optional, Type
+
+import pandas as pd
+import pytz as tz
+from lories._core._channels import Channels  # noqa
+from lories._core._connector import Connector  # noqa
+from lories.connectors.tasks.write import WriteTask
+
+
+class WriteQueue:
+    """
+    Queue of pending writes for a single connector.
+
+    Writes submitted while another write of the connector is still in flight or rate-limited get coalesced
+    per channel and flushed as one bulk call. Connectors persisting time series, like databases, coalesce
+    the full series, with newer values overriding older ones. All other connectors only keep the latest
+    value of each channel, as previous values would be superseded by the device anyway.
+
+    """
+
+    __slots__ = (
+        "_lock",
+        "_idle",
+        "_executor",
+        "_task",
+        "_connector",
+        "_channels",
+        "_data",
+        "_futures",
+        "_flushing",
+        "_timer",
+        "_timestamp",
+    )
+
+    _task: Type[WriteTask]
+    _connector: Connector
+    _channels: Optional[Channels]
+    _data: Optional[pd.DataFrame]
+    _futures: List[Future]
+
+    _flushing: bool
+    _timer: Optional[Timer]
+    _timestamp: pd.Timestamp
+
+    def __init__(self, connector: Connector, executor: Executor, task: Type[WriteTask] = WriteTask) -> None:
+        self._lock = Lock()
+        self._idle = Condition(self._lock)
+        self._executor = executor
+        self._task = task
+        self._connector = connector
+        self._channels = None
+        self._data = None
+        self._futures = []
+        self._flushing = False
+        self._timer = None
+        self._timestamp = pd.NaT
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+    @property
+    def connector(self) -> Connector:
+        return self._connector
+
+    def submit(self, task: WriteTask, data: Optional[pd.DataFrame] = None) -> Future:
+        if data is None:
+            data = task.to_frame()
+
+        future = Future()
+        with self._lock:
+            if self._channels is None:
+                self._channels = type(task.channels)(task.channels)
+            else:
+                self._channels.update(task.channels)
+            self._data = self._coalesce(self._data, data)
+            self._futures.append(future)
+            flush = self._schedule()
+
+        if flush is not None:
+            flush()
+        return future
+
+    def _coalesce(self, pending: Optional[pd.DataFrame], data: pd.DataFrame) -> pd.DataFrame:
+        if pending is not None and not pending.empty:
+            data = data.combine_first(pending)
+        if self._connector.capabilities.write_bulk or len(data.index) <= 1:
+            return data
+
+        # Last value wins for each channel, as devices only keep the latest written value
+        values = [data[c].dropna().iloc[-1:] for c in data.columns]
+        values = [v for v in values if not v.empty]
+        if len(values) == 0:
+            return data.iloc[0:0]
+        return pd.concat(values, axis="columns").sort_index()
+
+    def _schedule(self) -> Optional[Callable[[], None]]:
+        if self._flushing or self._timer is not None or len(self._futures) == 0:
+            return None
+
+        interval = self._connector._interval_write
+        if not pd.isna(self._timestamp) and interval > pd.Timedelta(0):
+            delay = (self._timestamp + interval - pd.Timestamp.now(tz.UTC)).total_seconds()
+            if delay > 0:
+                self._timer = Timer(delay, self._flush_delayed)
+                self._timer.daemon = True
+                self._timer.start()
+                return None
+        return self._flush()
+
+    def _flush_delayed(self) -> None:
+        flush = None
+        with self._lock:
+            # Timers run in their own thread. Skip timers that were cancelled or superseded after they expired,
+            # as well as queues that were already flushed in the meantime
+            if self._timer is not current_thread():
+                return
+            self._timer = None
+            if not self._flushing and len(self._futures) > 0:
+                flush = self._flush()
+
+        if flush is not None:
+            flush()
+
+    # Needs to be called while holding the lock. The returned callable needs to be called after releasing it,
+    # as done callbacks of an already finished flush run immediately and would acquire the lock again.
+    def _flush(self) -> Callable[[], None]:
+        channels = self._channels
+        data = self._data
+        futures = self._futures
+        self._channels = None
+        self._data = None
+        self._futures = []
+        self._flushing = True
+
+        task = self._task(self._connector, channels)
+        try:
+            flush = self._executor.submit(task, data=data)
+            return partial(flush.add_done_callback, partial(self._flush_callback, futures))
+
+        except RuntimeError as e:
+            # The executor was already shut down
+            self._flushing = False
+            self._idle.notify_all()
+            return partial(_set_exception, futures, e)
+
+    def _flush_callback(self, futures: List[Future], flush: Future) -> None:
+        with self._lock:
+            self._flushing = False
+            self._timestamp = pd.Timestamp.now(tz.UTC)
+            self._idle.notify_all()
+            pending = self._schedule()
+
+        exception = None
+        try:
+            flush.result()
+        except Exception as e:
+            exception = e
+
+        for future in futures:
+            if not future.set_running_or_notify_cancel():
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(None)
+
+        if pending is not None:
+            pending()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Immediately flush all pending writes, ignoring the configured write interval, and wait for them to finish.
+
+        :param timeout: The maximum number of seconds to wait for pending writes.
+
+        :returns: True if all pending writes were flushed, otherwise False.
+        """
+        while True:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._idle.wait_for(lambda: not self._flushing, timeout=timeout):
+                    return False
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if len(self._futures) == 0:
+                    return True
+                flush = self._flush()
+            flush()
+
+
+def _set_exception(futures: List[Future], exception: Exception) -> None:
+    for future in futures:
+        if future.set_running_or_notify_cancel():
+            future.set_exception(exception)
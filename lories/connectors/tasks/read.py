@@ -8,8 +8,7 @@ lories.connectors.tasks.read
 
 from __future__ import annotations
 
-import inspect
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import pandas as pd
 from lories._core._channel import ChannelState  # noqa
@@ -17,21 +16,38 @@ from lories.connectors.tasks.task import ConnectorTask
 
 
 class ReadTask(ConnectorTask):
+    __slots__ = ()
+
     # noinspection PyArgumentList
     def run(self, inplace: bool = False, **kwargs) -> Optional[pd.DataFrame]:
         self._logger.debug(
             f"Reading {len(self.channels)} channels of '{type(self.connector).__name__}': {self.connector.id}"
         )
-        signature = inspect.signature(type(self.connector).read)
-        arguments = [p.name for p in signature.parameters.values() if p.kind == p.POSITIONAL_OR_KEYWORD]
+        data = self.connector.read(self.channels, **self._validate_arguments(kwargs))
+        return self._process(data, inplace)
+
+    # noinspection PyProtectedMember, PyUnresolvedReferences
+    async def run_async(self, inplace: bool = False, **kwargs) -> Optional[pd.DataFrame]:
+        if not self.connector.capabilities.asynchronous:
+            return await super().run_async(inplace=inplace, **kwargs)
+
+        self._logger.debug(
+            f"Reading {len(self.channels)} channels of '{type(self.connector).__name__}': {self.connector.id}"
+        )
+        data = await self.connector._do_read_async(self.channels, **self._validate_arguments(kwargs))
+        return self._process(data, inplace)
+
+    def _validate_arguments(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        arguments = self.connector.capabilities.read_arguments
         for argument in list(kwargs.keys()):
             if argument not in arguments:
                 value = kwargs.pop(argument)
                 self._logger.warning(
                     f"Trying to read Connector '{self.connector.id}' with unknown argument '{argument}': {value}"
                 )
+        return kwargs
 
-        data = self.connector.read(self.channels, **kwargs)
+    def _process(self, data: Optional[pd.DataFrame], inplace: bool = False) -> Optional[pd.DataFrame]:
         if data is None or data.dropna(axis="columns", how="all").empty:
             if inplace:
                 self.channels.set_state(ChannelState.NOT_AVAILABLE)
@@ -39,3 +55,19 @@ class ReadTask(ConnectorTask):
         if inplace:
             self.channels.set_frame(data)
         return data
+
+
+class ResampleTask(ReadTask):
+    __slots__ = ()
+
+    # noinspection PyUnresolvedReferences
+    def run(self, freq: str, inplace: bool = False, **kwargs) -> Optional[pd.DataFrame]:
+        self._logger.debug(
+            f"Reading {len(self.channels)} channels of '{type(self.connector).__name__}' resampled to {freq}: "
+            f"{self.connector.id}"
+        )
+        data = self.connector.resample(self.channels, freq, **kwargs)
+        return self._process(data, inplace)
+
+    async def run_async(self, freq: str, inplace: bool = False, **kwargs) -> Optional[pd.DataFrame]:
+        return await super(ReadTask, self).run_async(freq=freq, inplace=inplace, **kwargs)
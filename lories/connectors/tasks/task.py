@@ -8,9 +8,9 @@ lories.connectors.tasks.task
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from threading import Thread
 from typing import Any
 
 from lories._core._channel import ChannelState  # noqa
@@ -19,13 +19,19 @@ from lories._core._connector import Connector  # noqa
 from lories.connectors.errors import ConnectionError, ConnectorError
 
 
-class ConnectorTask(ABC, Thread):
+class ConnectorTask(ABC):
+    __slots__ = ("connector", "channels")
+
+    _logger: logging.Logger = logging.getLogger(__name__)
+
     connector: Connector
     channels: Channels
 
-    def __init__(self, connector: Connector, channels: Channels, name: str = None, **kwargs):
-        super().__init__(name=name, target=self.__call__, **kwargs)
-        self._logger = logging.getLogger(self.__module__)
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._logger = logging.getLogger(cls.__module__)
+
+    def __init__(self, connector: Connector, channels: Channels) -> None:
         self.connector = connector
         self.channels = channels
 
@@ -46,6 +52,26 @@ class ConnectorTask(ABC, Thread):
         except Exception as e:
             raise ConnectorError(self.connector, str(e))
 
+    async def call_async(self, **kwargs) -> Any:
+        try:
+            return await self.run_async(**kwargs)
+
+        except ConnectionError as e:
+            try:
+                self.connector.set_channels(ChannelState.DISCONNECTING)
+                await asyncio.to_thread(self.connector.disconnect)
+            finally:
+                self.connector.set_channels(ChannelState.DISCONNECTED)
+                raise e
+        except ConnectorError as e:
+            raise e
+        except Exception as e:
+            raise ConnectorError(self.connector, str(e))
+
     @abstractmethod
     def run(self, **kwargs) -> Any:
         pass
+
+    async def run_async(self, **kwargs) -> Any:
+        # Tasks without a native coroutine will be run in a separate thread
+        return await asyncio.to_thread(self.run, **kwargs)
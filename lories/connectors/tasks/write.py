@@ -6,16 +6,26 @@ lories.connectors.tasks.write
 
 """
 
+from typing import Optional
+
+import pandas as pd
 from lories._core._channels import Channels  # noqa
 from lories.connectors.tasks.task import ConnectorTask
 
 
 class WriteTask(ConnectorTask):
-    def run(self) -> None:
+    __slots__ = ()
+
+    def run(self, data: Optional[pd.DataFrame] = None) -> None:
         self._logger.debug(
             f"Writing {len(self.channels)} channels of '{type(self.connector).__name__}': {self.connector.id}"
         )
-        self._run_write(self.channels)
+        self._run_write(self.channels, data)
+
+    def to_frame(self) -> pd.DataFrame:
+        return self.channels.to_frame(unique=True)
 
-    def _run_write(self, channels: Channels) -> None:
-        self.connector.write(channels.to_frame(unique=True))
+    def _run_write(self, channels: Channels, data: Optional[pd.DataFrame] = None) -> None:
+        if data is None:
+            data = self.to_frame()
+        self.connector.write(data)
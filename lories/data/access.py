@@ -8,6 +8,7 @@ lories.data.access
 
 from __future__ import annotations
 
+from concurrent.futures import Future
 from typing import Any, Callable, Collection, Iterable, Optional, Type, overload
 
 import pandas as pd
@@ -223,6 +224,21 @@ class DataAccess(_DataAccess, Configurator):
             data.rename(columns={c.id: c.key for c in channels}, inplace=True)
         return data
 
+    def query(
+        self,
+        channels: Optional[ChannelsArgument] = None,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        timeout: Optional[float] = None,
+        unique: bool = False,
+        freq: Optional[str] = None,
+    ) -> pd.DataFrame:
+        channels = self._filter_by_args(channels)
+        data = self.__context.query(channels=channels, start=start, end=end, timeout=timeout, freq=freq)
+        if not unique:
+            data.rename(columns={c.id: c.key for c in channels}, inplace=True)
+        return data
+
     def read(
         self,
         channels: Optional[ChannelsArgument] = None,
@@ -241,9 +257,10 @@ class DataAccess(_DataAccess, Configurator):
         data: pd.DataFrame,
         channels: Optional[ChannelsArgument] = None,
         timeout: Optional[float] = None,
-    ) -> None:
+        blocking: bool = True,
+    ) -> Future:
         if data is None:
             raise ResourceError(f"Invalid data to write '{self.id}': {data}")
         data.rename(columns={c.key: c.id for c in channels}, inplace=True)
         channels = self._filter_by_args(channels)
-        self.__context.write(data, channels=channels, timeout=timeout)
+        return self.__context.write(data, channels=channels, timeout=timeout, blocking=blocking)
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+"""
+lories.data.cache
+~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+import pytz as tz
+from lories.core import Configurations, Resources
+from lories.core.configs import ConfigurationError
+from lories.core.typing import Timestamp
+from lories.util import floor_date, parse_freq, to_date, to_timedelta
+
+CacheKey = Tuple[str, pd.Timestamp]
+
+# Buckets read up to their inclusive end, like with ceil_date(), are considered complete as well
+_BUCKET_MARGIN = pd.Timedelta(microseconds=1)
+
+_STAMP_FILE = "stamp"
+
+
+class DatabaseCache:
+    """
+    Read-through cache of range queries of a database, split into time buckets of a fixed frequency.
+
+    Buckets are keyed by the set of queried resources and their start, and are held in a memory tier, as well as
+    an optional disk tier, both evicted in least recently used order when exceeding their size limit. Only complete
+    buckets, which ended in the past, are cached and served until they get invalidated by a write or delete of the
+    database. Caches are shared by all instances of a database, as writes of each need to invalidate the buckets
+    read by the others. Databases, that get written to by other processes as well, should not enable the cache.
+
+    The disk tier is stamped with the last index of the database when it gets disconnected. Buckets of previous
+    runs are only restored, if the stamp still matches the database when it gets connected again.
+
+    """
+
+    __slots__ = (
+        "_lock",
+        "_memory",
+        "_memory_size",
+        "_disk",
+        "_disk_size",
+        "_stamped",
+        "_validated",
+        "directory",
+        "freq",
+        "timezone",
+        "memory_limit",
+        "disk_limit",
+    )
+
+    _lock: Lock
+    _memory: OrderedDict[CacheKey, pd.DataFrame]
+    _memory_size: int
+    _disk: OrderedDict[CacheKey, Tuple[str, int]]
+    _disk_size: int
+    _stamped: bool
+    _validated: bool
+
+    _instances: Dict[str, DatabaseCache] = {}
+    _instances_lock: Lock = Lock()
+
+    directory: Optional[str]
+    freq: str
+    timezone: tz.BaseTzInfo
+
+    memory_limit: int
+    disk_limit: int
+
+    # noinspection PyShadowingBuiltins
+    def __init__(
+        self,
+        freq: str = "D",
+        timezone: tz.BaseTzInfo = tz.UTC,
+        memory_limit: int = 64 * 1024**2,
+        disk_limit: int = 1024**3,
+        directory: Optional[str] = None,
+    ) -> None:
+        self._lock = Lock()
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        self._stamped = False
+        self._validated = False
+
+        self.freq = parse_freq(freq)
+        self.timezone = timezone
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.directory = directory
+        if directory is not None:
+            self._load()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(freq={self.freq}, "
+            f"memory={len(self._memory)}/{self._memory_size}B, "
+            f"disk={len(self._disk)}/{self._disk_size}B)"
+        )
+
+    @classmethod
+    def from_configs(cls, configs: Configurations, key: str, timezone: tz.BaseTzInfo) -> Optional[DatabaseCache]:
+        if not configs.has_member("cache"):
+            return None
+        cache_configs = configs.get_member("cache")
+        if not cache_configs.enabled:
+            return None
+
+        freq = cache_configs.get("freq", default="D")
+        try:
+            parse_freq(freq)
+        except ValueError:
+            raise ConfigurationError(f"Invalid cache frequency '{freq}'")
+
+        directory = None
+        if cache_configs.get_bool("disk", default=False):
+            directory = cache_configs.get("path", default=os.path.join(configs.dirs.data, ".cache"))
+            if "~" in directory:
+                directory = os.path.expanduser(directory)
+            if not os.path.isabs(directory):
+                directory = os.path.join(configs.dirs.data, directory)
+            directory = os.path.join(directory, key)
+
+        memory_limit = int(cache_configs.get_float("memory_size", default=64) * 1024**2)
+        disk_limit = int(cache_configs.get_float("disk_size", default=1024) * 1024**2)
+        with cls._instances_lock:
+            # Databases may be instantiated several times, e.g. to be replicated or rotated, and share their cache
+            cache = cls._instances.get(key, None)
+            if cache is None or not cache._is_configured(freq, timezone, memory_limit, disk_limit, directory):
+                cache = cls(freq, timezone, memory_limit, disk_limit, directory)
+                cls._instances[key] = cache
+            return cache
+
+    def _is_configured(
+        self,
+        freq: str,
+        timezone: tz.BaseTzInfo,
+        memory_limit: int,
+        disk_limit: int,
+        directory: Optional[str],
+    ) -> bool:
+        return (
+            self.freq == parse_freq(freq)
+            and self.timezone == timezone
+            and self.memory_limit == memory_limit
+            and self.disk_limit == disk_limit
+            and self.directory == directory
+        )
+
+    def read(
+        self,
+        resources: Resources,
+        start: Timestamp,
+        end: Timestamp,
+        read: Callable[[Resources, pd.Timestamp, pd.Timestamp], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        Read the data of resources in a range, served from cached buckets where available.
+
+        Consecutive missing buckets get read at once with the passed read function, and are cached if complete.
+        """
+        start = to_date(start, timezone=self.timezone)
+        end = to_date(end, timezone=self.timezone)
+        now = pd.Timestamp.now(tz=self.timezone)
+        resources_key = _build_key(resources)
+
+        data = []
+        missing = []
+
+        def _read_missing() -> None:
+            if len(missing) == 0:
+                return
+            missing_start = max(start, missing[0][0])
+            missing_end = min(end, missing[-1][1])
+            missing_data = read(resources, missing_start, missing_end)
+            for bucket_start, bucket_end in missing:
+                bucket_data = _get_bucket(missing_data, bucket_start, bucket_end)
+                if bucket_end <= now and missing_start <= bucket_start and bucket_end - _BUCKET_MARGIN <= missing_end:
+                    self._set((resources_key, bucket_start), bucket_data)
+            data.append(missing_data)
+            missing.clear()
+
+        for bucket_start, bucket_end in self._get_buckets(start, end):
+            bucket_data = self._get((resources_key, bucket_start)) if bucket_end <= now else None
+            if bucket_data is None:
+                missing.append((bucket_start, bucket_end))
+                continue
+            _read_missing()
+            data.append(bucket_data)
+        _read_missing()
+
+        data = [d for d in data if d is not None and not d.empty]
+        if len(data) == 0:
+            return pd.DataFrame()
+        data = pd.concat(data, axis="index")
+        data = data[~data.index.duplicated(keep="last")].sort_index()
+        return data[(data.index >= start) & (data.index <= end)]
+
+    def invalidate(self, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> None:
+        """
+        Invalidate all cached buckets overlapping the passed range, regardless of their resources.
+        """
+        start = floor_date(start, self.timezone, freq=self.freq) if start is not None else None
+        end = to_date(end, timezone=self.timezone) if end is not None else None
+
+        def _is_overlapping(key: CacheKey) -> bool:
+            _, bucket_start = key
+            return (start is None or bucket_start >= start) and (end is None or bucket_start <= end)
+
+        with self._lock:
+            for key in [k for k in self._memory.keys() if _is_overlapping(k)]:
+                self._memory_size -= _get_size(self._memory.pop(key))
+            for key in [k for k in self._disk.keys() if _is_overlapping(k)]:
+                self.__remove_file(*self._disk.pop(key))
+            self.__remove_stamp()
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def validate(self, stamp: Optional[str]) -> None:
+        """
+        Validate the disk tier restored from previous runs against the stamp of the database, and drop it on mismatch.
+
+        The stamp gets removed until the database is disconnected again, so the disk tier of runs that ended without
+        disconnecting is dropped as well.
+        """
+        if self.directory is None:
+            return
+        with self._lock:
+            if self._validated:
+                # Other instances of the database already validated the shared cache
+                return
+            self._validated = True
+
+            path = os.path.join(self.directory, _STAMP_FILE)
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    valid = stamp is not None and file.read() == stamp
+            except IOError:
+                valid = False
+            if not valid:
+                for key in list(self._disk.keys()):
+                    self.__remove_file(*self._disk.pop(key))
+            self._stamped = True
+            self.__remove_stamp()
+
+    def save(self, stamp: Optional[str]) -> None:
+        if self.directory is None or stamp is None:
+            return
+        with self._lock:
+            path = os.path.join(self.directory, _STAMP_FILE)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(stamp)
+                self._stamped = True
+            except IOError:
+                pass
+
+    def _get_buckets(self, start: pd.Timestamp, end: pd.Timestamp) -> Iterator[Tuple[pd.Timestamp, pd.Timestamp]]:
+        bucket_start = floor_date(start, self.timezone, freq=self.freq)
+        while bucket_start <= end:
+            bucket_end = floor_date(bucket_start + to_timedelta(self.freq), self.timezone, freq=self.freq)
+            yield bucket_start, bucket_end
+            bucket_start = bucket_end
+
+    def _get(self, key: CacheKey) -> Optional[pd.DataFrame]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            if key not in self._disk:
+                return None
+
+            path, size = self._disk[key]
+            try:
+                data = pd.read_pickle(path)
+            except (IOError, ValueError, EOFError):
+                self.__remove_file(*self._disk.pop(key))
+                return None
+            try:
+                os.utime(path)
+            except IOError:
+                pass
+            self._disk.move_to_end(key)
+            self.__set_memory(key, data)
+            return data
+
+    def _set(self, key: CacheKey, data: pd.DataFrame) -> None:
+        with self._lock:
+            self.__set_memory(key, data)
+            if self.directory is not None:
+                self.__set_disk(key, data)
+
+    def __set_memory(self, key: CacheKey, data: pd.DataFrame) -> None:
+        if key in self._memory:
+            self._memory_size -= _get_size(self._memory.pop(key))
+        size = _get_size(data)
+        if size > self.memory_limit:
+            return
+        self._memory[key] = data
+        self._memory_size += size
+        while self._memory_size > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= _get_size(evicted)
+
+    def __set_disk(self, key: CacheKey, data: pd.DataFrame) -> None:
+        if key in self._disk:
+            self.__remove_file(*self._disk.pop(key))
+        resources_key, bucket_start = key
+        path = os.path.join(self.directory, f"{bucket_start.value}_{resources_key}.pkl")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            data.to_pickle(path)
+            size = os.path.getsize(path)
+        except IOError:
+            return
+        self._disk[key] = (path, size)
+        self._disk_size += size
+        while self._disk_size > self.disk_limit:
+            _, evicted = self._disk.popitem(last=False)
+            self.__remove_file(*evicted)
+
+    def __remove_stamp(self) -> None:
+        if not self._stamped:
+            return
+        self._stamped = False
+        try:
+            os.remove(os.path.join(self.directory, _STAMP_FILE))
+        except IOError:
+            pass
+
+    def __remove_file(self, path: str, size: int) -> None:
+        self._disk_size -= size
+        try:
+            os.remove(path)
+        except IOError:
+            pass
+
+    def _load(self) -> None:
+        # Restore the disk tier of previous runs, in the order the files were last accessed
+        if not os.path.isdir(self.directory):
+            return
+        files = []
+        for file in os.listdir(self.directory):
+            name, ext = os.path.splitext(file)
+            if ext != ".pkl" or "_" not in name:
+                continue
+            bucket_value, resources_key = name.split("_", 1)
+            path = os.path.join(self.directory, file)
+            stat = os.stat(path)
+            bucket_start = pd.Timestamp(int(bucket_value), tz=tz.UTC).tz_convert(self.timezone)
+            files.append((stat.st_mtime, (resources_key, bucket_start), path, stat.st_size))
+        for _, key, path, size in sorted(files, key=lambda f: f[0]):
+            self._disk[key] = (path, size)
+            self._disk_size += size
+
+
+def _build_key(resources: Resources) -> str:
+    return hashlib.md5(",".join(sorted(resources.ids)).encode("utf-8")).hexdigest()
+
+
+def _get_bucket(data: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    if data is None or data.empty:
+        return pd.DataFrame()
+    return data[(data.index >= start) & (data.index < end)]
+
+
+def _get_size(data: pd.DataFrame) -> int:
+    return int(data.memory_usage(index=True, deep=True).sum())
@@ -8,6 +8,7 @@ lories.data.channels
 
 from ..._core import ChannelState  # noqa: F401
 
+from .filter import LogFilter  # noqa: F401
 from .connector import ChannelConnector  # noqa: F401
 from .converter import ChannelConverter  # noqa: F401
 
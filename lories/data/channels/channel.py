@@ -10,7 +10,7 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from collections.abc import Callable
-from typing import Any, Collection, Dict, List, Optional, Type
+from typing import Any, Collection, Dict, List, Mapping, Optional, Type
 
 import pandas as pd
 import pytz as tz
@@ -18,6 +18,7 @@ from lories._core._channel import ChannelState, _Channel  # noqa
 from lories._core._data import DataContext, DataManager, _DataContext, _DataManager  # noqa
 from lories._core.typing import Timestamp  # noqa
 from lories.core import Resource, ResourceError
+from lories.core.configs import ConfigurationError
 from lories.data.channels import ChannelConnector, ChannelConverter, Channels
 from lories.util import parse_freq, to_timedelta
 
@@ -36,7 +37,7 @@ class Channel(_Channel, Resource):
     _value: Optional[Any] = None
     _state: str | ChannelState = ChannelState.DISABLED
 
-    logger: ChannelConnector
+    loggers: List[ChannelConnector]
     connector: ChannelConnector
     converter: ChannelConverter
 
@@ -50,14 +51,14 @@ class Channel(_Channel, Resource):
         context: DataManager = None,
         converter: ChannelConverter = None,
         connector: Optional[ChannelConnector] = None,
-        logger: Optional[ChannelConnector] = None,
+        logger: Optional[ChannelConnector | Collection[ChannelConnector]] = None,
         **configs: Any,
     ) -> None:
         super().__init__(id=id, key=key, name=name, type=type, **configs)
         self.__context = self._assert_context(context)
         self.converter = self._assert_converter(converter)
         self.connector = self._assert_connector(connector)
-        self.logger = self._assert_connector(logger)
+        self.loggers = self._assert_loggers(logger)
 
     @classmethod
     def _assert_context(cls, context: DataManager) -> DataManager:
@@ -79,6 +80,18 @@ class Channel(_Channel, Resource):
             raise ResourceError(f"Invalid channel connector: {type(connector)}")
         return connector
 
+    @classmethod
+    def _assert_loggers(
+        cls,
+        loggers: Optional[ChannelConnector | Collection[ChannelConnector]],
+    ) -> List[ChannelConnector]:
+        if loggers is None or isinstance(loggers, ChannelConnector):
+            return [cls._assert_connector(loggers)]
+        loggers = [cls._assert_connector(logger) for logger in loggers]
+        if len(loggers) == 0:
+            loggers.append(cls._assert_connector(None))
+        return loggers
+
     def _get_attrs(self) -> List[str]:
         return [
             *super()._get_attrs(),
@@ -108,6 +121,10 @@ class Channel(_Channel, Resource):
         vars["timestamp"] = str(self.timestamp)
         return f"{type(self).__name__}({', '.join(f'{k}={v}' for k, v in vars.items())})"
 
+    @property
+    def logger(self) -> ChannelConnector:
+        return self.loggers[0]
+
     @property
     def freq(self) -> Optional[str]:
         freq = self.get(next((k for k in ["freq", "frequency", "resolution"] if k in self), None), default=None)
@@ -192,8 +209,17 @@ class Channel(_Channel, Resource):
             connector = Channel._build_member(connector, "connector")
             self.connector._update(**connector)
         if logger is not None:
-            logger = Channel._build_member(logger, "connector")
-            self.logger._update(**logger)
+            if isinstance(logger, (str, Mapping)):
+                logger = [logger]
+            if len(logger) != len(self.loggers):
+                # Loggers can only be added or removed by creating the channel again, as their connectors are resolved
+                # by the data manager
+                raise ConfigurationError(
+                    f"Unable to update {len(self.loggers)} loggers of channel '{self.id}' from {len(logger)} configs"
+                )
+            for _logger, _logger_configs in zip(self.loggers, logger):
+                _logger_configs = Channel._build_member(_logger_configs, "connector")
+                _logger._update(**_logger_configs)
         super()._update(**configs)
 
     def _copy_args(self) -> Dict[str, Any]:
@@ -202,7 +228,7 @@ class Channel(_Channel, Resource):
         # arguments["processors"] = self.processors.copy()
         arguments["converter"] = self.converter.copy()
         arguments["connector"] = self.connector.copy()
-        arguments["logger"] = self.logger.copy()
+        arguments["logger"] = [logger.copy() for logger in self.loggers]
 
         return arguments
 
@@ -220,7 +246,10 @@ class Channel(_Channel, Resource):
         configs = super().to_configs()
         configs["converter"] = self.converter.to_configs()
         configs["connector"] = self.connector.to_configs()
-        configs["logger"] = self.logger.to_configs()
+        if len(self.loggers) > 1:
+            configs["logger"] = [logger.to_configs() for logger in self.loggers]
+        else:
+            configs["logger"] = self.logger.to_configs()
         return configs
 
     def to_series(self, state: bool = False) -> pd.Series:
@@ -229,15 +258,30 @@ class Channel(_Channel, Resource):
 
         return self.converter.to_series(self.value, self.timestamp, name=self.key)
 
-    # noinspection PyProtectedMember
-    def from_logger(self) -> Channel:
+    # noinspection PyShadowingBuiltins
+    def get_logger(self, id: Optional[str] = None) -> Optional[ChannelConnector]:
+        if id is None:
+            return self.logger
+        return next((logger for logger in self.loggers if logger.id == id), None)
+
+    # noinspection PyProtectedMember, PyShadowingBuiltins
+    def from_logger(self, id: Optional[str] = None) -> Channel:
+        logger = self.get_logger(id)
+        if logger is None:
+            raise ResourceError(f"Channel '{self.id}' has no logger '{id}'")
+
         channel = self.copy()
-        channel._update(**self.logger._copy_configs())
+        if id is not None:
+            # Move the selected logger to the front, to be referenced as the channels logger
+            channel.loggers.sort(key=lambda logger: logger.id != id)
+        channel._update(**logger._copy_configs())
         return channel
 
     # noinspection PyShadowingBuiltins
     def has_logger(self, *ids: Optional[str]) -> bool:
-        return self.logger.enabled and (any(self.logger.id == id for id in ids) if len(ids) > 0 else True)
+        return any(
+            logger.enabled and (any(logger.id == id for id in ids) if len(ids) > 0 else True) for logger in self.loggers
+        )
 
     # noinspection PyShadowingBuiltins
     def has_connector(self, id: Optional[str] = None) -> bool:
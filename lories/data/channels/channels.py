@@ -10,7 +10,7 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from collections.abc import Callable
-from typing import Any, Iterator, Tuple
+from typing import Any, Iterator, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -18,6 +18,7 @@ from lories._core._channel import Channel, ChannelState, _Channel  # noqa
 from lories._core._channels import Channels as ChannelsType  # noqa
 from lories._core._channels import _Channels  # noqa
 from lories.core import Resources
+from lories.data.dtypes import cast_dtypes, get_dtype
 from lories.data.validation import validate_index
 
 # FIXME: Remove this once Python >= 3.9 is a requirement
@@ -52,8 +53,10 @@ class Channels(_Channels, Resources[Channel]):
     def groupby(self, by: Callable[[Channel], Any] | str) -> Iterator[Tuple[Any, ChannelsType]]:
         return super().groupby(by)
 
-    def from_logger(self) -> ChannelsType:
-        return type(self)([c.from_logger() for c in self if c.has_logger()])
+    # noinspection PyShadowingBuiltins
+    def from_logger(self, id: Optional[str] = None) -> ChannelsType:
+        ids = [id] if id is not None else []
+        return type(self)([c.from_logger(id) for c in self if c.has_logger(*ids)])
 
     def to_frame(self, unique: bool = False, states: bool = False) -> pd.DataFrame:
         data = OrderedDict()
@@ -88,7 +91,7 @@ class Channels(_Channels, Resources[Channel]):
         data.dropna(axis="index", how="all", inplace=True)
         data = validate_index(data)
         data.index.name = _Channel.TIMESTAMP
-        return data
+        return cast_dtypes(data, {c.key if not unique else c.id: get_dtype(c) for c in self})
 
     # noinspection PyProtectedMember
     def set_frame(self, data: pd.DataFrame) -> None:
@@ -16,12 +16,14 @@ from lories._core._connector import Connector, _Connector  # noqa
 from lories._core._database import _Database  # noqa
 from lories.core.configs import ConfigurationError
 from lories.core.errors import ResourceError
-from lories.util import to_bool, update_recursive
+from lories.data.channels.filter import LogFilter
+from lories.util import parse_freq, to_bool, update_recursive
 
 
 class ChannelConnector:
     __configs: OrderedDict[str, Any]
     _connector: Optional[Connector]
+    _filter: Optional[LogFilter]
 
     enabled: bool = False
 
@@ -35,6 +37,7 @@ class ChannelConnector:
         self._connector = self._assert_connector(connector)
 
         self.enabled = to_bool(self.__configs.pop("enabled", connector is not None and connector.is_enabled()))
+        self._filter = LogFilter.from_configs(self.__configs)
 
     @classmethod
     def _assert_connector(cls, connector: Connector) -> Optional[Connector]:
@@ -87,6 +90,17 @@ class ChannelConnector:
     def key(self) -> Optional[str]:
         return self._connector.key if self._connector is not None else None
 
+    @property
+    def freq(self) -> Optional[str]:
+        freq = self.get(next((k for k in ["freq", "frequency", "resolution"] if k in self), None), default=None)
+        if freq is not None:
+            freq = parse_freq(freq)
+        return freq
+
+    @property
+    def filter(self) -> Optional[LogFilter]:
+        return self._filter
+
     def is_configured(self) -> bool:
         return self._connector.is_configured() if self.enabled else False
 
@@ -153,6 +167,8 @@ class ChannelConnector:
         if enabled is not None:
             self.enabled = to_bool(enabled)
         self.__update_configs(configs)
+        if any(k in configs for k in LogFilter.KEYS):
+            self._filter = LogFilter.from_configs(self.__configs)
 
     def copy(self) -> ChannelConnector:
         return type(self)(self._connector, **self._get_args())
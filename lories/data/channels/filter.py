@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+lories.data.channels.filter
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import numbers
+from threading import Lock
+from typing import Any, Collection, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from lories._core._channel import Channel  # noqa
+from lories._core._channels import Channels  # noqa
+from lories.core.configs import ConfigurationError
+from lories.util import to_bool, to_timedelta
+
+LogFilterState = Tuple[pd.Timestamp, Optional[Any], Optional[Channel], float, float]
+
+# Filters are evaluated by the logging cycle, while their pending states get settled by the callbacks of log writes
+_lock = Lock()
+
+
+class LogFilter:
+    """
+    Logging filter of a channel, suppressing values that did not change significantly since they were last logged.
+
+    Numeric values are only logged if they deviate from the last logged value by more than an absolute
+    ``deadband`` or a ``deadband_relative`` fraction of the last logged value. Alternatively, the
+    ``swinging_door`` compression deviation may be configured, to only archive points, where the values
+    leave the corridor of the last archived point. Values that are not numeric, e.g. states or strings,
+    will only be logged on change. Regardless of the filter, values will be logged at least once per
+    ``heartbeat``, if configured.
+
+    The state of the filter advances when values are evaluated, but is only confirmed once the logger wrote the
+    values the filter passed. If the write fails, the filter reverts to its last confirmed state, to let the next
+    logging cycle pass the dropped deviation again.
+
+    """
+
+    KEYS: Tuple[str, ...] = ("deadband", "deadband_relative", "swinging_door", "heartbeat", "on_change")
+
+    __slots__ = (
+        "deadband",
+        "deadband_relative",
+        "swinging_door",
+        "heartbeat",
+        "timestamp",
+        "value",
+        "held",
+        "slope_upper",
+        "slope_lower",
+        "_confirmed",
+        "_version",
+        "_settled",
+    )
+
+    deadband: float
+    deadband_relative: float
+    swinging_door: Optional[float]
+    heartbeat: Optional[pd.Timedelta]
+
+    timestamp: pd.Timestamp
+    value: Optional[Any]
+    held: Optional[Channel]
+    slope_upper: float
+    slope_lower: float
+
+    _confirmed: Optional[LogFilterState]
+    _version: int
+    _settled: int
+
+    def __init__(
+        self,
+        deadband: float = 0.0,
+        deadband_relative: float = 0.0,
+        swinging_door: Optional[float] = None,
+        heartbeat: Optional[pd.Timedelta] = None,
+    ) -> None:
+        self.deadband = deadband
+        self.deadband_relative = deadband_relative
+        self.swinging_door = swinging_door
+        self.heartbeat = heartbeat
+        self.timestamp = pd.NaT
+        self.value = None
+        self.held = None
+        self.slope_upper = np.inf
+        self.slope_lower = -np.inf
+        self._confirmed = None
+        self._version = 0
+        self._settled = 0
+
+    @classmethod
+    def from_configs(cls, configs: Mapping[str, Any]) -> Optional[LogFilter]:
+        if not any(k in configs for k in cls.KEYS):
+            return None
+
+        deadband = float(configs.get("deadband", 0))
+        deadband_relative = float(configs.get("deadband_relative", 0))
+        swinging_door = configs.get("swinging_door", None)
+        if swinging_door is not None:
+            swinging_door = float(swinging_door)
+        heartbeat = configs.get("heartbeat", None)
+        if heartbeat is not None:
+            heartbeat = _parse_heartbeat(heartbeat)
+
+        on_change = to_bool(configs.get("on_change", True))
+        if not on_change and deadband == 0 and deadband_relative == 0 and swinging_door is None:
+            return None
+        if deadband < 0 or deadband_relative < 0 or (swinging_door is not None and swinging_door <= 0):
+            raise ConfigurationError(f"Invalid negative logging filter configuration: {dict(configs)}")
+
+        return cls(deadband, deadband_relative, swinging_door, heartbeat)
+
+    def is_compressing(self) -> bool:
+        return self.swinging_door is not None
+
+    def is_heartbeat(self, timestamp: pd.Timestamp) -> bool:
+        return self.heartbeat is not None and timestamp - self.timestamp >= self.heartbeat
+
+    def archive(self, channel: Channel) -> None:
+        self._stage()
+        self.timestamp = channel.timestamp
+        self.value = channel.value
+        self.held = None
+        self.slope_upper = np.inf
+        self.slope_lower = -np.inf
+
+    def reset(self) -> None:
+        self.timestamp = pd.NaT
+        self.value = None
+        self.held = None
+        self.slope_upper = np.inf
+        self.slope_lower = -np.inf
+        self._confirmed = None
+        self._version += 1
+        self._settled = self._version
+
+    def _get_state(self) -> LogFilterState:
+        return self.timestamp, self.value, self.held, self.slope_upper, self.slope_lower
+
+    def _stage(self) -> None:
+        # Keep the last confirmed state, to be restored if the write of the values passed since then fails
+        if self._confirmed is None:
+            self._confirmed = self._get_state()
+        self._version += 1
+
+    def _confirm(self, version: int, state: LogFilterState) -> None:
+        if version <= self._settled:
+            return
+        self._settled = version
+        if version == self._version:
+            self._confirmed = None
+        else:
+            # The filter already advanced further, pending the writes of later logging cycles
+            self._confirmed = state
+
+    def _revert(self, version: int) -> None:
+        if version <= self._settled or self._confirmed is None:
+            return
+        self.timestamp, self.value, self.held, self.slope_upper, self.slope_lower = self._confirmed
+        self._confirmed = None
+        self._version += 1
+        self._settled = self._version
+
+
+class LogFilterStates:
+    """
+    Pending states of logging filters, to be confirmed or reverted once the write of the values they passed completed.
+
+    """
+
+    __slots__ = ("_states",)
+
+    _states: List[Tuple[LogFilter, int, LogFilterState]]
+
+    # noinspection PyProtectedMember
+    def __init__(self, filters: Collection[LogFilter]) -> None:
+        self._states = [(f, f._version, f._get_state()) for f in filters]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    # noinspection PyProtectedMember
+    def confirm(self) -> None:
+        with _lock:
+            for log_filter, version, state in self._states:
+                log_filter._confirm(version, state)
+
+    # noinspection PyProtectedMember
+    def revert(self) -> None:
+        with _lock:
+            for log_filter, version, _ in self._states:
+                log_filter._revert(version)
+
+
+def _parse_heartbeat(heartbeat: Any) -> pd.Timedelta:
+    if isinstance(heartbeat, numbers.Number):
+        return pd.Timedelta(seconds=heartbeat)
+    heartbeat = to_timedelta(str(heartbeat))
+    if not isinstance(heartbeat, pd.Timedelta):
+        raise ConfigurationError(f"Invalid logging heartbeat of variable length: {heartbeat}")
+    return heartbeat
+
+
+def _is_numeric(value: Any) -> bool:
+    return isinstance(value, (numbers.Real, np.number, np.bool_))
+
+
+# noinspection PyProtectedMember, PyShadowingBuiltins
+def filter_logging(channels: Channels, id: Optional[str] = None) -> Tuple[Channels, LogFilterStates]:
+    """
+    Evaluate the logging filters of the passed channels, in one vectorized pass for all numeric values.
+
+    :param channels: The channels to be logged, that are valid and due to be logged.
+    :param id: The ID of the logging connector, to evaluate the filters of.
+
+    :returns: The channels that passed their logging filter, and the pending states of their filters, to be
+        confirmed once the channels were written. For compressing filters, the channels may be copies of
+        previously held channels, that need to be archived instead of the current value.
+    """
+    logged = []
+    filtered: List[Tuple[Channel, LogFilter]] = []
+    numeric: List[Tuple[Channel, LogFilter]] = []
+    with _lock:
+        for channel in channels:
+            log_filter = channel.get_logger(id).filter
+            if log_filter is None:
+                logged.append(channel)
+                continue
+
+            value = channel.value
+            if pd.isna(log_filter.timestamp) or channel.timestamp < log_filter.timestamp:
+                log_filter.archive(channel)
+                filtered.append((channel, log_filter))
+            elif _is_numeric(value):
+                numeric.append((channel, log_filter))
+            elif isinstance(value, (str, bytes)) or not hasattr(value, "__len__"):
+                if value != log_filter.value or log_filter.is_heartbeat(channel.timestamp):
+                    log_filter.archive(channel)
+                    filtered.append((channel, log_filter))
+            else:
+                # Values with a series of data will not be filtered
+                logged.append(channel)
+
+        if len(numeric) > 0:
+            filtered.extend(_filter_numeric(numeric))
+
+        logged.extend(c for c, _ in filtered)
+        return type(channels)(logged), LogFilterStates([f for _, f in filtered])
+
+
+# noinspection PyProtectedMember
+def _filter_numeric(numeric: List[Tuple[Channel, LogFilter]]) -> List[Tuple[Channel, LogFilter]]:
+    timestamps = np.array([c.timestamp.timestamp() for c, _ in numeric], dtype=float)
+    values = np.array([c.value for c, _ in numeric], dtype=float)
+
+    archived_timestamps = np.array([f.timestamp.timestamp() for _, f in numeric], dtype=float)
+    archived_values = np.array([f.value for _, f in numeric], dtype=float)
+
+    deadband = np.array([f.deadband for _, f in numeric], dtype=float)
+    deadband_relative = np.array([f.deadband_relative for _, f in numeric], dtype=float)
+    deviation = np.array([f.swinging_door if f.is_compressing() else np.nan for _, f in numeric], dtype=float)
+    heartbeat = np.array(
+        [f.heartbeat.total_seconds() if f.heartbeat is not None else np.inf for _, f in numeric], dtype=float
+    )
+
+    elapsed = timestamps - archived_timestamps
+    changed = elapsed > 0
+    heartbeat = changed & (elapsed >= heartbeat)
+
+    threshold = np.maximum(deadband, deadband_relative * np.abs(archived_values))
+    exceeded = changed & (np.abs(values - archived_values) > threshold)
+
+    compressing = ~np.isnan(deviation)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope_upper = np.minimum(
+            np.array([f.slope_upper for _, f in numeric], dtype=float),
+            (values + deviation - archived_values) / elapsed,
+        )
+        slope_lower = np.maximum(
+            np.array([f.slope_lower for _, f in numeric], dtype=float),
+            (values - deviation - archived_values) / elapsed,
+        )
+    closed = changed & compressing & (slope_lower > slope_upper)
+
+    logged = []
+    for i, (channel, log_filter) in enumerate(numeric):
+        if not changed[i]:
+            continue
+        if heartbeat[i] or (exceeded[i] and not compressing[i]):
+            log_filter.archive(channel)
+            logged.append((channel, log_filter))
+
+        elif closed[i]:
+            # The corridor of the last archived point was left. Archive the previously held point
+            # and restart the swinging door from there.
+            held = log_filter.held
+            logged.append((held, log_filter))
+            log_filter.archive(held)
+
+            held_elapsed = timestamps[i] - log_filter.timestamp.timestamp()
+            held_value = float(log_filter.value)
+            log_filter.slope_upper = (values[i] + deviation[i] - held_value) / held_elapsed
+            log_filter.slope_lower = (values[i] - deviation[i] - held_value) / held_elapsed
+            log_filter.held = channel.copy()
+
+        elif compressing[i]:
+            log_filter._stage()
+            log_filter.slope_upper = slope_upper[i]
+            log_filter.slope_lower = slope_lower[i]
+            log_filter.held = channel.copy()
+
+    return logged
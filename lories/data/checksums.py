@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+lories.data.checksums
+~~~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from threading import RLock
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+import pytz as tz
+from lories.core import Configurations, Resources
+from lories.core.configs import ConfigurationError
+from lories.core.typing import Timestamp
+from lories.data.util import BINARY_HASH_METHODS, hash_value
+from lories.util import floor_date, to_date, to_timedelta
+
+# FIXME: Remove this once Python >= 3.9 is a requirement
+try:
+    from typing import Literal
+
+except ImportError:
+    from typing_extensions import Literal
+
+ChecksumLevel = Literal["D", "M", "Y"]
+
+CHECKSUM_LEVELS: Dict[str, Optional[str]] = {
+    "Y": "M",
+    "M": "D",
+    "D": None,
+}
+CHECKSUM_FORMATS: Dict[str, str] = {
+    "Y": "%Y",
+    "M": "%Y-%m",
+    "D": "%Y-%m-%d",
+}
+
+
+class ChecksumTree:
+    """
+    Persistent Merkle tree of checksums of a database, with a level for each day, month and year.
+
+    Checksums of days are generated by the database, while months and years hash the checksums of their children.
+    Nodes are kept for each set of resources in a JSON file, but only for periods already ended in UTC. Writes and
+    deletes of the database remove the nodes of the affected periods, to be regenerated on the next lookup.
+    Comparing the years of two trees only needs to descend into months and days with differing checksums.
+
+    """
+
+    __slots__ = ("_lock", "_logger", "_nodes", "_dirty", "path", "method")
+
+    _lock: RLock
+    _nodes: Dict[str, Dict[str, Any]]
+    _dirty: bool
+
+    path: Optional[str]
+    method: str
+
+    def __init__(self, path: Optional[str] = None, method: str = "BLAKE2B") -> None:
+        self._lock = RLock()
+        self._logger = logging.getLogger(type(self).__module__)
+        self._nodes = {}
+        self._dirty = False
+
+        self.path = path
+        self.method = method
+        if path is not None:
+            self._load()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(groups={len(self._nodes)}, method={self.method})"
+
+    @classmethod
+    def from_configs(cls, configs: Configurations, key: str) -> Optional[ChecksumTree]:
+        if not configs.has_member("checksums"):
+            return None
+        checksum_configs = configs.get_member("checksums")
+        if not checksum_configs.enabled:
+            return None
+
+        method = checksum_configs.get("method", default="BLAKE2B").upper()
+        if method.lower() not in ["md5", "sha1", "sha256", "sha512", *BINARY_HASH_METHODS]:
+            raise ConfigurationError(f"Invalid checksum method '{method}'")
+
+        path = checksum_configs.get("path", default=os.path.join(configs.dirs.data, ".checksums"))
+        if "~" in path:
+            path = os.path.expanduser(path)
+        if not os.path.isabs(path):
+            path = os.path.join(configs.dirs.data, path)
+        return cls(os.path.join(path, f"{key}.json"), method=method)
+
+    # noinspection PyUnresolvedReferences
+    def get(
+        self,
+        database: Any,
+        resources: Resources,
+        start: Timestamp,
+        level: ChecksumLevel = "Y",
+    ) -> Optional[str]:
+        """
+        Get the checksum of the period of a level, the passed start is part of.
+
+        Missing nodes are generated recursively, down to the checksums of days generated by the database.
+        """
+        start = floor_date(to_date(start), tz.UTC, freq=level)
+        end = floor_date(start + to_timedelta(level), tz.UTC, freq=level)
+        period = start.strftime(CHECKSUM_FORMATS[level])
+
+        with self._lock:
+            nodes = self.__get_nodes(resources)
+            if period in nodes[level]:
+                checksum = nodes[level][period]
+                return checksum if checksum != "" else None
+
+        child_level = CHECKSUM_LEVELS[level]
+        if child_level is None:
+            checksum = database.hash(resources, start, end - pd.Timedelta(microseconds=1), method=self.method)
+        else:
+            child_checksums = []
+            for child_start, _ in iter_periods(start, end - pd.Timedelta(microseconds=1), child_level):
+                child_checksum = self.get(database, resources, child_start, child_level)
+                if child_checksum is not None:
+                    child_checksums.append(f"{child_start.strftime(CHECKSUM_FORMATS[child_level])}:{child_checksum}")
+            checksum = hash_value(",".join(child_checksums), self.method) if len(child_checksums) > 0 else None
+
+        # Only periods already ended are final and get persisted
+        if end <= pd.Timestamp.now(tz=tz.UTC):
+            with self._lock:
+                nodes = self.__get_nodes(resources)
+                nodes[level][period] = checksum if checksum is not None else ""
+                self._dirty = True
+        return checksum
+
+    def invalidate(
+        self,
+        resources: Optional[Resources] = None,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> None:
+        """
+        Remove the nodes of all periods overlapping the passed range, of every group containing any of the resources.
+        """
+        start = to_date(start)
+        end = to_date(end)
+        ids = set(resources.ids) if resources is not None else None
+
+        with self._lock:
+            invalidated = False
+            for group in self._nodes.values():
+                if ids is not None and ids.isdisjoint(group["resources"]):
+                    continue
+                for level in CHECKSUM_LEVELS.keys():
+                    level_start = floor_date(start, tz.UTC, freq=level) if start is not None else None
+                    for period in list(group[level].keys()):
+                        period_start = pd.Timestamp(period, tz=tz.UTC)
+                        if level_start is not None and period_start < level_start:
+                            continue
+                        if end is not None and period_start > end:
+                            continue
+                        del group[level][period]
+                        invalidated = True
+            if invalidated:
+                # Persist removed nodes immediately, to never compare stale checksums after a restart
+                self._dirty = True
+                self.save()
+
+    def save(self) -> None:
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                path = f"{self.path}.tmp"
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump({"method": self.method, "groups": self._nodes}, file)
+                os.replace(path, self.path)
+                self._dirty = False
+
+            except IOError as e:
+                self._logger.warning(f"Unable to persist checksums to '{self.path}': {e}")
+
+    def _load(self) -> None:
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                checksums = json.load(file)
+        except (IOError, ValueError) as e:
+            self._logger.warning(f"Unable to load checksums from '{self.path}': {e}")
+            return
+
+        # Checksums generated with a different method can not be compared and are discarded
+        if checksums.get("method") == self.method:
+            self._nodes = checksums.get("groups", {})
+
+    def __get_nodes(self, resources: Resources) -> Dict[str, Any]:
+        ids = sorted(resources.ids)
+        key = hash_value(",".join(ids), "MD5")
+        if key not in self._nodes:
+            self._nodes[key] = {"resources": ids, **{level: {} for level in CHECKSUM_LEVELS.keys()}}
+        return self._nodes[key]
+
+
+def iter_periods(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    level: ChecksumLevel,
+) -> Iterator[Tuple[pd.Timestamp, pd.Timestamp]]:
+    period_start = floor_date(start, tz.UTC, freq=level)
+    while period_start <= end:
+        period_end = floor_date(period_start + to_timedelta(level), tz.UTC, freq=level)
+        yield period_start, period_end
+        period_start = period_end
@@ -10,20 +10,27 @@ from __future__ import annotations
 
 import datetime as dt
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Any, Optional, overload
+from typing import Any, Collection, Dict, Iterator, List, Optional, Sequence, Tuple, overload
 
 import tzlocal
 
 import pandas as pd
 import pytz as tz
+from lories._core._database import _Database  # noqa
 from lories.connectors.connector import Connector, ConnectorMeta
 from lories.connectors.errors import ConnectionError, ConnectorError
 from lories.core import Configurations, Resources
 from lories.core.typing import Timestamp
-from lories.data.util import hash_data
-from lories.data.validation import validate_index, validate_timezone
-from lories.util import convert_timezone, to_date, to_timezone
+from lories.data.cache import DatabaseCache
+from lories.data.checksums import ChecksumTree
+from lories.data.dtypes import DtypePolicy, apply_dtypes
+from lories.data.journal import WriteJournal
+from lories.data.rollups import DatabaseRollups, combine_aggregates, to_resampled
+from lories.data.util import hash_data, resample
+from lories.data.validation import is_arrow, validate_arrow, validate_index, validate_timezone
+from lories.util import convert_timezone, parse_freq, slice_range, to_date, to_timedelta, to_timezone
 
 # FIXME: Remove this once Python >= 3.9 is a requirement
 try:
@@ -38,7 +45,10 @@ class DatabaseMeta(ConnectorMeta):
     def __call__(cls, *args, **kwargs):
         database = super().__call__(*args, **kwargs)
         cls._wrap_method(database, "hash")
+        cls._wrap_method(database, "count")
         cls._wrap_method(database, "exists")
+        cls._wrap_method(database, "read_iter")
+        cls._wrap_method(database, "read_many")
         cls._wrap_method(database, "read_first")
         cls._wrap_method(database, "read_first_index")
         cls._wrap_method(database, "read_last")
@@ -48,9 +58,88 @@ class DatabaseMeta(ConnectorMeta):
         return database
 
 
+class DatabaseIndex:
+    """
+    In-process cache of the first and last index of each resource, persisted in a database.
+
+    Resources are looked up lazily and stay cached, until the connection to the database gets closed.
+    Known empty resources are cached as ``None``, to avoid repeated lookups of resources never written.
+
+    """
+
+    __slots__ = ("_first", "_last")
+
+    _first: Dict[str, Optional[Any]]
+    _last: Dict[str, Optional[Any]]
+
+    def __init__(self) -> None:
+        self._first = {}
+        self._last = {}
+
+    def has_first(self, resources: Resources) -> bool:
+        return all(r.id in self._first for r in resources)
+
+    def has_last(self, resources: Resources) -> bool:
+        return all(r.id in self._last for r in resources)
+
+    # noinspection PyShadowingBuiltins
+    def get_first(self, resources: Resources) -> Optional[Any]:
+        indices = [self._first[r.id] for r in resources if self._first.get(r.id) is not None]
+        if len(indices) == 0:
+            return None
+        return min(indices)
+
+    # noinspection PyShadowingBuiltins
+    def get_last(self, resources: Resources) -> Optional[Any]:
+        indices = [self._last[r.id] for r in resources if self._last.get(r.id) is not None]
+        if len(indices) == 0:
+            return None
+        return max(indices)
+
+    # noinspection PyShadowingBuiltins
+    def set_first(self, id: str, index: Optional[Any]) -> None:
+        self._first[id] = index
+
+    # noinspection PyShadowingBuiltins
+    def set_last(self, id: str, index: Optional[Any]) -> None:
+        self._last[id] = index
+
+    def update(self, data: pd.DataFrame) -> None:
+        for column in data.columns:
+            column_index = data[column].dropna().index
+            if len(column_index) == 0:
+                continue
+            # Only update already known resources, as unknown ones may hold older or newer values
+            if column in self._first:
+                first = self._first[column]
+                self._first[column] = min(column_index) if first is None else min(first, min(column_index))
+            if column in self._last:
+                last = self._last[column]
+                self._last[column] = max(column_index) if last is None else max(last, max(column_index))
+
+    def invalidate(self, resources: Optional[Resources] = None) -> None:
+        if resources is None:
+            self._first.clear()
+            self._last.clear()
+            return
+        for resource in resources:
+            self._first.pop(resource.id, None)
+            self._last.pop(resource.id, None)
+
+
 # noinspection PyUnresolvedReferences
-class Database(Connector, metaclass=DatabaseMeta):
+class Database(Connector, _Database, metaclass=DatabaseMeta):
     timezone: tz.BaseTzInfo
+    dtypes: Optional[DtypePolicy] = None
+    concurrency: Optional[int] = None
+
+    _write_bulk: bool = True
+
+    _index: Optional[DatabaseIndex] = None
+    _cache: Optional[DatabaseCache] = None
+    _checksums: Optional[ChecksumTree] = None
+    _journal: Optional[WriteJournal] = None
+    _rollups: Optional[DatabaseRollups] = None
 
     def configure(self, configs: Configurations) -> None:
         super().configure(configs)
@@ -59,6 +148,76 @@ class Database(Connector, metaclass=DatabaseMeta):
         if timezone is None:
             timezone = tzlocal.get_localzone_name()
         self.timezone = to_timezone(timezone)
+        self.dtypes = DtypePolicy.from_configs(configs.get_member("dtypes", defaults={}))
+        self.concurrency = configs.get_int("concurrency", default=None)
+
+        # Databases, that get written to by other processes as well, need to disable the index cache
+        if configs.get_bool("index_cache", default=True):
+            self._index = DatabaseIndex()
+        else:
+            self._index = None
+        self._cache = DatabaseCache.from_configs(configs, self.id, self.timezone)
+        self._checksums = ChecksumTree.from_configs(configs, self.id)
+        self._journal = WriteJournal.from_configs(configs, self.id)
+        self._rollups = DatabaseRollups.from_configs(configs, self.id, self.timezone)
+
+    # noinspection PyShadowingBuiltins
+    def _get_vars(self) -> Dict[str, Any]:
+        vars = super()._get_vars()
+        vars.pop("_index", None)
+        vars.pop("_cache", None)
+        vars.pop("_checksums", None)
+        vars.pop("_journal", None)
+        vars.pop("_rollups", None)
+        return vars
+
+    def _on_connect(self, resources: Resources) -> None:
+        super()._on_connect(resources)
+        if self._cache is not None:
+            self._cache.validate(self.__get_cache_stamp(resources))
+
+    def _at_disconnect(self) -> None:
+        super()._at_disconnect()
+        if self._cache is not None:
+            self._cache.save(self.__get_cache_stamp(self.resources))
+
+    def __get_cache_stamp(self, resources: Resources) -> Optional[str]:
+        # The last index of all resources is cheap to read and changes with any appending write of other runs
+        if len(resources) == 0:
+            return None
+        try:
+            index = self._run_read_last_index(resources)
+        except ConnectorError as e:
+            self._logger.warning(f"Unable to read last index to stamp cache of database '{self.id}': {e}")
+            return None
+        if index is None:
+            return None
+        if isinstance(index, (pd.Timestamp, dt.datetime)):
+            index = convert_timezone(index, timezone=tz.UTC)
+        return str(index)
+
+    # noinspection PyUnresolvedReferences, PyTypeChecker
+    def _do_disconnect(self) -> None:
+        super()._do_disconnect()
+        if self._index is not None:
+            with self._lock:
+                self._index.invalidate()
+        if self._checksums is not None:
+            self._checksums.save()
+        if self._rollups is not None:
+            self._rollups.save()
+
+    @property
+    def checksums(self) -> Optional[ChecksumTree]:
+        return self._checksums
+
+    @property
+    def journal(self) -> Optional[WriteJournal]:
+        return self._journal
+
+    @property
+    def rollups(self) -> Optional[DatabaseRollups]:
+        return self._rollups
 
     # noinspection PyShadowingBuiltins
     def hash(
@@ -66,7 +225,7 @@ class Database(Connector, metaclass=DatabaseMeta):
         resources: Resources,
         start: Optional[Timestamp] = None,
         end: Optional[Timestamp] = None,
-        method: Literal["MD5", "SHA1", "SHA256", "SHA512"] = "MD5",
+        method: Literal["MD5", "SHA1", "SHA256", "SHA512", "BLAKE2B", "XXH3"] = "MD5",
         encoding: str = "UTF-8",
     ) -> Optional[str]:
         data = self._run_read(resources, start, end)
@@ -84,7 +243,7 @@ class Database(Connector, metaclass=DatabaseMeta):
         resources: Resources,
         start: Optional[Timestamp] = None,
         end: Optional[Timestamp] = None,
-        method: Literal["MD5", "SHA1", "SHA256", "SHA512"] = "MD5",
+        method: Literal["MD5", "SHA1", "SHA256", "SHA512", "BLAKE2B", "XXH3"] = "MD5",
         encoding: str = "UTF-8",
         *args,
         **kwargs,
@@ -95,17 +254,51 @@ class Database(Connector, metaclass=DatabaseMeta):
 
             return self._run_hash(resources, start=start, end=end, method=method, encoding=encoding, *args, **kwargs)
 
-    def exists(
+    def count(
         self,
         resources: Resources,
         start: Optional[Timestamp] = None,
         end: Optional[Timestamp] = None,
-    ) -> bool:
-        # TODO: Replace this placeholder more resource efficient
+    ) -> int:
+        if start is None and end is None:
+            # Reading without a range only returns the latest values for most databases
+            start = self._run_read_first_index(resources)
+            end = self._run_read_last_index(resources)
+            if start is None or end is None:
+                return 0
         data = self._run_read(resources, start, end)
         data = self._validate(resources, data)
         data = self._get_range(data, start, end)
-        return not data.empty
+        if data is None or data.empty:
+            return 0
+
+        columns = [r.id for r in resources if r.id in data.columns]
+        return int(data.loc[:, columns].notna().any(axis="columns").sum())
+
+    @wraps(count, updated=())
+    def _do_count(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        *args,
+        **kwargs,
+    ) -> int:
+        with self._lock:
+            if not self._is_connected():
+                raise ConnectionError(self, f"Database '{self.id}' not connected")
+
+            if self._index is not None and self.__has_bounds(resources) and self.__get_bounds(resources) is None:
+                return 0
+            return self._run_count(resources, start=start, end=end, *args, **kwargs)
+
+    def exists(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> bool:
+        return self._run_count(resources, start, end) > 0
 
     @wraps(exists, updated=())
     def _do_exists(
@@ -120,8 +313,80 @@ class Database(Connector, metaclass=DatabaseMeta):
             if not self._is_connected():
                 raise ConnectionError(self, f"Database '{self.id}' not connected")
 
+            # Only cached bounds are used, to not query the first and last index of every resource on a cold cache
+            if self._index is not None and self.__has_bounds(resources):
+                exists = self.__exists_in_bounds(resources, start, end)
+                if exists is not None:
+                    return exists
             return self._run_exists(resources, start=start, end=end, *args, **kwargs)
 
+    def __exists_in_bounds(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> Optional[bool]:
+        bounds = self.__get_bounds(resources)
+        if bounds is None:
+            return False
+        if any(not isinstance(i, (pd.Timestamp, dt.datetime)) for bound in bounds.values() for i in bound):
+            return None
+
+        start = to_date(start, timezone=self.timezone)
+        end = to_date(end, timezone=self.timezone)
+        overlapping = False
+        for first, last in bounds.values():
+            if (start is not None and last < start) or (end is not None and first > end):
+                continue
+            if (start is None or first >= start) or (end is None or last <= end):
+                # At least one persisted boundary lies within the range
+                return True
+            overlapping = True
+        if not overlapping:
+            return False
+
+        # Ranges within the bounds of a resource may still be gaps and need to be queried
+        return None
+
+    def __has_bounds(self, resources: Resources) -> bool:
+        return self._index.has_first(resources) and self._index.has_last(resources)
+
+    # noinspection PyProtectedMember
+    def __get_bounds(self, resources: Resources) -> Optional[Dict[str, tuple]]:
+        bounds = {}
+        for resource in resources:
+            resource_group = resources.filter(lambda r: r.id == resource.id)
+            first = self.__get_first_index(resource_group)
+            last = self.__get_last_index(resource_group)
+            if first is None or last is None:
+                continue
+            bounds[resource.id] = (first, last)
+        if len(bounds) == 0:
+            return None
+        return bounds
+
+    def __get_first_index(self, resources: Resources) -> Optional[Any]:
+        for resource in resources:
+            resource_group = resources.filter(lambda r: r.id == resource.id)
+            if self._index.has_first(resource_group):
+                continue
+            index = self._run_read_first_index(resource_group)
+            if isinstance(index, (pd.Timestamp, dt.datetime)):
+                index = convert_timezone(index, timezone=self.timezone)
+            self._index.set_first(resource.id, index)
+        return self._index.get_first(resources)
+
+    def __get_last_index(self, resources: Resources) -> Optional[Any]:
+        for resource in resources:
+            resource_group = resources.filter(lambda r: r.id == resource.id)
+            if self._index.has_last(resource_group):
+                continue
+            index = self._run_read_last_index(resource_group)
+            if isinstance(index, (pd.Timestamp, dt.datetime)):
+                index = convert_timezone(index, timezone=self.timezone)
+            self._index.set_last(resource.id, index)
+        return self._index.get_last(resources)
+
     @overload
     def read(self, resources: Resources) -> pd.DataFrame: ...
 
@@ -154,10 +419,189 @@ class Database(Connector, metaclass=DatabaseMeta):
             if not self._is_connected():
                 raise ConnectorError(self, f"Trying to read from unconnected {type(self).__name__}: {self.id}")
 
-            data = self._run_read(resources, *args, **kwargs)
+            if self._cache is not None and start is not None and end is not None:
+
+                def _read(read_resources: Resources, read_start: pd.Timestamp, read_end: pd.Timestamp) -> pd.DataFrame:
+                    read_data = self._run_read(read_resources, start=read_start, end=read_end, *args, **kwargs)
+                    return self._get_range(self._validate(read_resources, read_data), read_start, read_end)
+
+                return self._cache.read(resources, start, end, read=_read)
+
+            data = self._run_read(resources, start=start, end=end, *args, **kwargs)
             data = self._validate(resources, data)
             return self._get_range(data, start, end)
 
+    def read_iter(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        chunk: Optional[int | str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read the values of the passed resources in consecutive chunks, to iterate large ranges with bounded memory.
+
+        By default, the range is read in time slices of the ``chunk`` frequency, e.g. "D" for daily frames.
+        An integer ``chunk`` is interpreted as the number of rows per yielded frame instead, which databases able to
+        stream their results may implement natively.
+
+        :param resources: The resources to read.
+        :param start: The first index of the range to read. Defaults to the first persisted index.
+        :param end: The last index of the range to read. Defaults to the last persisted index.
+        :param chunk: The frequency of time slices or number of rows to yield at once.
+
+        :returns: An iterator of data frames, in time order.
+        """
+        if start is None:
+            start = self._run_read_first_index(resources)
+        if end is None:
+            end = self._run_read_last_index(resources)
+        if start is None or end is None:
+            return
+        if isinstance(chunk, int) and chunk < 1:
+            raise ValueError(f"Invalid number of rows per chunk: {chunk}")
+
+        def _read_slices(freq: str) -> Iterator[pd.DataFrame]:
+            slice_start = start
+            for _, slice_end in slice_range(start, end, timezone=self.timezone, freq=freq):
+                if slice_end < end:
+                    # Slices are half-open, to neither skip nor duplicate values with sub-second timestamps
+                    yield self._run_read(resources, slice_start, slice_end - pd.Timedelta(1, unit="ns"))
+                else:
+                    yield self._run_read(resources, slice_start, slice_end)
+                slice_start = slice_end
+
+        if isinstance(chunk, str):
+            yield from _read_slices(chunk)
+            return
+        if chunk is None:
+            yield from _read_slices("D")
+            return
+
+        # Read daily slices and split or combine them into frames of the number of rows per chunk
+        buffer = []
+        buffer_size = 0
+        for data in _read_slices("D"):
+            data = self._validate(resources, data)
+            if data is None or data.empty:
+                continue
+            buffer.append(data)
+            buffer_size += len(data)
+            if buffer_size < chunk:
+                continue
+
+            data = pd.concat(buffer, axis="index")
+            while len(data) >= chunk:
+                yield data.iloc[:chunk]
+                data = data.iloc[chunk:]
+            buffer = [data] if not data.empty else []
+            buffer_size = len(data)
+        if len(buffer) > 0:
+            yield pd.concat(buffer, axis="index")
+
+    # noinspection PyTypeChecker
+    @wraps(read_iter, updated=())
+    def _do_read_iter(
+        self,
+        resources: Resources,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        chunk: Optional[int | str] = None,
+        *args,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        if not self._is_connected():
+            raise ConnectorError(self, f"Trying to read from unconnected {type(self).__name__}: {self.id}")
+
+        start = to_date(start, timezone=self.timezone)
+        end = to_date(end, timezone=self.timezone)
+
+        # Only hold the lock while reading each chunk, to not block other access while iterating
+        iterator = self._run_read_iter(resources, start=start, end=end, chunk=chunk, *args, **kwargs)
+        while True:
+            with self._lock:
+                if not self._is_connected():
+                    raise ConnectorError(self, f"Database '{self.id}' disconnected while reading")
+                try:
+                    data = next(iterator)
+                except StopIteration:
+                    return
+
+            data = self._validate(resources, data)
+            data = self._get_range(data, start, end)
+            if not data.empty:
+                yield data
+
+    def read_many(
+        self,
+        requests: Sequence[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]],
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read the values of several ranges, e.g. adjacent time slices, yielding one data frame per request in order.
+
+        While the caller processes the values of a request, the values of the next request are already prefetched.
+        Databases with a high query latency may merge adjacent ranges into fewer queries, by returning
+        :meth:`_read_merged` instead.
+
+        :param requests: The sequence of resources, start and end of each range to read.
+
+        :returns: An iterator of data frames, one for each request.
+        """
+        for resources, start, end in requests:
+            yield self._run_read(resources, start, end)
+
+    # noinspection PyTypeChecker
+    @wraps(read_many, updated=())
+    def _do_read_many(
+        self,
+        requests: Sequence[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]],
+        *args,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        if not self._is_connected():
+            raise ConnectorError(self, f"Trying to read from unconnected {type(self).__name__}: {self.id}")
+
+        requests = [
+            (resources, to_date(start, timezone=self.timezone), to_date(end, timezone=self.timezone))
+            for resources, start, end in requests
+        ]
+        if len(requests) == 0:
+            return
+
+        iterator = self._run_read_many(requests, *args, **kwargs)
+
+        def _read_next() -> pd.DataFrame:
+            with self._lock:
+                if not self._is_connected():
+                    raise ConnectorError(self, f"Database '{self.id}' disconnected while reading")
+                return next(iterator)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.id}.prefetch") as executor:
+            future = executor.submit(_read_next)
+            for index, (resources, start, end) in enumerate(requests):
+                data = future.result()
+                if index < len(requests) - 1:
+                    future = executor.submit(_read_next)
+
+                data = self._validate(resources, data)
+                yield self._get_range(data, start, end) if data is not None else None
+
+    def _read_merged(
+        self,
+        requests: Sequence[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]],
+        limit: int = 16,
+    ) -> Iterator[pd.DataFrame]:
+        for merged_requests in _merge_requests(requests, limit):
+            resources = merged_requests[0][0]
+            merged_start = min(start for _, start, _ in merged_requests)
+            merged_end = max(end for _, _, end in merged_requests)
+
+            # Validate the index before selecting the ranges, as backends may return naive or non datetime indices
+            data = self._run_read(resources, merged_start, merged_end)
+            data = self._validate(resources, data)
+            for _, start, end in merged_requests:
+                yield self._get_range(data, start, end) if data is not None else None
+
     @abstractmethod
     def read_first(self, resources: Resources) -> Optional[pd.DataFrame]: ...
 
@@ -184,7 +628,10 @@ class Database(Connector, metaclass=DatabaseMeta):
             if not self._is_connected():
                 raise ConnectionError(self, f"Database '{self.id}' not connected")
 
-            index = self._run_read_first_index(resources, *args, **kwargs)
+            if self._index is not None:
+                index = self.__get_first_index(resources)
+            else:
+                index = self._run_read_first_index(resources, *args, **kwargs)
             if isinstance(index, (pd.Timestamp, dt.datetime)):
                 index = convert_timezone(index, timezone=self.timezone)
             return index
@@ -215,12 +662,155 @@ class Database(Connector, metaclass=DatabaseMeta):
             if not self._is_connected():
                 raise ConnectionError(self, f"Database '{self.id}' not connected")
 
-            index = self._run_read_last_index(resources, *args, **kwargs)
+            if self._index is not None:
+                index = self.__get_last_index(resources)
+            else:
+                index = self._run_read_last_index(resources, *args, **kwargs)
             if isinstance(index, (pd.Timestamp, dt.datetime)):
                 index = convert_timezone(index, timezone=self.timezone)
             return index
 
-    def _validate(self, resources: Resources, data: pd.DataFrame) -> pd.DataFrame:
+    def resample(
+        self,
+        resources: Resources,
+        freq: str,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        method: Optional[Literal["sum", "mean", "min", "max", "last"]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read the values of resources in a range, resampled to the passed frequency.
+
+        Resolutions covered by the configured rollups are served from their aggregates. Otherwise, databases able to
+        aggregate values themselves only transfer the aggregates of each bucket, instead of all raw values.
+
+        :param resources: The resources to read.
+        :param freq: The frequency to resample the values to, e.g. "h" or "D".
+        :param start: The first index of the range to read. Defaults to the first persisted index.
+        :param end: The last index of the range to read. Defaults to the last persisted index.
+        :param method: The aggregation of all resources. Defaults to the ``aggregate`` configured for each resource,
+            or the mean.
+
+        :returns: The resampled values, labeled by the right edge of their bucket.
+        """
+        if start is None:
+            start = self.read_first_index(resources)
+        if end is None:
+            end = self.read_last_index(resources)
+        if start is None or end is None:
+            return pd.DataFrame()
+
+        def _get_method(resource) -> str:
+            return (method if method is not None else resource.get("aggregate", default="mean")).lower()
+
+        aggregates = None
+        if self._rollups is not None:
+            aggregates = self._rollups.read(resources, freq, start, end, read=self.read)
+        if aggregates is None:
+            aggregates = self.__read_aggregates(resources, freq, start, end, {_get_method(r) for r in resources})
+        if aggregates is None:
+            data = self.read(resources, start, end)
+            if data is None or data.empty:
+                return pd.DataFrame()
+            resampled = []
+            for resource_method, method_resources in resources.groupby(_get_method):
+                columns = [r.id for r in method_resources if r.id in data.columns]
+                if len(columns) > 0:
+                    resampled.append(resample(data[columns], freq, resource_method))
+            data = pd.concat(resampled, axis="columns") if len(resampled) > 0 else pd.DataFrame()
+        else:
+            data = pd.DataFrame(
+                {r.id: to_resampled(aggregates[r.id], _get_method(r)) for r in resources if r.id in aggregates}
+            )
+            data = data.dropna(axis="columns", how="all").dropna(axis="index", how="all")
+        return data
+
+    def __read_aggregates(
+        self,
+        resources: Resources,
+        freq: str,
+        start: Timestamp,
+        end: Timestamp,
+        methods: Collection[str],
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        start = to_date(start, timezone=self.timezone)
+        end = to_date(end, timezone=self.timezone)
+        bucket_freq = _get_bucket_freq(freq, start, end)
+        if bucket_freq is None:
+            return None
+
+        with self._lock:
+            if not self._is_connected():
+                raise ConnectorError(self, f"Trying to read from unconnected {type(self).__name__}: {self.id}")
+            aggregates = self._read_aggregates(resources, bucket_freq, start, end, methods)
+        if aggregates is None:
+            return None
+
+        for id, resource_aggregates in aggregates.items():
+            resource_aggregates.index = resource_aggregates.index.tz_convert(self.timezone)
+            if bucket_freq != parse_freq(freq):
+                resource_aggregates = combine_aggregates(resource_aggregates, parse_freq(freq))
+            aggregates[id] = resource_aggregates
+        return aggregates
+
+    # noinspection PyMethodMayBeStatic, PyUnusedLocal
+    def _read_aggregates(
+        self,
+        resources: Resources,
+        freq: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        methods: Collection[str],
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Read the aggregates of resources in buckets of the passed frequency, aggregated by the database itself.
+
+        Buckets are aligned in UTC and labeled by their right edge, which they include. Each resource is aggregated to
+        a data frame with the minimum, maximum, sum, count and last value of each bucket. Databases unable to aggregate
+        all of the passed methods return None, to resample the raw values instead.
+        """
+        return None
+
+    # noinspection PyUnresolvedReferences, PyTypeChecker
+    def _do_write(self, data: pd.DataFrame, *args, **kwargs) -> None:
+        data = apply_dtypes(data, self.resources, self.dtypes)
+        indices = self.__get_rollup_indices(data)
+        super()._do_write(data, *args, **kwargs)
+        if self._index is not None:
+            with self._lock:
+                self._index.update(data)
+        if self._cache is not None and not data.empty:
+            self._cache.invalidate(data.index.min(), data.index.max())
+        if self._checksums is not None and not data.empty:
+            resources = self.resources.filter(lambda r: r.id in data.columns)
+            self._checksums.invalidate(resources, data.index.min(), data.index.max())
+        if self._journal is not None:
+            self._journal.append(data)
+        if self._rollups is not None:
+            self._rollups.update(data, indices)
+
+    def __get_rollup_indices(self, data: pd.DataFrame) -> Dict[str, Optional[pd.Timestamp]]:
+        # Last indices are looked up once and kept updated by the index cache, to tell if written values are appended
+        indices = {}
+        if self._rollups is None or self._index is None:
+            return indices
+        with self._lock:
+            if not self._is_connected():
+                return indices
+            for resource in self.resources.filter(lambda r: r.id in data.columns):
+                resource_group = self.resources.filter(lambda r: r.id == resource.id)
+                index = self.__get_last_index(resource_group)
+                if index is not None and not isinstance(index, (pd.Timestamp, dt.datetime)):
+                    continue
+                indices[resource.id] = to_date(index, timezone=self.timezone)
+        return indices
+
+    def _validate(self, resources: Resources, data: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        if data is None:
+            return None
+        if is_arrow(data):
+            # Timestamps of Arrow data are converted natively, before converting to pandas once
+            data = validate_arrow(data, self.timezone)
         if not data.empty:
             data = validate_index(data)
             data.index = validate_timezone(data.index, self.timezone)
@@ -232,6 +822,7 @@ class Database(Connector, metaclass=DatabaseMeta):
                     if pd.api.types.is_string_dtype(resource_data.values):
                         resource_data = pd.to_datetime(resource_data)
                     data[resource.id] = validate_timezone(resource_data, self.timezone)
+            data = apply_dtypes(data, resources, self.dtypes)
         return data
 
     @staticmethod
@@ -284,3 +875,55 @@ class Database(Connector, metaclass=DatabaseMeta):
                 raise ConnectionError(self, f"Database '{self.id}' not connected")
 
             self._run_delete(resources, start=start, end=end, *args, **kwargs)
+            if self._index is not None:
+                self._index.invalidate(resources)
+            if self._cache is not None:
+                self._cache.invalidate(start, end)
+            if self._checksums is not None:
+                self._checksums.invalidate(resources, start, end)
+            if self._rollups is not None:
+                self._rollups.invalidate(resources, start, end)
+
+
+def _get_bucket_freq(freq: str, start: pd.Timestamp, end: pd.Timestamp) -> Optional[str]:
+    try:
+        freq = parse_freq(freq)
+        delta = to_timedelta(freq)
+    except ValueError:
+        return None
+    if not isinstance(delta, pd.Timedelta) or (freq != "D" and pd.Timedelta(days=1) % delta != pd.Timedelta(0)):
+        return None
+
+    # Buckets aggregated by databases are aligned in UTC, and coarser ones get combined from hourly buckets, to be
+    # aligned with the local timezone
+    bucket_freq = freq if pd.Timedelta(hours=1) % delta == pd.Timedelta(0) else "h"
+    bucket_delta = to_timedelta(bucket_freq) if freq == "D" else delta
+    if any(d.utcoffset() % bucket_delta != pd.Timedelta(0) for d in [start, end]):
+        return None
+    return bucket_freq
+
+
+def _merge_requests(
+    requests: Sequence[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]],
+    limit: int,
+) -> List[List[Tuple[Resources, Optional[Timestamp], Optional[Timestamp]]]]:
+    # Merge consecutive requests of the same resources, with ranges at most a second apart, in either direction
+    merged = []
+    for request in requests:
+        resources, start, end = request
+        if len(merged) > 0:
+            previous_requests = merged[-1]
+            previous_resources, previous_start, previous_end = previous_requests[-1]
+            if (
+                len(previous_requests) < limit
+                and all(t is not None for t in [start, end, previous_start, previous_end])
+                and previous_resources.ids == resources.ids
+                and (
+                    pd.Timedelta(0) <= start - previous_end <= pd.Timedelta(seconds=1)
+                    or pd.Timedelta(0) <= previous_start - end <= pd.Timedelta(seconds=1)
+                )
+            ):
+                previous_requests.append(request)
+                continue
+        merged.append([request])
+    return merged
@@ -9,13 +9,17 @@ lories.data.databases
 from __future__ import annotations
 
 import logging
-from typing import Any, Collection, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Callable, Collection, List, Optional, Tuple
 
 import tzlocal
 
 import pandas as pd
 from lories.connectors import ConnectorContext, ConnectType, Database
 from lories.core import Configurations, Configurator, ResourceError
+from lories.core.configs import ConfigurationError
 from lories.data.channels import Channel, Channels
 from lories.data.context import DataContext
 from lories.data.replication import Replications
@@ -93,92 +97,157 @@ class Databases(ConnectorContext, Configurator):
             channel.replication = replications.build(self, channel, **kwargs)
             return channel
 
-        channels = channels.apply(build_replication).filter(lambda c: c.replication is not None)
+        def has_replication(channel: Channel) -> bool:
+            if channel.replication is None:
+                return False
+            if channel.replication.database is None:
+                self._logger.warning(f"Skip replicating resource '{channel.id}' to unknown database")
+                return False
+            return True
 
+        channels = channels.apply(build_replication).filter(has_replication)
+
+        tasks = []
+        connections = []
         for database in self.values():
             database_channels = channels.filter(lambda c: c.replication.database.id == database.id)
             if len(database_channels) == 0:
                 continue
+            tasks.append((database, partial(self.__replicate, database_channels, to_bool(full), to_bool(force))))
+            connections.append((database, database_channels))
+
+        # Loggers may be replicated to several databases, but are connected only once for all of them as well
+        for logger, logger_channels in channels.groupby(lambda c: c.logger._connector):
+            connections.append((logger, logger_channels))
 
-            self._connect(database, channels=database_channels)
-            try:
-                for logger, logger_channels in database_channels.groupby(lambda c: c.logger._connector):
-                    self._connect(logger, channels=logger_channels)
-                    try:
-                        for replication, replication_channels in logger_channels.groupby(lambda c: c.replication):
-                            replication.replicate(replication_channels, full=to_bool(full), force=to_bool(force))
-
-                    except ResourceError as e:
-                        self._logger.warning(f"Error replicating database '{database.id}': {str(e)}")
-                        if self._logger.getEffectiveLevel() <= logging.DEBUG:
-                            self._logger.exception(e)
-                    finally:
-                        self._disconnect(logger)
-            finally:
-                self._disconnect(database)
+        self.__run("replicating", tasks, connections)
+
+    @staticmethod
+    def __replicate(channels: Channels, full: bool, force: bool) -> None:
+        for replication, replication_channels in channels.groupby(lambda c: c.replication):
+            replication.replicate(replication_channels, full=full, force=force)
 
     # noinspection PyProtectedMember
     def rotate(self, channels: Channels, full: bool = False) -> None:
         retentions = Retentions()
 
-        def build_rotation(channel: Channel) -> Channel:
-            channel = channel.from_logger()
+        # noinspection PyShadowingBuiltins
+        def build_rotation(channel: Channel, id: str) -> Channel:
+            channel = channel.from_logger(id)
             channel.rotate = parse_freq(channel.get("rotate", default=None))
             channel.retentions = Retention.build(self.configs, channel)
             retentions.extend(channel.retentions, unique=True)
             return channel
 
-        channels = channels.apply(build_rotation).filter(lambda c: c.rotate is not None or len(c.retentions) > 0)
+        tasks = []
+        connections = []
         for database in self.values():
-            database_channels = channels.filter(lambda c: c.has_logger(database.id))
+            # Channels may be logged to several databases, with logger specific rotation configurations
+            database_channels = (
+                channels.filter(lambda c: c.has_logger(database.id))
+                .apply(lambda c: build_rotation(c, database.id))
+                .filter(lambda c: c.rotate is not None or len(c.retentions) > 0)
+            )
             if len(database_channels) == 0:
                 continue
+            tasks.append((database, partial(self.__rotate, database, database_channels, retentions, to_bool(full))))
+            connections.append((database, database_channels))
 
-            self._connect(database, channels=database_channels)
-            try:
-                for rotation, rotation_channels in database_channels.groupby(lambda c: c.rotate):
-                    if rotation is None:
-                        continue
-                    freq = self.configs.get("freq", default="D")
-                    timezone = to_timezone(self.configs.get("timezone", default=tzlocal.get_localzone_name()))
-                    rotate = floor_date(pd.Timestamp.now(tz=timezone) - to_timedelta(rotation), freq=freq)
-
-                    for _, deletion_channels in rotation_channels.groupby(lambda c: c.group):
-                        start = database.read_first_index(deletion_channels)
-                        if start is None or start > rotate:
-                            self._logger.debug(
-                                f"Skip rotating values of resource{'s' if len(deletion_channels) > 1 else ''} "
-                                + ", ".join([f"'{r.id}'" for r in deletion_channels])
-                                + " without any values found"
-                            )
-                            continue
-
-                        self._logger.info(
-                            f"Deleting values of resource{'s' if len(deletion_channels) > 1 else ''} "
-                            + ", ".join([f"'{r.id}'" for r in deletion_channels])
-                            + f" up to {rotate.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                        )
-                        database.delete(deletion_channels, end=rotate)
-
-                retentions.sort()
-                for retention in retentions:
-                    if not retention.enabled:
-                        self._logger.debug(f"Skipping disabled retention '{retention.keep}'")
+        self.__run("rotating", tasks, connections)
+
+    # noinspection PyProtectedMember
+    def __rotate(self, database: Database, channels: Channels, retentions: Retentions, full: bool) -> None:
+        for rotation, rotation_channels in channels.groupby(lambda c: c.rotate):
+            if rotation is None:
+                continue
+            freq = self.configs.get("freq", default="D")
+            timezone = to_timezone(self.configs.get("timezone", default=tzlocal.get_localzone_name()))
+            rotate = floor_date(pd.Timestamp.now(tz=timezone) - to_timedelta(rotation), freq=freq)
+
+            for _, deletion_channels in rotation_channels.groupby(lambda c: c.group):
+                start = database.read_first_index(deletion_channels)
+                if start is None or start > rotate:
+                    self._logger.debug(
+                        f"Skip rotating values of resource{'s' if len(deletion_channels) > 1 else ''} "
+                        + ", ".join([f"'{r.id}'" for r in deletion_channels])
+                        + " without any values found"
+                    )
+                    continue
+
+                self._logger.info(
+                    f"Deleting values of resource{'s' if len(deletion_channels) > 1 else ''} "
+                    + ", ".join([f"'{r.id}'" for r in deletion_channels])
+                    + f" up to {rotate.strftime('%d.%m.%Y (%H:%M:%S)')}"
+                )
+                database.delete(deletion_channels, end=rotate)
+
+        # noinspection PyProtectedMember
+        def has_retention(channel: Channel) -> bool:
+            return (
+                channel.logger.enabled
+                and isinstance(channel.logger._connector, Database)
+                and any(r.enabled for r in channel.retentions)
+            )
+
+        # Aggregate all retentions of the database in a single pass
+        retentions.aggregate(channels.filter(has_retention), full=full)
+
+    def __run(
+        self,
+        action: str,
+        tasks: List[Tuple[Database, Callable[[], None]]],
+        connections: List[Tuple[Database, Channels]],
+    ) -> None:
+        """
+        Run the tasks of all databases concurrently in a bounded pool of workers.
+
+        Every database and logger is connected once upfront and disconnected after all tasks finished, while errors
+        are logged and isolated to the database they occurred for.
+        """
+        if len(tasks) == 0:
+            return
+
+        workers = self.configs.get_int("workers", default=max(int((os.cpu_count() or 1) / 2), 1))
+        if workers < 1:
+            raise ConfigurationError(f"Invalid number of database workers: {workers}")
+
+        connected = []
+        try:
+            for connector, connector_channels in connections:
+                if any(c is connector for c in connected):
+                    continue
+                self._connect(connector, channels=connector_channels)
+                connected.append(connector)
+
+            def _run(database: Database, task: Callable[[], None]) -> bool:
+                self._logger.debug(f"Start {action} database '{database.id}'")
+                try:
+                    task()
+                    return True
+
+                except Exception as e:
+                    self._logger.warning(f"Error {action} database '{database.id}': {str(e)}")
+                    if self._logger.getEffectiveLevel() <= logging.DEBUG:
+                        self._logger.exception(e)
+                    return False
+
+            failed = []
+            with ThreadPoolExecutor(
+                max_workers=min(workers, len(tasks)),
+                thread_name_prefix=f"lories-{type(self).__name__.lower()}",
+            ) as executor:
+                futures = {executor.submit(_run, database, task): database for database, task in tasks}
+                for finished, future in enumerate(as_completed(futures), 1):
+                    database = futures[future]
+                    if not future.result():
+                        failed.append(database.id)
                         continue
-                    try:
-                        # noinspection PyProtectedMember
-                        def has_retention(channel: Channel) -> bool:
-                            return (
-                                channel.logger.enabled
-                                and isinstance(channel.logger._connector, Database)
-                                and retention in channel.retentions
-                            )
-
-                        retention.aggregate(database_channels.filter(has_retention), full=to_bool(full))
-
-                    except ResourceError as e:
-                        self._logger.warning(
-                            f"Error aggregating '{retention.method}' retaining {retention.keep}: {str(e)}"
-                        )
-            finally:
-                self._disconnect(database)
+                    self._logger.info(f"Finished {action} database '{database.id}' ({finished}/{len(tasks)})")
+
+            if len(failed) > 0:
+                self._logger.warning(
+                    f"Failed {action} {len(failed)} of {len(tasks)} databases: " + ", ".join(f"'{d}'" for d in failed)
+                )
+        finally:
+            for connector in reversed(connected):
+                self._disconnect(connector)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+lories.data.dtypes
+~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from typing import Any, Dict, Mapping, Optional, Type
+
+import pandas as pd
+from lories._core._resource import _Resource  # noqa
+from lories._core._resources import _Resources  # noqa
+from lories.core.configs import ConfigurationError
+
+# FIXME: Remove this once Python >= 3.9 is a requirement
+try:
+    from typing import Literal
+
+except ImportError:
+    from typing_extensions import Literal
+
+
+class DtypePolicy:
+    """
+    Policy of the pandas dtypes of resource values and the index, data frames get stored and read with.
+
+    Values are cast to the dtype configured for the resource type, e.g. ``float32`` for float values,
+    ``category`` for string states or nullable ``Int32`` and ``boolean`` types for flags. Resources may
+    override the dtype of the policy with an individual ``dtype`` configuration. Databases may store
+    their index as int64 ``epoch`` nanoseconds, instead of a ``datetime`` index.
+
+    """
+
+    TYPES: Dict[str, Type] = {
+        "float": float,
+        "int": int,
+        "bool": bool,
+        "str": str,
+    }
+
+    __slots__ = ("dtypes", "index")
+
+    dtypes: Dict[Type, str]
+    index: Literal["datetime", "epoch"]
+
+    def __init__(
+        self,
+        dtypes: Optional[Mapping[Type, str]] = None,
+        index: Literal["datetime", "epoch"] = "datetime",
+    ) -> None:
+        self.dtypes = {t: parse_dtype(d) for t, d in dtypes.items()} if dtypes is not None else {}
+        index = index.lower()
+        if index not in ["datetime", "epoch"]:
+            raise ConfigurationError(f"Invalid index dtype '{index}'")
+        self.index = index
+
+    def __repr__(self) -> str:
+        dtypes = ", ".join(f"{t.__name__}={d}" for t, d in self.dtypes.items())
+        return f"{type(self).__name__}({dtypes}, index={self.index})"
+
+    @classmethod
+    def from_configs(cls, configs: Mapping[str, Any]) -> Optional[DtypePolicy]:
+        if configs is None or len(configs) == 0:
+            return None
+        dtypes = {t: configs[k] for k, t in cls.TYPES.items() if k in configs}
+        index = configs.get("index", "datetime")
+        return cls(dtypes, index=index)
+
+    def is_epoch(self) -> bool:
+        return self.index == "epoch"
+
+    # noinspection PyShadowingBuiltins
+    def get(self, type: Type) -> Optional[str]:
+        return self.dtypes.get(type, None)
+
+
+def parse_dtype(dtype: Optional[str]) -> Optional[str]:
+    if dtype is None:
+        return None
+    try:
+        return str(pd.api.types.pandas_dtype(dtype))
+    except TypeError:
+        raise ConfigurationError(f"Invalid dtype '{dtype}'")
+
+
+# noinspection PyShadowingBuiltins
+def get_dtype(resource: _Resource, policy: Optional[DtypePolicy] = None) -> Optional[str]:
+    dtype = resource.get("dtype", default=None)
+    if dtype is not None:
+        return parse_dtype(dtype)
+    if policy is not None:
+        return policy.get(resource.type)
+    return None
+
+
+def apply_dtypes(
+    data: pd.DataFrame,
+    resources: _Resources,
+    policy: Optional[DtypePolicy] = None,
+) -> pd.DataFrame:
+    """
+    Cast the columns of a data frame to the dtypes of their resources, according to the passed policy.
+
+    Columns that can not be cast, e.g. holding states instead of values, will be left untouched.
+    """
+    if data is None or data.empty:
+        return data
+
+    dtypes = {}
+    for resource in resources:
+        if resource.id not in data.columns or resource.type in [pd.Timestamp, dt.datetime]:
+            continue
+        dtypes[resource.id] = get_dtype(resource, policy)
+    return cast_dtypes(data, dtypes)
+
+
+def cast_dtypes(data: pd.DataFrame, dtypes: Mapping[str, Optional[str]]) -> pd.DataFrame:
+    dtypes = {c: d for c, d in dtypes.items() if d is not None and c in data.columns and str(data[c].dtype) != d}
+    if len(dtypes) == 0:
+        return data
+
+    data = data.copy()
+    for column, dtype in dtypes.items():
+        try:
+            data[column] = data[column].astype(dtype)
+        except (TypeError, ValueError):
+            pass
+    return data
+
+
+def to_epoch(index: pd.DatetimeIndex) -> pd.Index:
+    if index.tzinfo is None:
+        index = index.tz_localize("UTC")
+    return pd.Index(index.tz_convert("UTC").asi8, name=index.name, dtype="int64")
+
+
+def from_epoch(index: pd.Index) -> pd.DatetimeIndex:
+    if isinstance(index, pd.DatetimeIndex):
+        return index
+    return pd.DatetimeIndex(pd.to_datetime(index.astype("int64"), unit="ns", utc=True), name=index.name)
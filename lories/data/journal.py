@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+lories.data.journal
+~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections import deque
+from threading import Lock
+from typing import Deque, List, Optional, Tuple
+
+import pandas as pd
+from lories.core import Configurations, Resources
+
+
+class JournalEntry:
+    __slots__ = ("marker", "start", "end", "ids")
+
+    marker: int
+    start: pd.Timestamp
+    end: pd.Timestamp
+    ids: List[str]
+
+    def __init__(self, marker: int, start: pd.Timestamp, end: pd.Timestamp, ids: List[str]) -> None:
+        self.marker = marker
+        self.start = start
+        self.end = end
+        self.ids = ids
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(marker={self.marker}, start={self.start}, end={self.end})"
+
+    @classmethod
+    def from_json(cls, line: str) -> JournalEntry:
+        entry = json.loads(line)
+        return cls(entry["marker"], pd.Timestamp(entry["start"]), pd.Timestamp(entry["end"]), entry["ids"])
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "marker": self.marker,
+                "start": self.start.isoformat(),
+                "end": self.end.isoformat(),
+                "ids": self.ids,
+            }
+        )
+
+
+class WriteJournal:
+    """
+    Journal of the ranges written to a database, each marked with a monotonically increasing write marker.
+
+    Entries are appended to a JSON lines file on every write and only the latest entries up to the configured limit
+    are retained. Consumers like the delta replication remember the last marker they processed, to only read the
+    ranges written since. Deletes are not journaled, as the journal only serves append-only consumers.
+
+    """
+
+    __slots__ = ("_lock", "_logger", "_entries", "_marker", "_appended", "path", "limit")
+
+    _lock: Lock
+    _entries: Deque[JournalEntry]
+    _marker: int
+    _appended: int
+
+    path: Optional[str]
+    limit: int
+
+    def __init__(self, path: Optional[str] = None, limit: int = 10000) -> None:
+        self._lock = Lock()
+        self._logger = logging.getLogger(type(self).__module__)
+        self._entries = deque(maxlen=limit)
+        self._marker = 0
+        self._appended = 0
+
+        self.path = path
+        self.limit = limit
+        if path is not None:
+            self._load()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(marker={self._marker}, entries={len(self._entries)})"
+
+    @classmethod
+    def from_configs(cls, configs: Configurations, key: str) -> Optional[WriteJournal]:
+        if not configs.has_member("journal"):
+            return None
+        journal_configs = configs.get_member("journal")
+        if not journal_configs.enabled:
+            return None
+
+        path = journal_configs.get("path", default=os.path.join(configs.dirs.data, ".journal"))
+        if "~" in path:
+            path = os.path.expanduser(path)
+        if not os.path.isabs(path):
+            path = os.path.join(configs.dirs.data, path)
+        return cls(os.path.join(path, f"{key}.jsonl"), limit=journal_configs.get_int("limit", default=10000))
+
+    @property
+    def marker(self) -> int:
+        return self._marker
+
+    def append(self, data: pd.DataFrame) -> None:
+        data = data.dropna(axis="columns", how="all")
+        if data.empty:
+            return
+        with self._lock:
+            self._marker += 1
+            entry = JournalEntry(self._marker, data.index.min(), data.index.max(), list(data.columns))
+            self._entries.append(entry)
+            if self.path is not None:
+                self.__write(entry)
+                self._appended += 1
+                if self._appended >= self.limit:
+                    self.__rewrite()
+
+    def changes(self, resources: Resources, marker: int) -> Optional[List[Tuple[pd.Timestamp, pd.Timestamp]]]:
+        """
+        Get the merged ranges of the resources, written after the passed marker.
+
+        Returns None, if entries after the marker were already discarded and the changes are unknown.
+        """
+        ids = set(resources.ids)
+        with self._lock:
+            if marker > self._marker:
+                # The journal was reset since the marker was processed
+                return None
+            if marker < self._marker and (len(self._entries) == 0 or self._entries[0].marker > marker + 1):
+                return None
+            ranges = sorted((e.start, e.end) for e in self._entries if e.marker > marker and not ids.isdisjoint(e.ids))
+
+        merged = []
+        for start, end in ranges:
+            if len(merged) > 0 and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _load(self) -> None:
+        if not os.path.isfile(self.path):
+            self.__rewrite()
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if len(line.strip()) > 0:
+                        self._entries.append(JournalEntry.from_json(line))
+        except (IOError, ValueError, KeyError) as e:
+            self._logger.warning(f"Unable to load write journal from '{self.path}': {e}")
+
+        if len(self._entries) > 0:
+            self._marker = self._entries[-1].marker
+
+        # Compact the journal file to the retained entries
+        self.__rewrite()
+
+    def __write(self, entry: JournalEntry) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(entry.to_json() + "\n")
+        except IOError as e:
+            self._logger.warning(f"Unable to append to write journal '{self.path}': {e}")
+
+    def __rewrite(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            path = f"{self.path}.tmp"
+            with open(path, "w", encoding="utf-8") as file:
+                for entry in self._entries:
+                    file.write(entry.to_json() + "\n")
+            os.replace(path, self.path)
+            self._appended = 0
+
+        except IOError as e:
+            self._logger.warning(f"Unable to compact write journal '{self.path}': {e}")
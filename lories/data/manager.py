@@ -8,6 +8,7 @@ lories.data.manager
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import signal
@@ -16,24 +17,27 @@ from collections.abc import Callable
 from concurrent import futures
 from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
 from functools import partial
-from threading import Event, Thread
-from typing import Any, Dict, Mapping, Optional, Type
+from threading import Event, Lock, Thread, current_thread
+from typing import Any, Collection, Dict, Mapping, Optional, Sequence, Type
 
 import pandas as pd
 import pytz as tz
 from lories._core import _Context, _DataManager  # noqa
 from lories.components import Component, ComponentContext
 from lories.connectors import Connector, ConnectorContext, ConnectorError
-from lories.connectors.tasks import CheckTask, ConnectTask, LogTask, ReadTask, WriteTask
+from lories.connectors.asynchronous import get_event_loop, run_sync
+from lories.connectors.tasks import CheckTask, ConnectTask, LogTask, ReadTask, ResampleTask, WriteQueue, WriteTask
 from lories.core.activator import Activator
 from lories.core.configs import ConfigurationError, Configurations
 from lories.core.register import Registrator, RegistratorContext
 from lories.core.typing import ChannelsArgument, Timestamp
 from lories.data.channels import Channel, ChannelConnector, ChannelConverter, Channels, ChannelState
+from lories.data.channels.filter import filter_logging
 from lories.data.context import DataContext
 from lories.data.converters import ConverterContext
 from lories.data.databases import Database, Databases
 from lories.data.listeners import ListenerContext
+from lories.data.planner import QueryPlanner
 from lories.data.replication import Replication
 from lories.data.retention import Retention
 from lories.util import floor_date, parse_type, to_bool, to_timedelta, validate_key
@@ -55,10 +59,15 @@ class DataManager(_DataManager, DataContext, Activator):
     _listeners: ListenerContext
 
     _executor: ThreadPoolExecutor
+    _write_queues: Dict[str, WriteQueue]
+    _log_queues: Dict[str, WriteQueue]
+    _planner: QueryPlanner
     __runner: Thread
     __interrupt: Event
+    __wakeup: Optional[asyncio.Event] = None
 
     _interval: int
+    _runtime: Literal["threads", "asyncio"]
 
     def __init__(self, configs: Configurations, name: str, **kwargs) -> None:
         super().__init__(configs=configs, key=validate_key(name), name=name, **kwargs)
@@ -73,10 +82,13 @@ class DataManager(_DataManager, DataContext, Activator):
             thread_name_prefix=self.name,
             max_workers=max(int((os.cpu_count() or 1) / 2), 1),
         )
+        self._write_queues = {}
+        self._log_queues = {}
+        self._planner = QueryPlanner()
         self.__runner = Thread(name=self.name, target=self.run)
 
-        signal.signal(signal.SIGINT, self.interrupt)
-        signal.signal(signal.SIGTERM, self.deactivate)
+        signal.signal(signal.SIGINT, self.__interrupt_signal)
+        signal.signal(signal.SIGTERM, self.__deactivate_signal)
 
     # noinspection PyArgumentList
     def __contains__(self, item: str | Channel | Connector | Component) -> bool:
@@ -98,10 +110,12 @@ class DataManager(_DataManager, DataContext, Activator):
             registrator_context: RegistratorContext,
             registrator_type: str,
             name: Optional[str] = None,
+            registrator_configs: Optional[Mapping[str, Any] | str] = None,
         ) -> Dict[str, Any]:
             if name is None:
                 name = registrator_type
-            registrator_configs = configs.pop(name, None)
+            if registrator_configs is None:
+                registrator_configs = configs.pop(name, None)
             if registrator_configs is None:
                 return {registrator_type: None}
             if isinstance(registrator_configs, str):
@@ -127,7 +141,15 @@ class DataManager(_DataManager, DataContext, Activator):
         else:
             converter = ChannelConverter(**build_args(self._converters, "converter"))
         connector = ChannelConnector(**build_args(self._connectors, "connector"))
-        logger = ChannelConnector(**build_args(self._connectors, "connector", "logger"))
+        logger = configs.get("logger", None)
+        if isinstance(logger, Sequence) and not isinstance(logger, str):
+            # Several loggers may be configured, to log the channel to more than one connector
+            logger = [
+                ChannelConnector(**build_args(self._connectors, "connector", "logger", logger_configs))
+                for logger_configs in configs.pop("logger")
+            ]
+        else:
+            logger = ChannelConnector(**build_args(self._connectors, "connector", "logger"))
 
         return Channel(
             id=id, key=key, type=type, context=self, converter=converter, connector=connector, logger=logger, **configs
@@ -136,6 +158,9 @@ class DataManager(_DataManager, DataContext, Activator):
     def configure(self, configs: Configurations) -> None:
         super().configure(configs)
         self._interval = configs.get_int("interval", default=1)
+        self._runtime = configs.get("runtime", default="threads").lower()
+        if self._runtime not in ["threads", "asyncio"]:
+            raise ConfigurationError(f"Invalid runtime '{self._runtime}' of {type(self).__name__}: {self.name}")
 
     def _at_configure(self, configs: Configurations) -> None:
         super()._at_configure(configs)
@@ -224,7 +249,9 @@ class DataManager(_DataManager, DataContext, Activator):
         self._logger.debug(f"Connecting {type(connector).__name__} '{connector.name}': {connector.id}")
         if channels is None:
             channels = self.channels.filter(lambda c: c.has_connector(connector.id))
-            channels.update(self.channels.filter(lambda c: c.has_logger(connector.id)).apply(lambda c: c.from_logger()))
+            channels.update(
+                self.channels.filter(lambda c: c.has_logger(connector.id)).apply(lambda c: c.from_logger(connector.id))
+            )
 
         return ConnectTask(connector, channels)
 
@@ -343,13 +370,29 @@ class DataManager(_DataManager, DataContext, Activator):
             if self._logger.getEffectiveLevel() <= logging.DEBUG:
                 self._logger.exception(e)
 
+    def __interrupt_signal(self, *_) -> None:
+        # Only set the flag in the signal handler and interrupt in a separate thread, as flushing pending writes
+        # may wait for locks held by the interrupted thread
+        self.__interrupt.set()
+        Thread(name=f"{self.name}-interrupt", target=self.interrupt).start()
+
+    def __deactivate_signal(self, *_) -> None:
+        self.__interrupt.set()
+        Thread(name=f"{self.name}-deactivate", target=self.deactivate).start()
+
     def interrupt(self, *_) -> None:
         self.__interrupt.set()
+        if self.__wakeup is not None:
+            get_event_loop().call_soon_threadsafe(self.__wakeup.set)
+        if self.__runner.is_alive() and self.__runner is not current_thread():
+            self.__runner.join()
+
+        # Deliver pending writes and logs before shutting down the executor, ignoring the rate limits of connectors
+        for write_queue in [*self._write_queues.values(), *self._log_queues.values()]:
+            write_queue.flush()
 
         # FIXME: Add cancel_futures argument again, once Python >= 3.9 is a requirement
         self._executor.shutdown(wait=True)  # , cancel_futures=True)
-        if self.__runner.is_alive():
-            self.__runner.join()
 
     def register(
         self,
@@ -420,6 +463,10 @@ class DataManager(_DataManager, DataContext, Activator):
 
     # noinspection PyShadowingBuiltins, PyProtectedMember
     def run(self, **kwargs) -> None:
+        if self._runtime == "asyncio":
+            run_sync(self.run_async(**kwargs))
+            return
+
         now = pd.Timestamp.now(tz.UTC)
 
         channels = self.channels.filter(lambda c: self.__is_reading(c, now))
@@ -448,6 +495,32 @@ class DataManager(_DataManager, DataContext, Activator):
         self.notify()
         self.log()
 
+    # noinspection PyShadowingBuiltins, PyProtectedMember
+    async def run_async(self, **kwargs) -> None:
+        self.__wakeup = asyncio.Event()
+
+        now = pd.Timestamp.now(tz.UTC)
+        await self.__read_async(now, **kwargs)
+
+        interval = f"{self._interval}s"
+        await _sleep_async(interval, self.__wakeup)
+
+        while not self.__interrupt.is_set():
+            now = pd.Timestamp.now(tz.UTC)
+
+            await self.__read_async(now, timeout=self._interval / 4, **kwargs)
+
+            # Blocking calls run in worker threads, to not hold back the coroutines of the event loop
+            await asyncio.to_thread(self.reconnect, lambda c: c._is_reconnectable())
+            await asyncio.to_thread(self.notify, timeout=self._interval / 4)
+            await asyncio.to_thread(self.log)
+
+            await _sleep_async(interval, self.__wakeup)
+
+        await asyncio.to_thread(self.notify)
+        await asyncio.to_thread(self.log)
+        self.__wakeup = None
+
     # noinspection PyShadowingBuiltins
     def has_logged(
         self,
@@ -464,9 +537,9 @@ class DataManager(_DataManager, DataContext, Activator):
                 continue
 
             def has_database(channel: Channel) -> bool:
-                return channel.has_logger(id) and channel.logger.is_database()
+                return _get_database_logger(channel) == id
 
-            check_channels = channels.filter(has_database).apply(lambda c: c.from_logger())
+            check_channels = channels.filter(has_database).apply(lambda c: c.from_logger(id))
             if len(check_channels) == 0:
                 continue
 
@@ -508,6 +581,7 @@ class DataManager(_DataManager, DataContext, Activator):
         start: Optional[Timestamp] = None,
         end: Optional[Timestamp] = None,
         timeout: Optional[float] = None,
+        freq: Optional[str] = None,
     ) -> pd.DataFrame:
         channels = self._filter_by_args(channels)
 
@@ -517,18 +591,45 @@ class DataManager(_DataManager, DataContext, Activator):
                 continue
 
             def has_database(channel: Channel) -> bool:
-                return channel.has_logger(id) and channel.logger.is_database()
+                return _get_database_logger(channel) == id
 
-            read_channels = channels.filter(has_database).apply(lambda c: c.from_logger())
+            read_channels = channels.filter(has_database).apply(lambda c: c.from_logger(id))
             if len(read_channels) == 0:
                 continue
 
-            read_task = ReadTask(connector, read_channels)
-            read_future = self._executor.submit(read_task, start=start, end=end)
+            if freq is not None:
+                # Resampled values may be served from the rollups of the database
+                read_task = ResampleTask(connector, read_channels)
+                read_future = self._executor.submit(read_task, freq=freq, start=start, end=end)
+            else:
+                read_task = ReadTask(connector, read_channels)
+                read_future = self._executor.submit(read_task, start=start, end=end)
             read_futures[read_future] = read_task
 
         return self._read_futures(read_futures, timeout)
 
+    def query(
+        self,
+        channels: Optional[ChannelsArgument] = None,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        timeout: Optional[float] = None,
+        freq: Optional[str] = None,
+    ) -> pd.DataFrame:
+        channels = self._filter_by_args(channels)
+        if freq is not None:
+            # Resampled values are not kept by the planner and always queried from the loggers
+            return self.read_logged(channels, start=start, end=end, timeout=timeout, freq=freq)
+
+        def read_logged(
+            logged_channels: Channels,
+            logged_start: pd.Timestamp,
+            logged_end: pd.Timestamp,
+        ) -> pd.DataFrame:
+            return self.read_logged(logged_channels, start=logged_start, end=logged_end, timeout=timeout)
+
+        return self._planner.query(channels, start, end, read=read_logged)
+
     # noinspection PyShadowingBuiltins, PyTypeChecker
     def read(
         self,
@@ -632,6 +733,45 @@ class DataManager(_DataManager, DataContext, Activator):
 
         futures.wait(read_futures, timeout=timeout)
 
+    # noinspection PyShadowingBuiltins, PyTypeChecker
+    async def __read_async(
+        self,
+        timestamp: Timestamp,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        channels = self.channels.filter(lambda c: self.__is_reading(c, timestamp))
+        if len(channels) < 1:
+            return
+        self._logger.debug(f"Reading {len(channels)} channels of application: {self.name}")
+
+        event_loop = asyncio.get_running_loop()
+        read_futures = []
+        for id, connector in self.connectors.items():
+            if not connector._is_connected():
+                continue
+
+            read_channels = channels.filter(lambda c: c.has_connector(id))
+            if len(read_channels) == 0:
+                continue
+
+            read_task = ReadTask(connector, read_channels)
+            if connector.capabilities.asynchronous:
+                read_future = asyncio.ensure_future(read_task.call_async(inplace=True, **kwargs))
+            else:
+                # Synchronous connectors are adapted through the bounded thread pool of the executor
+                read_future = event_loop.run_in_executor(self._executor, partial(read_task, inplace=True, **kwargs))
+            read_future.add_done_callback(partial(self._read_callback, read_task, inplace=True))
+            read_futures.append(read_future)
+
+            def update_timestamp(read_channel: Channel) -> None:
+                read_channel.connector.timestamp = timestamp
+
+            read_channels.apply(update_timestamp, inplace=True)
+
+        if len(read_futures) > 0:
+            await asyncio.wait(read_futures, timeout=timeout)
+
     def __is_reading(self, channel: Channel, timestamp: pd.Timestamp) -> bool:
         freq = channel.freq
         if (
@@ -652,8 +792,8 @@ class DataManager(_DataManager, DataContext, Activator):
         data: pd.DataFrame,
         channels: Optional[ChannelsArgument] = None,
         timeout: Optional[float] = None,
-        inplace: bool = False,
-    ) -> None:
+        blocking: bool = True,
+    ) -> Future:
         channels = self._filter_by_args(channels)
 
         write_futures = {}
@@ -661,16 +801,35 @@ class DataManager(_DataManager, DataContext, Activator):
             if not connector._is_connected():
                 continue
 
-            write_channels = channels.filter(lambda c: (c.has_connector(id) and c.id in data.columns))
+            write_channels = channels.filter(lambda c: c.has_connector(id) and c.id in data.columns)
             if len(write_channels) == 0:
                 continue
 
             write_channels.set_frame(data)
             write_task = WriteTask(connector, write_channels)
-            write_future = self._executor.submit(write_task)
+            write_future = self.__write_queue(connector).submit(write_task)
             write_futures[write_future] = write_task
+            if not blocking:
+                write_future.add_done_callback(partial(self._write_callback, write_task, inplace=False))
 
-        self._write_futures(write_futures, timeout)
+        write_future = _gather(write_futures.keys())
+        if blocking:
+            self._write_futures(write_futures, timeout)
+        return write_future
+
+    def __write_queue(self, connector: Connector) -> WriteQueue:
+        write_queue = self._write_queues.get(connector.id, None)
+        if write_queue is None:
+            write_queue = self._write_queues.setdefault(connector.id, WriteQueue(connector, self._executor))
+        return write_queue
+
+    def __log_queue(self, connector: Connector) -> WriteQueue:
+        # Logs are queued separately for each connector, so slow loggers coalesce their pending values
+        # into one bulk write, without holding back the other loggers
+        log_queue = self._log_queues.get(connector.id, None)
+        if log_queue is None:
+            log_queue = self._log_queues.setdefault(connector.id, WriteQueue(connector, self._executor, LogTask))
+        return log_queue
 
     def _write_futures(
         self,
@@ -698,8 +857,11 @@ class DataManager(_DataManager, DataContext, Activator):
         inplace: bool = False,
     ) -> None:
         channels = task.channels
+        filters = task.filters if isinstance(task, LogTask) else None
         try:
             future.result()
+            if filters is not None:
+                filters.confirm()
 
         except ConnectorError as e:
             self._logger.warning(f"Failed writing connector '{task.connector.id}': {str(e)}")
@@ -707,6 +869,9 @@ class DataManager(_DataManager, DataContext, Activator):
                 self._logger.exception(e)
             if inplace:
                 channels.set_state(ChannelState.WRITE_ERROR)
+            if filters is not None:
+                # Revert the logging filters, to pass the values again in the next logging cycle
+                filters.revert()
 
     # noinspection PyShadowingBuiltins, PyTypeChecker
     def log(
@@ -719,6 +884,15 @@ class DataManager(_DataManager, DataContext, Activator):
         if channels is None:
             channels = self.channels
 
+        # Take one snapshot of the channels per logging cycle, to log the same values to every logger,
+        # even if channels are updated while slower loggers are still being written to
+        snapshots = {}
+
+        def snapshot(channel: Channel) -> Channel:
+            if channel.id not in snapshots:
+                snapshots[channel.id] = channel.copy()
+            return snapshots[channel.id]
+
         log_futures = {}
         for id, connector in self.connectors.items():
             if not connector._is_connected():
@@ -727,31 +901,46 @@ class DataManager(_DataManager, DataContext, Activator):
             def has_update(channel: Channel) -> bool:
                 if force:
                     return True
-                if channel.freq is None:
-                    return pd.isna(channel.logger.timestamp) or channel.timestamp > channel.logger.timestamp
-                if pd.isna(channel.logger.timestamp):
-                    logger_timestamp = floor_date(channel.timestamp, freq=channel.freq)
+                logger = channel.get_logger(id)
+                freq = logger.freq or channel.freq
+                if freq is None:
+                    return pd.isna(logger.timestamp) or channel.timestamp > logger.timestamp
+                timedelta = to_timedelta(freq)
+                if pd.isna(logger.timestamp):
+                    logger_timestamp = floor_date(channel.timestamp, freq=freq)
                     if logger_timestamp == channel.timestamp:
-                        logger_timestamp -= channel.timedelta
-                    channel.logger.timestamp = logger_timestamp
+                        logger_timestamp -= timedelta
+                    logger.timestamp = logger_timestamp
 
-                return channel.timestamp >= channel.logger.timestamp + channel.timedelta
+                return channel.timestamp >= logger.timestamp + timedelta
 
-            log_channels = channels.filter(lambda c: (c.has_logger(id) and c.is_valid() and has_update(c)))
+            log_channels = channels.filter(lambda c: c.has_logger(id) and c.is_valid() and has_update(c))
             if len(log_channels) == 0:
                 continue
 
-            log_task = LogTask(connector, log_channels)
-            log_future = self._executor.submit(log_task)
+            def update_timestamp(channel: Channel) -> None:
+                channel.get_logger(id).timestamp = channel.timestamp
+
+            # Update the logger timestamps of all channels due to be logged, including the ones that will be
+            # suppressed by their logging filters, to only evaluate them once per logging period
+            if force:
+                filtered_channels, filters = log_channels, None
+            else:
+                filtered_channels, filters = filter_logging(log_channels, id)
+            log_channels.apply(update_timestamp, inplace=True)
+            if len(filtered_channels) == 0:
+                continue
+
+            # Channels held back by compressing logging filters are already copies
+            live_channels = {c.id: c for c in log_channels}
+            filtered_channels = filtered_channels.apply(lambda c: snapshot(c) if live_channels.get(c.id) is c else c)
+
+            log_task = LogTask(connector, filtered_channels, filters)
+            log_future = self.__log_queue(connector).submit(log_task)
             log_futures[log_future] = log_task
             if not blocking:
                 log_future.add_done_callback(partial(self._write_callback, log_task, inplace=False))
 
-            def update_timestamp(channel: Channel) -> None:
-                channel.logger.timestamp = channel.timestamp
-
-            log_channels.apply(update_timestamp, inplace=True)
-
         if blocking:
             self._write_futures(log_futures, timeout, inplace=False)
 
@@ -771,6 +960,7 @@ class DataManager(_DataManager, DataContext, Activator):
 
         databases = Databases(self, configs)
         databases.rotate(channels, **kwargs)
+        self._planner.invalidate(channels)
 
     def replicate(
         self,
@@ -794,6 +984,7 @@ class DataManager(_DataManager, DataContext, Activator):
 
         databases = Databases(self, configs)
         databases.replicate(channels, **kwargs)
+        self._planner.invalidate(channels)
 
     # noinspection PyMethodMayBeStatic
     def __is_replicating(self, channel: Channel, timestamp: Optional[Timestamp] = None) -> bool:
@@ -819,6 +1010,17 @@ def _sleep(freq: str, sleep: Callable = time.sleep) -> None:
     sleep(seconds)
 
 
+# noinspection PyShadowingBuiltins
+async def _sleep_async(freq: str, wakeup: asyncio.Event) -> None:
+    now = pd.Timestamp.now(tz.UTC)
+    next = _next(freq, now)
+    seconds = (next - now).total_seconds()
+    try:
+        await asyncio.wait_for(wakeup.wait(), timeout=seconds)
+    except asyncio.TimeoutError:
+        pass
+
+
 # noinspection PyShadowingBuiltins, PyShadowingNames
 def _next(freq: str, now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
     if now is None:
@@ -829,6 +1031,39 @@ def _next(freq: str, now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
     return next
 
 
+# noinspection PyShadowingBuiltins
+def _get_database_logger(channel: Channel) -> Optional[str]:
+    # Logged values are read from the first database the channel gets logged to
+    return next((logger.id for logger in channel.loggers if logger.enabled and logger.is_database()), None)
+
+
+def _gather(futures_: Collection[Future]) -> Future:
+    futures_ = list(futures_)
+    future = Future()
+    future.set_running_or_notify_cancel()
+    if len(futures_) == 0:
+        future.set_result(None)
+        return future
+
+    lock = Lock()
+    pending = [len(futures_)]
+
+    def _done(_: Future) -> None:
+        with lock:
+            pending[0] -= 1
+            if pending[0] > 0:
+                return
+        exceptions = [f.exception() for f in futures_ if not f.cancelled() and f.exception() is not None]
+        if len(exceptions) > 0:
+            future.set_exception(exceptions[0])
+        else:
+            future.set_result(None)
+
+    for _future in futures_:
+        _future.add_done_callback(_done)
+    return future
+
+
 def _filter(*filters: Optional[Callable[[Connector | Component], bool]]) -> Callable[[...], bool]:
     def _all_filters(registrator: Connector | Component) -> bool:
         return all(f(registrator) for f in filters if f is not None)
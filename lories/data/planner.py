@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+lories.data.planner
+~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pytz as tz
+from lories._core._channel import Channel  # noqa
+from lories._core._channels import Channels  # noqa
+from lories.core.typing import Timestamp
+from lories.util import to_date
+
+
+class QuerySegment:
+    """
+    Contiguous range of logged values of a channel, that is held in memory.
+
+    """
+
+    __slots__ = ("start", "end", "data")
+
+    start: pd.Timestamp
+    end: pd.Timestamp
+    data: pd.Series
+
+    def __init__(self, start: pd.Timestamp, end: pd.Timestamp, data: pd.Series) -> None:
+        self.start = start
+        self.end = end
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(start={self.start}, end={self.end}, values={len(self.data)})"
+
+    def missing(self, start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        if end < self.start or start > self.end:
+            return [(start, end)]
+        ranges = []
+        if start < self.start:
+            ranges.append((start, self.start))
+        if end > self.end:
+            ranges.append((self.end, end))
+        return ranges
+
+    def get(self, start: pd.Timestamp, end: pd.Timestamp) -> pd.Series:
+        return self.data[(self.data.index >= start) & (self.data.index <= end)]
+
+    def extend(self, start: pd.Timestamp, end: pd.Timestamp, data: pd.Series) -> bool:
+        if end < self.start or start > self.end:
+            return False
+        self.data = data.combine_first(self.data) if not self.data.empty else data
+        self.start = min(self.start, start)
+        self.end = max(self.end, end)
+        return True
+
+    def trim(self, limit: int) -> None:
+        if len(self.data) > limit:
+            self.data = self.data.iloc[-limit:]
+            self.start = self.data.index[0]
+
+
+class QueryPlanner:
+    """
+    Planner of windowed reads of channels, that splits a requested range into segments.
+
+    The latest values are served from the live state of the channels, already read ranges of logged values are
+    served from memory, and only missing ranges are queried from the logging database. Logged ranges are only
+    held until the last timestamp each channel was logged for, as values may be logged with a delay.
+
+    """
+
+    __slots__ = ("_lock", "_segments", "limit")
+
+    _lock: Lock
+    _segments: Dict[str, QuerySegment]
+
+    limit: int
+
+    def __init__(self, limit: int = 100000) -> None:
+        self._lock = Lock()
+        self._segments = {}
+        self.limit = limit
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(channels={len(self._segments)}, limit={self.limit})"
+
+    # noinspection PyShadowingBuiltins
+    def query(
+        self,
+        channels: Channels,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        read: Optional[Callable[[Channels, pd.Timestamp, pd.Timestamp], pd.DataFrame]] = None,
+    ) -> pd.DataFrame:
+        start = to_date(start)
+        end = to_date(end)
+
+        data = channels.to_frame(unique=True)
+        if read is None or (
+            not data.empty and (start is None or start >= data.index[0]) and (end is None or end <= data.index[-1])
+        ):
+            # The live state already covers the whole range, e.g. for forecasts
+            return data
+        if start is None or end is None:
+            # Open ranges can not be served from memory and are always queried from the logger
+            return _merge(data, read(channels, start, end))
+
+        missing: Dict[Tuple[pd.Timestamp, pd.Timestamp], List[Channel]] = {}
+        with self._lock:
+            for channel in channels:
+                segment = self._segments.get(channel.id, None)
+                channel_missing = segment.missing(start, end) if segment is not None else [(start, end)]
+                for missing_range in channel_missing:
+                    missing.setdefault(missing_range, []).append(channel)
+
+        for (missing_start, missing_end), missing_channels in missing.items():
+            missing_data = read(type(channels)(missing_channels), missing_start, missing_end)
+            self._update(missing_channels, missing_start, missing_end, missing_data)
+
+        logged = []
+        with self._lock:
+            for channel in channels:
+                segment = self._segments.get(channel.id, None)
+                if segment is not None:
+                    logged.append(segment.get(start, end).rename(channel.id))
+        logged = [d for d in logged if not d.empty]
+        if len(logged) > 0:
+            data = _merge(data, pd.concat(logged, axis="columns"))
+        return data
+
+    # noinspection PyShadowingBuiltins
+    def _update(
+        self,
+        channels: List[Channel],
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        data: pd.DataFrame,
+    ) -> None:
+        with self._lock:
+            for channel in channels:
+                channel_data = data[channel.id].dropna() if channel.id in data.columns else pd.Series(dtype=float)
+                channel_end = min(end, _get_logged(channel, channel_data))
+                if channel_end < start:
+                    continue
+
+                channel_data = channel_data[channel_data.index <= channel_end]
+                segment = self._segments.get(channel.id, None)
+                if segment is None or not segment.extend(start, channel_end, channel_data):
+                    segment = self._segments[channel.id] = QuerySegment(start, channel_end, channel_data)
+                segment.trim(self.limit)
+
+    def invalidate(self, channels: Optional[Channels] = None) -> None:
+        with self._lock:
+            if channels is None:
+                self._segments.clear()
+                return
+            for channel in channels:
+                self._segments.pop(channel.id, None)
+
+
+def _merge(data: pd.DataFrame, logged: Optional[pd.DataFrame]) -> pd.DataFrame:
+    if logged is None or logged.empty:
+        return data
+    return logged if data.empty else data.combine_first(logged)
+
+
+# noinspection PyProtectedMember
+def _get_logged(channel: Channel, data: pd.Series) -> pd.Timestamp:
+    # Only hold ranges up to the last logged timestamp, as values may still be logged for earlier timestamps
+    timestamps = [logger.timestamp for logger in channel.loggers if logger.enabled and not pd.isna(logger.timestamp)]
+    if len(timestamps) > 0:
+        return min(timestamps)
+    if data.empty:
+        return pd.Timestamp.min.tz_localize(tz.UTC)
+    return data.index[-1]
@@ -8,9 +8,13 @@ lories.data.replication
 
 from __future__ import annotations
 
+import json
 import logging
-from collections.abc import Sequence
-from typing import Any, Dict, Iterator, List, Mapping, Optional
+import os
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
 import tzlocal
 
@@ -18,6 +22,8 @@ import pandas as pd
 import pytz as tz
 from lories import ConfigurationError, Resource, ResourceError, Resources
 from lories.connectors import Database
+from lories.data.checksums import CHECKSUM_LEVELS, ChecksumLevel, iter_periods
+from lories.data.util import hash_value
 from lories.util import floor_date, parse_freq, slice_range, to_bool, to_timedelta, to_timezone
 
 # FIXME: Remove this once Python >= 3.9 is a requirement
@@ -27,6 +33,8 @@ try:
 except ImportError:
     from typing_extensions import Literal
 
+_ReplicationSlice = Tuple[Optional[pd.DataFrame], str]
+
 
 class Replication:
     TYPE: str = "replication"
@@ -40,6 +48,11 @@ class Replication:
     freq: str = "D"
     timezone: tz.BaseTzInfo
 
+    workers: int = 1
+
+    delta: bool = False
+    verify: Optional[str] = "D"
+
     # noinspection PyShadowingBuiltins
     def __init__(
         self,
@@ -48,6 +61,9 @@ class Replication:
         method: Literal["push", "pull"] = "push",
         slice: str = "D",
         freq: str = "D",
+        workers: int = 1,
+        delta: bool = False,
+        verify: Optional[str] = "D",
         enabled: bool = True,
     ) -> None:
         self._logger = logging.getLogger(self.__module__)
@@ -65,6 +81,13 @@ class Replication:
         self.freq = parse_freq(freq)
         self.slice = parse_freq(slice)
 
+        workers = int(workers)
+        if workers < 1:
+            raise ConfigurationError(f"Invalid number of replication workers: {workers}")
+        self.workers = workers
+        self.delta = to_bool(delta)
+        self.verify = parse_freq(verify)
+
     @classmethod
     def _assert_database(cls, database):
         if database is None:
@@ -81,6 +104,9 @@ class Replication:
         method: Literal["push", "pull"] = "push",
         slice: str = "D",
         freq: str = "D",
+        workers: int = 1,
+        delta: bool = False,
+        verify: Optional[str] = "D",
         enabled: bool = True,
     ) -> bool:
         return (
@@ -89,6 +115,9 @@ class Replication:
             and self.method == method
             and self.freq == parse_freq(freq)
             and self.slice == parse_freq(slice)
+            and self.workers == int(workers)
+            and self.delta == to_bool(delta)
+            and self.verify == parse_freq(verify)
             and self._enabled == to_bool(enabled)
         )
 
@@ -130,6 +159,8 @@ class Replication:
             "slice": self.slice,
             "freq": self.freq,
             "timezone": self.timezone,
+            "delta": self.delta,
+            "verify": self.verify,
         }
 
     @property
@@ -147,16 +178,181 @@ class Replication:
         kwargs["force"] = force
         method = kwargs.pop("method")
 
+        # Limit the groups replicated concurrently for each database, to the concurrency the database allows
+        semaphores = {}
+
+        def _get_semaphore(database: Database) -> BoundedSemaphore:
+            if database.id not in semaphores:
+                concurrency = database.concurrency if database.concurrency is not None else self.workers
+                semaphores[database.id] = BoundedSemaphore(max(1, min(self.workers, concurrency)))
+            return semaphores[database.id]
+
+        def _replicate(logger: Database, group_resources: Resources) -> None:
+            source, target = (logger, self.database) if method == "push" else (self.database, logger)
+            # Acquire semaphores in a consistent order, to avoid deadlocks between groups
+            databases = sorted({source.id: source, target.id: target}.values(), key=lambda d: d.id)
+            for database in databases:
+                _get_semaphore(database).acquire()
+            try:
+                replicate(source, target, group_resources, **kwargs)
+
+            except ReplicationException as e:
+                self._logger.error(f"Replication failed because: {e}")
+            finally:
+                for database in reversed(databases):
+                    _get_semaphore(database).release()
+
+        groups = []
         for logger, logger_resources in resources.groupby(lambda c: c.logger._connector):
             for _, group_resources in logger_resources.groupby(lambda c: c.group):
-                try:
-                    if method == "push":
-                        replicate(logger, self.database, group_resources, **kwargs)
-                    elif method == "pull":
-                        replicate(self.database, logger, group_resources, **kwargs)
+                groups.append((logger, group_resources))
+
+                # Create semaphores upfront, before being accessed concurrently
+                _get_semaphore(logger)
+        _get_semaphore(self.database)
+
+        workers = min(self.workers, len(groups))
+        if workers <= 1:
+            for logger, group_resources in groups:
+                _replicate(logger, group_resources)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lories-replication") as executor:
+            futures = [executor.submit(_replicate, logger, group_resources) for logger, group_resources in groups]
+            for future in futures:
+                future.result()
+
+
+class ReplicationCheckpoints:
+    """
+    Persistent checkpoints of the last slice verified by replicating resources from a source to a target database.
+
+    Checkpoints are kept in a JSON file for each target database, with the range and checksum of the slice, and are
+    only advanced for slices verified in ascending order. Full replications interrupted before verifying the whole
+    history resume from the last verified slice, if its checksum still matches the target, and remove the checkpoint
+    once completed. For delta replication, the write marker of the source journal replicated last and the time of
+    the last verification are kept as well.
+
+    """
 
-                except ReplicationException as e:
-                    self._logger.error(f"Replication failed because: {e}")
+    __slots__ = ("_lock", "_logger", "_checkpoints", "_markers", "path")
+
+    _instances: Dict[str, ReplicationCheckpoints] = {}
+    _instances_lock: Lock = Lock()
+
+    _lock: Lock
+    _checkpoints: Dict[str, Dict[str, str]]
+    _markers: Dict[str, Dict[str, Any]]
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        self._lock = Lock()
+        self._logger = logging.getLogger(type(self).__module__)
+        self._checkpoints = {}
+        self._markers = {}
+        self.path = path
+        self._load()
+
+    @classmethod
+    def from_database(cls, database: Database) -> Optional[ReplicationCheckpoints]:
+        if database.configs is None:
+            return None
+        path = os.path.join(database.configs.dirs.data, ".replication", f"{database.id}.json")
+        with cls._instances_lock:
+            # Checkpoints of a target are shared, as several groups may be replicated to it concurrently
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def get(self, source: Database, resources: Resources) -> Optional[Dict[str, str]]:
+        with self._lock:
+            return self._checkpoints.get(_build_key(source, resources), None)
+
+    # noinspection PyShadowingBuiltins
+    def set(
+        self,
+        source: Database,
+        resources: Resources,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        checksum: str,
+        method: str,
+    ) -> None:
+        key = _build_key(source, resources)
+        with self._lock:
+            checkpoint = self._checkpoints.get(key, None)
+            if checkpoint is not None and pd.Timestamp(checkpoint["end"]) > end:
+                return
+            self._checkpoints[key] = {
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "checksum": checksum,
+                "method": method,
+            }
+            self._save()
+
+    def get_marker(self, source: Database, resources: Resources) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._markers.get(_build_key(source, resources), None)
+
+    def set_marker(
+        self,
+        source: Database,
+        resources: Resources,
+        marker: int,
+        verified: Optional[pd.Timestamp] = None,
+    ) -> None:
+        if verified is None:
+            verified = pd.Timestamp.now(tz.UTC)
+        with self._lock:
+            self._markers[_build_key(source, resources)] = {
+                "marker": marker,
+                "verified": verified.isoformat(),
+            }
+            self._save()
+
+    def remove(self, source: Database, resources: Resources) -> None:
+        with self._lock:
+            if self._checkpoints.pop(_build_key(source, resources), None) is not None:
+                self._save()
+
+    def verify(self, source: Database, target: Database, resources: Resources) -> Optional[pd.Timestamp]:
+        """
+        Verify the checkpoint against the target and return the start of the last verified slice, if still valid.
+        """
+        checkpoint = self.get(source, resources)
+        if checkpoint is None:
+            return None
+        start = pd.Timestamp(checkpoint["start"])
+        end = pd.Timestamp(checkpoint["end"])
+        if target.hash(resources, start, end, method=checkpoint["method"]) != checkpoint["checksum"]:
+            # The target changed since the checkpoint was verified
+            self.remove(source, resources)
+            return None
+        return start
+
+    def _load(self) -> None:
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                checkpoints = json.load(file)
+                self._checkpoints = checkpoints.get("slices", {})
+                self._markers = checkpoints.get("markers", {})
+        except (IOError, ValueError) as e:
+            self._logger.warning(f"Unable to load replication checkpoints from '{self.path}': {e}")
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            path = f"{self.path}.tmp"
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"slices": self._checkpoints, "markers": self._markers}, file)
+            os.replace(path, self.path)
+
+        except IOError as e:
+            self._logger.warning(f"Unable to persist replication checkpoints to '{self.path}': {e}")
 
 
 class ReplicationException(ResourceError):
@@ -239,10 +435,24 @@ def replicate(
     freq: str = "D",
     full: bool = True,
     force: bool = False,
+    delta: bool = False,
+    verify: Optional[str] = "D",
 ) -> None:
     if source is None or target is None or len(resources) == 0:
         return
 
+    if delta and not full and source.journal is not None:
+        checkpoints = ReplicationCheckpoints.from_database(target)
+        if checkpoints is not None:
+            if replicate_delta(source, target, resources, checkpoints, verify=verify):
+                return
+
+            # Verify the replicated data by comparing checksums, before continuing with the marker of this run
+            marker = source.journal.marker
+            replicate(source, target, resources, timezone, slice, freq, full=full, force=force)
+            checkpoints.set_marker(source, resources, marker)
+            return
+
     logger = logging.getLogger(Replication.__module__)
     logger.debug(
         f"Starting to replicate data of resource{'s' if len(resources) > 1 else ''} "
@@ -272,17 +482,171 @@ def replicate(
         )
         return
 
-    if not target_empty:
-        # Validate prior step, before continuing
-        prior_end = floor_date(start if start <= now else now, timezone=timezone, freq=freq)
-        prior_start = prior_end - to_timedelta(freq) + pd.Timedelta(seconds=1)
-        replicate_range(source, target, resources, prior_start, prior_end, force=force)
+    # Only full replications scan the history from the first index of the source and may resume from a checkpoint.
+    # Incremental replications already continue from the last index of the target.
+    checkpoints = ReplicationCheckpoints.from_database(target) if full else None
+    if checkpoints is not None:
+        checkpoint = checkpoints.verify(source, target, resources)
+        if checkpoint is not None and checkpoint > start:
+            # Resume from the last verified slice of an interrupted run, as prior history was already verified.
+            # The target may still hold values after the checkpoint, so the prior step is validated as usual.
+            logger.debug(
+                f"Resuming replication of resource{'s' if len(resources) > 1 else ''} "
+                + ", ".join([f"'{r.id}'" for r in resources])
+                + f" from checkpoint {checkpoint.strftime('%d.%m.%Y (%H:%M:%S)')}"
+            )
+            start = checkpoint
+            target_empty = False
+
+    def _iter_ranges() -> Iterator[Tuple[pd.Timestamp, pd.Timestamp]]:
+        if not target_empty:
+            # Validate prior step, before continuing
+            prior_end = floor_date(start if start <= now else now, timezone=timezone, freq=freq)
+            prior_start = prior_end - to_timedelta(freq) + pd.Timedelta(seconds=1)
+            yield prior_start, prior_end
+
+        if start + to_timedelta(slice) < end:
+            yield from slice_range(start, end, timezone=timezone, freq=slice)
+        else:
+            yield start, end
+
+    if start < end:
+        if _has_checksums(source, target):
+            # Compare the persisted checksum trees top-down, to only copy days with differing data
+            replicate_checksums(source, target, resources, start, end, force=force, checkpoints=checkpoints)
+        else:
+            method = _get_checksum_method(source, target)
+            replicate_ranges(
+                source, target, resources, _iter_ranges(), force=force, method=method, checkpoints=checkpoints
+            )
+
+    if checkpoints is not None:
+        # The whole history was verified, so the next full replication starts from the beginning again
+        checkpoints.remove(source, resources)
+
+
+def replicate_delta(
+    source: Database,
+    target: Database,
+    resources: Resources,
+    checkpoints: ReplicationCheckpoints,
+    verify: Optional[str] = "D",
+) -> bool:
+    """
+    Replicate only the ranges written to the source since the last replicated write marker, without comparing
+    checksums. Returns False, if the changes are unknown or a periodic verification by checksums is due.
+    """
+    state = checkpoints.get_marker(source, resources)
+    if state is None:
+        return False
+    if verify is not None and pd.Timestamp(state["verified"]) + to_timedelta(verify) <= pd.Timestamp.now(tz.UTC):
+        return False
+
+    marker = source.journal.marker
+    ranges = source.journal.changes(resources, state["marker"])
+    if ranges is None:
+        return False
 
-    if start + to_timedelta(slice) < end:
-        for slice_start, slice_end in slice_range(start, end, timezone=timezone, freq=slice):
-            replicate_range(source, target, resources, slice_start, slice_end, force=force)
-    else:
-        replicate_range(source, target, resources, start, end, force=force)
+    data = [d for d in source.read_many([(resources, s, e) for s, e in ranges]) if d is not None and not d.empty]
+    if len(data) > 0:
+        data = pd.concat(data, axis="index")
+        data = data[~data.index.duplicated(keep="last")].sort_index()
+
+        logger = logging.getLogger(Replication.__module__)
+        logger.info(
+            f"Replicated {len(data)} values of resource{'s' if len(resources) > 1 else ''} "
+            + ", ".join([f"'{r.id}'" for r in resources])
+            + f" written since marker {state['marker']}"
+        )
+        target.write(data)
+
+    checkpoints.set_marker(source, resources, marker, verified=pd.Timestamp(state["verified"]))
+    return True
+
+
+# noinspection PyTypeChecker
+def replicate_checksums(
+    source: Database,
+    target: Database,
+    resources: Resources,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    force: bool = False,
+    checkpoints: Optional[ReplicationCheckpoints] = None,
+) -> None:
+    ranges = _iter_checksum_ranges(source, target, resources, start, end)
+    replicate_ranges(
+        source, target, resources, ranges, force=force, method=source.checksums.method, checkpoints=checkpoints
+    )
+
+
+# noinspection PyTypeChecker
+def _iter_checksum_ranges(
+    source: Database,
+    target: Database,
+    resources: Resources,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    level: ChecksumLevel = "Y",
+) -> Iterator[Tuple[pd.Timestamp, pd.Timestamp]]:
+    for period_start, period_end in iter_periods(start, end, level):
+        source_checksum = source.checksums.get(source, resources, period_start, level)
+        if source_checksum is None:
+            continue
+        target_checksum = target.checksums.get(target, resources, period_start, level)
+        if source_checksum == target_checksum:
+            continue
+
+        range_start = max(start, period_start)
+        range_end = min(end, period_end - pd.Timedelta(microseconds=1))
+        child_level = CHECKSUM_LEVELS[level]
+        if child_level is None:
+            yield range_start, range_end
+        else:
+            yield from _iter_checksum_ranges(source, target, resources, range_start, range_end, level=child_level)
+
+
+def replicate_ranges(
+    source: Database,
+    target: Database,
+    resources: Resources,
+    ranges: Iterable[Tuple[pd.Timestamp, pd.Timestamp]],
+    force: bool = False,
+    method: Optional[str] = None,
+    checkpoints: Optional[ReplicationCheckpoints] = None,
+) -> None:
+    """
+    Replicate several ranges in a pipeline, comparing and reading the next range while the current one is written.
+
+    Ranges need to be passed in ascending order, for the checkpoint to be updated after each verified range.
+    """
+    if method is None:
+        method = _get_checksum_method(source, target)
+    ranges = iter(ranges)
+
+    def _prepare_next() -> Optional[Tuple[pd.Timestamp, pd.Timestamp, Optional[_ReplicationSlice]]]:
+        next_range = next(ranges, None)
+        if next_range is None:
+            return None
+        next_start, next_end = next_range
+        return next_start, next_end, _prepare_range(source, target, resources, next_start, next_end, method)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="lories-replication") as executor:
+        future = executor.submit(_prepare_next)
+        while True:
+            prepared = future.result()
+            if prepared is None:
+                break
+            future = executor.submit(_prepare_next)
+
+            slice_start, slice_end, replication_slice = prepared
+            if replication_slice is None:
+                continue
+            data, source_checksum = replication_slice
+            if data is not None:
+                _commit_range(source, target, resources, slice_start, slice_end, data, source_checksum, force, method)
+            if checkpoints is not None:
+                checkpoints.set(source, resources, slice_start, slice_end, source_checksum, method)
 
 
 def replicate_range(
@@ -292,7 +656,24 @@ def replicate_range(
     start: pd.Timestamp,
     end: pd.Timestamp,
     force: bool = False,
+    method: Optional[str] = None,
 ) -> None:
+    if method is None:
+        method = _get_checksum_method(source, target)
+
+    replication_slice = _prepare_range(source, target, resources, start, end, method)
+    if replication_slice is not None and replication_slice[0] is not None:
+        _commit_range(source, target, resources, start, end, *replication_slice, force, method)
+
+
+def _prepare_range(
+    source: Database,
+    target: Database,
+    resources: Resources,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    method: str,
+) -> Optional[_ReplicationSlice]:
     logger = logging.getLogger(Replication.__module__)
     logger.debug(
         f"Start copying data of resource{'s' if len(resources) > 1 else ''} "
@@ -301,21 +682,21 @@ def replicate_range(
         + f" to {end.strftime('%d.%m.%Y (%H:%M:%S)')}"
     )
 
-    source_checksum = source.hash(resources, start, end)
+    source_checksum = source.hash(resources, start, end, method=method)
     if source_checksum is None:
         logger.debug(
             f"Skipping time slice without database data for resource{'s' if len(resources) > 1 else ''} "
             + ", ".join([f"'{r.id}'" for r in resources]),
         )
-        return
+        return None
 
-    target_checksum = target.hash(resources, start, end)
+    target_checksum = target.hash(resources, start, end, method=method)
     if target_checksum == source_checksum:
         logger.debug(
             f"Skipping time slice without changed data for resource{'s' if len(resources) > 1 else ''} "
             + ", ".join([f"'{r.id}'" for r in resources])
         )
-        return
+        return None, source_checksum
 
     data = source.read(resources, start=start, end=end)
     if data is None or data.empty:  # not source.exists(resources, start=start, end=end):
@@ -323,8 +704,22 @@ def replicate_range(
             f"Skipping time slice without new data for resource{'s' if len(resources) > 1 else ''} "
             + ", ".join([f"'{r.id}'" for r in resources]),
         )
-        return
+        return None
+    return data, source_checksum
 
+
+def _commit_range(
+    source: Database,
+    target: Database,
+    resources: Resources,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    data: pd.DataFrame,
+    source_checksum: str,
+    force: bool = False,
+    method: Optional[str] = None,
+) -> None:
+    logger = logging.getLogger(Replication.__module__)
     logger.debug(
         f"Copying {len(data)} values of resource{'s' if len(resources) > 1 else ''} "
         + ", ".join([f"'{r.id}'" for r in resources])
@@ -333,7 +728,7 @@ def replicate_range(
     )
 
     target.write(data)
-    target_checksum = target.hash(resources, start, end)
+    target_checksum = target.hash(resources, start, end, method=method)
     if target_checksum != source_checksum:
         if force:
             target.delete(resources, start, end)
@@ -355,3 +750,23 @@ def replicate_range(
         + f" from {start.strftime('%d.%m.%Y (%H:%M:%S)')}"
         + f" to {end.strftime('%d.%m.%Y (%H:%M:%S)')}"
     )
+
+
+def _get_checksum_method(source: Database, target: Database) -> str:
+    # Databases generating checksums server-side only support textual hashes, while binary hashes of data
+    # read into memory avoid formatting it as text
+    if type(source).hash is not Database.hash or type(target).hash is not Database.hash:
+        return "MD5"
+    return "BLAKE2B"
+
+
+def _has_checksums(source: Database, target: Database) -> bool:
+    return (
+        source.checksums is not None
+        and target.checksums is not None
+        and source.checksums.method == target.checksums.method
+    )
+
+
+def _build_key(source: Database, resources: Resources) -> str:
+    return f"{source.id}:{hash_value(','.join(sorted(resources.ids)), 'MD5')}"
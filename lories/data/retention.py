@@ -8,15 +8,19 @@ lories.data.retention
 
 from __future__ import annotations
 
+import json
 import logging
-from typing import Any, Dict, Iterable, Iterator, MutableSequence, Optional
+import os
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, MutableSequence, Optional
 
 import tzlocal
 
 import pandas as pd
 import pytz as tz
 from lories import ConfigurationError, Configurations, Resource, ResourceError, Resources
-from lories.data.util import hash_data, resample
+from lories.connectors import Database
+from lories.data.util import hash_data, hash_value, resample
 from lories.util import floor_date, parse_freq, slice_range, to_bool, to_timedelta, to_timezone
 
 # FIXME: Remove this once Python >= 3.9 is a requirement
@@ -128,118 +132,13 @@ class Retention:
             and self.resample is not None
         )
 
-    # noinspection PyProtectedMember, PyTypeChecker, PyShadowingBuiltins
     def aggregate(self, resources: Resources, full: bool = False) -> None:
         if not self.enabled:
             raise RetentionException("Retention aggregation disabled")
+        Retentions(self).aggregate(resources, full=full)
 
-        retain = floor_date(pd.Timestamp.now(tz=self.timezone) - to_timedelta(self.keep), freq=self.freq)
-
-        for database, database_resources in resources.groupby(lambda c: c.logger._connector):
-            for _, resample_resources in database_resources.groupby(lambda c: c.group):
-                start = database.read_first_index(resample_resources)
-                if start is not None and start == floor_date(start, freq=self.freq):
-                    start += pd.Timedelta(seconds=1)
-
-                end = database.read_last_index(resample_resources)
-                if end is not None:
-                    end = min(floor_date(end, freq=self.freq), retain)
-
-                if (any(t is None for t in [start, end]) or start >= end) and not full:
-                    self._logger.debug(
-                        f"Skip aggregating values of resource{'s' if len(resample_resources) > 1 else ''} "
-                        + ", ".join([f"'{r.id}'" for r in resample_resources])
-                        + " without any new values found"
-                    )
-                    continue
-
-                if end - start < to_timedelta(self.freq) and not full:
-                    self._logger.debug(
-                        f"Skip aggregating data of resource{'s' if len(resample_resources) > 1 else ''} "
-                        + ", ".join([f"'{r.id}'" for r in resample_resources])
-                        + f" to {end.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                    )
-                    continue
-
-                self._logger.debug(
-                    "Start aggregating data"
-                    + f" of resource{'s' if len(resample_resources) > 1 else ''} "
-                    + ", ".join([f"'{r.id}'" for r in resample_resources])
-                    + f" up to {end.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                )
-
-                resample_ranges = slice_range(start, end, timezone=self.timezone, freq=self.freq)
-                resample_ranges.reverse()
-                for resample_start, resample_end in resample_ranges:
-                    self._logger.debug(
-                        "Start resampling data"
-                        + f" of resource{'s' if len(resample_resources) > 1 else ''} "
-                        + ", ".join([f"'{r.id}'" for r in resample_resources])
-                        + f" from {resample_start.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                        + f" to {resample_end.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                    )
-
-                    data = database.read(resample_resources, start=resample_start, end=resample_end)
-                    if data is None or data.empty:
-                        self._logger.debug(
-                            "Skipping empty resampling range"
-                            + f" of resource{'s' if len(resample_resources) > 1 else ''} "
-                            + ", ".join([f"'{r.id}'" for r in resample_resources])
-                            + f" from {resample_start.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                            + f" to {resample_end.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                        )
-                        continue
-
-                    # errors = validate(data)
-                    # if not errors.empty:
-                    #     # TODO: Write detected errors into yaml file or smth similar
-                    #     self._logger.warning(
-                    #         f"Unable to aggregate data for resource{'s' if len(resample_resources) > 1 else ''} "
-                    #         + ", ".join([f"'{r.id}'" for r in resample_resources])
-                    #         + f"from {resample_start.strftime('%d.%m.%Y (%H:%M:%S)')} "
-                    #         + f"to {resample_end.strftime('%d.%m.%Y (%H:%M:%S)')} "
-                    #         + f"with {len(errors)} unprocessed errors"
-                    #     )
-                    #     print(errors)
-                    #     continue
-
-                    resampled_data = resample(data, self.resample, self.method)
-                    if hash_data(resampled_data) != hash_data(data):
-                        self._logger.debug(
-                            f"Starting to resample {len(data)} to {len(resampled_data)} values"
-                            + f" of resource{'s' if len(resample_resources) > 1 else ''} "
-                            + ", ".join([f"'{r.id}'" for r in resample_resources])
-                            + f" from {resample_start.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                            + f" to {resample_end.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                        )
-                        database.delete(resample_resources, start=resample_start, end=resample_end)
-                        database.write(resampled_data)
-
-                        self._logger.info(
-                            f"Resampled {len(data)} to {len(resampled_data)} values"
-                            + f" of resource{'s' if len(resample_resources) > 1 else ''} "
-                            + ", ".join([f"'{r.id}'" for r in resample_resources])
-                            + f" from {resample_start.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                            + f" to {resample_end.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                        )
-                    elif not not full:
-                        self._logger.debug(
-                            "Skipping already resampled range"
-                            + f" of resource{'s' if len(resample_resources) > 1 else ''} "
-                            + ", ".join([f"'{r.id}'" for r in resample_resources])
-                            + f" from {resample_start.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                            + f" to {resample_end.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                        )
-                    else:
-                        self._logger.debug(
-                            "Ending aggregation"
-                            + f" of resource{'s' if len(resample_resources) > 1 else ''} "
-                            + ", ".join([f"'{r.id}'" for r in resample_resources])
-                            + " as data is already resampled"
-                            + f" from {resample_start.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                            + f" to {resample_end.strftime('%d.%m.%Y (%H:%M:%S)')}"
-                        )
-                        break
+    def _get_retain(self, now: pd.Timestamp) -> pd.Timestamp:
+        return floor_date(now - to_timedelta(self.keep), freq=self.freq)
 
 
 class Retentions(MutableSequence[Retention]):
@@ -281,6 +180,34 @@ class Retentions(MutableSequence[Retention]):
     def contains(self, retention: Retention):
         return any(r == retention for r in self.__retentions)
 
+    # noinspection PyProtectedMember, PyTypeChecker
+    def aggregate(self, resources: Resources, full: bool = False) -> None:
+        """
+        Aggregate the values of resources for all retentions in a single pass.
+
+        Each slice is read once and resampled to the coarsest resolution of the retentions it is already old enough
+        for. Slices aggregated before are tracked for each database and skipped without being read, unless a full
+        aggregation is requested. Deletes and writes of consecutive resampled slices are batched into single calls.
+        """
+        retentions = Retentions(*[r for r in self if r.enabled])
+        retentions.sort()
+        if len(retentions) == 0:
+            return
+
+        def _get_retentions(resource: Resource) -> tuple:
+            resource_retentions = getattr(resource, "retentions", None)
+            if resource_retentions is None:
+                return tuple(retentions)
+            return tuple(r for r in retentions if r in resource_retentions)
+
+        for database, database_resources in resources.groupby(lambda c: c.logger._connector):
+            state = RetentionState.from_database(database)
+            for _, group_resources in database_resources.groupby(lambda c: c.group):
+                for group_retentions, resample_resources in group_resources.groupby(_get_retentions):
+                    if len(group_retentions) == 0:
+                        continue
+                    _aggregate(database, resample_resources, list(group_retentions), state, full=full)
+
     def sort(self) -> None:
         def order(freq: str) -> int:
             freq_val = "".join(s for s in freq if s.isnumeric())
@@ -304,8 +231,210 @@ class Retentions(MutableSequence[Retention]):
         self.__retentions = sorted(self.__retentions, key=lambda r: order(r.keep))
 
 
+class RetentionState:
+    """
+    Persistent state of the ranges already aggregated for each retention, in a JSON file for each database.
+
+    """
+
+    __slots__ = ("_lock", "_logger", "_state", "path")
+
+    _instances: Dict[str, RetentionState] = {}
+    _instances_lock: Lock = Lock()
+
+    _lock: Lock
+    _state: Dict[str, Dict[str, str]]
+
+    path: Optional[str]
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._lock = Lock()
+        self._logger = logging.getLogger(type(self).__module__)
+        self._state = {}
+        self.path = path
+        if path is not None:
+            self._load()
+
+    @classmethod
+    def from_database(cls, database: Database) -> RetentionState:
+        if database.configs is None:
+            return cls()
+        path = os.path.join(database.configs.dirs.data, ".retention", f"{database.id}.json")
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def get(self, resources: Resources, retention: Retention) -> Optional[pd.Timestamp]:
+        with self._lock:
+            aggregated = self._state.get(_build_key(resources), {}).get(_build_retention_key(retention), None)
+        return pd.Timestamp(aggregated) if aggregated is not None else None
+
+    def set(self, resources: Resources, retention: Retention, aggregated: pd.Timestamp) -> None:
+        with self._lock:
+            state = self._state.setdefault(_build_key(resources), {})
+            retention_key = _build_retention_key(retention)
+            if retention_key in state and pd.Timestamp(state[retention_key]) >= aggregated:
+                return
+            state[retention_key] = aggregated.isoformat()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                path = f"{self.path}.tmp"
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(self._state, file)
+                os.replace(path, self.path)
+
+            except IOError as e:
+                self._logger.warning(f"Unable to persist retention state to '{self.path}': {e}")
+
+    def _load(self) -> None:
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                self._state = json.load(file)
+        except (IOError, ValueError) as e:
+            self._logger.warning(f"Unable to load retention state from '{self.path}': {e}")
+
+
 class RetentionException(ResourceError):
     """
     Raise if an error occurred while processing retention policy.
 
     """
+
+
+# noinspection PyShadowingBuiltins
+def _aggregate(
+    database: Database,
+    resources: Resources,
+    retentions: List[Retention],
+    state: RetentionState,
+    full: bool = False,
+    batch: int = 31,
+) -> None:
+    logger = logging.getLogger(Retention.__module__)
+    now = pd.Timestamp.now(tz=retentions[0].timezone)
+    retains = [r._get_retain(now) for r in retentions]
+    freq = retentions[0].freq
+    timezone = retentions[0].timezone
+
+    def _get_retention(end: pd.Timestamp) -> Optional[Retention]:
+        # Resample slices to the coarsest resolution of the retentions they are old enough for
+        retention = None
+        for _retention, _retain in zip(retentions, retains):
+            if end <= _retain:
+                retention = _retention
+        return retention
+
+    start = database.read_first_index(resources)
+    if start is not None and start == floor_date(start, freq=freq):
+        start += pd.Timedelta(seconds=1)
+
+    end = database.read_last_index(resources)
+    if end is not None:
+        end = min(floor_date(end, freq=freq), retains[0])
+
+    if any(t is None for t in [start, end]) or start >= end or (end - start < to_timedelta(freq) and not full):
+        logger.debug(
+            f"Skip aggregating values of resource{'s' if len(resources) > 1 else ''} "
+            + ", ".join([f"'{r.id}'" for r in resources])
+            + " without any new values found"
+        )
+        return
+
+    aggregated = {r: state.get(resources, r) for r in retentions}
+    resample_ranges = []
+    for resample_start, resample_end in slice_range(start, end, timezone=timezone, freq=freq):
+        retention = _get_retention(resample_end)
+        if retention is None:
+            continue
+        if not full and aggregated[retention] is not None and aggregated[retention] >= resample_end:
+            continue
+        resample_ranges.append((resample_start, resample_end, retention))
+    if len(resample_ranges) == 0:
+        logger.debug(
+            f"Skip aggregating values of resource{'s' if len(resources) > 1 else ''} "
+            + ", ".join([f"'{r.id}'" for r in resources])
+            + " already aggregated"
+        )
+        return
+
+    logger.debug(
+        "Start aggregating data"
+        + f" of resource{'s' if len(resources) > 1 else ''} "
+        + ", ".join([f"'{r.id}'" for r in resources])
+        + f" up to {end.strftime('%d.%m.%Y (%H:%M:%S)')}"
+    )
+
+    pending = []
+
+    def _flush() -> None:
+        changed = [(s, e, d) for s, e, _, d in pending if d is not None]
+        if len(changed) > 0:
+            changed_start = changed[0][0]
+            changed_end = changed[-1][1]
+            changed_data = pd.concat([d for _, _, d in changed], axis="index")
+
+            database.delete(resources, start=changed_start, end=changed_end)
+            database.write(changed_data)
+
+            logger.info(
+                f"Resampled {len(changed)} slice{'s' if len(changed) > 1 else ''} to {len(changed_data)} values"
+                + f" of resource{'s' if len(resources) > 1 else ''} "
+                + ", ".join([f"'{r.id}'" for r in resources])
+                + f" from {changed_start.strftime('%d.%m.%Y (%H:%M:%S)')}"
+                + f" to {changed_end.strftime('%d.%m.%Y (%H:%M:%S)')}"
+            )
+        for _, pending_end, pending_retention, _ in pending:
+            state.set(resources, pending_retention, pending_end)
+        pending.clear()
+
+    resample_data = database.read_many([(resources, s, e) for s, e, _ in resample_ranges])
+    try:
+        for (resample_start, resample_end, retention), data in zip(resample_ranges, resample_data):
+            resampled_data = None
+            if data is not None and not data.empty:
+                resampled_data = resample(data, retention.resample, retention.method)
+                if _is_resampled(data, resampled_data):
+                    logger.debug(
+                        "Skipping already resampled range"
+                        + f" of resource{'s' if len(resources) > 1 else ''} "
+                        + ", ".join([f"'{r.id}'" for r in resources])
+                        + f" from {resample_start.strftime('%d.%m.%Y (%H:%M:%S)')}"
+                        + f" to {resample_end.strftime('%d.%m.%Y (%H:%M:%S)')}"
+                    )
+                    resampled_data = None
+
+            # Batch consecutive changed slices only, to delete their values at once without
+            # deleting the values of unchanged slices in between
+            if len(pending) > 0 and (
+                len(pending) >= batch
+                or resample_start - pending[-1][1] > pd.Timedelta(seconds=1)
+                or (resampled_data is None and pending[-1][3] is not None)
+            ):
+                _flush()
+            pending.append((resample_start, resample_end, retention, resampled_data))
+        _flush()
+    finally:
+        state.save()
+
+
+def _is_resampled(data: pd.DataFrame, resampled_data: pd.DataFrame) -> bool:
+    # Compare the indices first, to avoid hashing data with a different resolution
+    if len(data) != len(resampled_data) or not data.index.equals(resampled_data.index):
+        return False
+    return hash_data(resampled_data, method="BLAKE2B") == hash_data(data, method="BLAKE2B")
+
+
+def _build_key(resources: Resources) -> str:
+    return hash_value(",".join(sorted(resources.ids)), "MD5")
+
+
+def _build_retention_key(retention: Retention) -> str:
+    return f"{retention.resample}:{retention.method}"
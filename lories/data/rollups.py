@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+lories.data.rollups
+~~~~~~~~~~~~~~~~~~~
+
+
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from threading import Lock
+from typing import Callable, Collection, Dict, Iterator, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+import pytz as tz
+from lories.core import Configurations, Resources
+from lories.core.configs import ConfigurationError
+from lories.core.typing import Timestamp
+from lories.util import floor_date, parse_freq, to_date, to_timedelta
+
+# FIXME: Remove this once Python >= 3.9 is a requirement
+try:
+    from typing import Literal
+
+except ImportError:
+    from typing_extensions import Literal
+
+ROLLUP_AGGREGATES: List[str] = ["min", "max", "sum", "count", "last"]
+
+
+class DatabaseRollups:
+    """
+    Continuous rollups of a database, maintaining aggregates of written values at several resolutions.
+
+    For each resource and resolution, the minimum, maximum, sum, count and last value of every bucket are kept, from
+    which any aggregation of :func:`lories.data.util.resample` can be served without reading the raw values. Buckets
+    are labeled by their right edge and include it, like resampled values. Writes appending values after the last
+    known index of a resource update the aggregates incrementally, while other writes and deletes remove the affected
+    buckets, to be rebuilt from the raw values on the next read. Aggregates are persisted for each resolution, when
+    the database gets disconnected.
+
+    """
+
+    __slots__ = ("_lock", "_logger", "_rollups", "_dirty", "_version", "directory", "freqs", "timezone")
+
+    _lock: Lock
+    _rollups: Dict[str, Dict[str, pd.DataFrame]]
+    _dirty: Set[str]
+    _version: int
+
+    directory: Optional[str]
+    freqs: List[str]
+    timezone: tz.BaseTzInfo
+
+    def __init__(
+        self,
+        freqs: Collection[str] = ("h", "D"),
+        timezone: tz.BaseTzInfo = tz.UTC,
+        directory: Optional[str] = None,
+    ) -> None:
+        self._lock = Lock()
+        self._logger = logging.getLogger(type(self).__module__)
+        self._dirty = set()
+        self._version = 0
+
+        self.freqs = sorted({_validate_freq(f) for f in freqs}, key=lambda f: to_timedelta(f))
+        self.timezone = timezone
+        self._rollups = {freq: {} for freq in self.freqs}
+
+        self.directory = directory
+        if directory is not None:
+            self._load()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(freqs=[{', '.join(self.freqs)}])"
+
+    @classmethod
+    def from_configs(cls, configs: Configurations, key: str, timezone: tz.BaseTzInfo) -> Optional[DatabaseRollups]:
+        if not configs.has_member("rollups"):
+            return None
+        rollup_configs = configs.get_member("rollups")
+        if not rollup_configs.enabled:
+            return None
+
+        freqs = rollup_configs.get("freq", default=["h", "D"])
+        if isinstance(freqs, str):
+            freqs = [f.strip() for f in freqs.split(",") if len(f.strip()) > 0]
+        if len(freqs) == 0:
+            raise ConfigurationError("Missing rollup frequencies")
+
+        directory = rollup_configs.get("path", default=os.path.join(configs.dirs.data, ".rollups"))
+        if "~" in directory:
+            directory = os.path.expanduser(directory)
+        if not os.path.isabs(directory):
+            directory = os.path.join(configs.dirs.data, directory)
+        return cls(freqs=freqs, timezone=timezone, directory=os.path.join(directory, key))
+
+    def get_freq(self, freq: str) -> Optional[str]:
+        """
+        Get the coarsest rollup resolution, the passed frequency can be aggregated from.
+
+        Returns None, if the frequency is not a day, or evenly divides a day, and is a multiple of a rollup.
+        """
+        try:
+            freq = _validate_freq(freq)
+        except ConfigurationError:
+            return None
+        delta = to_timedelta(freq)
+        for rollup_freq in reversed(self.freqs):
+            if delta % to_timedelta(rollup_freq) == pd.Timedelta(0):
+                return rollup_freq
+        return None
+
+    def read(
+        self,
+        resources: Resources,
+        freq: str,
+        start: Timestamp,
+        end: Timestamp,
+        read: Callable[[Resources, pd.Timestamp, pd.Timestamp], pd.DataFrame],
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Read the aggregates of resources in a range, at the passed frequency.
+
+        Buckets missing in the rollup are read at once with the passed read function and kept for subsequent reads.
+        Partial buckets at the boundaries of the range are aggregated from their raw values.
+
+        Returns None, if the frequency can not be served from any rollup.
+        """
+        rollup_freq = self.get_freq(freq)
+        if rollup_freq is None:
+            return None
+        freq = parse_freq(freq)
+        start = to_date(start, timezone=self.timezone)
+        end = to_date(end, timezone=self.timezone)
+        if freq != "D" and any(d.utcoffset() % to_timedelta(freq) != pd.Timedelta(0) for d in [start, end]):
+            # Buckets below a day are aligned in UTC and do not match the buckets of timezones offset by a fraction
+            return None
+
+        # Only buckets entirely within the range can be served from the rollup
+        first = _ceil_date(start, self.timezone, rollup_freq) + to_timedelta(rollup_freq)
+        last = floor_date(end, self.timezone, freq=rollup_freq)
+        if first > last:
+            data = read(resources, start, end)
+            return {r.id: combine_aggregates(_aggregate(_get_column(data, r.id), freq), None) for r in resources}
+
+        head = read(resources, start, first - to_timedelta(rollup_freq))
+        tail = read(resources, last, end)
+        tail = tail[tail.index > last] if not tail.empty else tail
+
+        with self._lock:
+            version = self._version
+            rollups = self._rollups[rollup_freq]
+            labels = list(_iter_labels(first, last, self.timezone, rollup_freq))
+            missing = [
+                label for label in labels if any(label not in _get_rollup(rollups, r.id).index for r in resources)
+            ]
+
+        # Missing buckets are read without holding the lock, as the read function acquires the lock of the database,
+        # which holds it while invalidating rollups on deletes
+        missing_aggregates = {r.id: [] for r in resources}
+        for missing_first, missing_last in _group_labels(missing, self.timezone, rollup_freq):
+            missing_start = missing_first - to_timedelta(rollup_freq)
+            missing_data = read(resources, missing_start, missing_last)
+            if not missing_data.empty:
+                missing_data = missing_data[missing_data.index > missing_start]
+
+            missing_labels = list(_iter_labels(missing_first, missing_last, self.timezone, rollup_freq))
+            for resource in resources:
+                resource_aggregates = _aggregate(_get_column(missing_data, resource.id), rollup_freq)
+                missing_aggregates[resource.id].append(_fill(resource_aggregates, missing_labels))
+
+        aggregates = {}
+        with self._lock:
+            rollups = self._rollups[rollup_freq]
+            for resource in resources:
+                rollup = _get_rollup(rollups, resource.id)
+                resource_aggregates = _concat(*missing_aggregates[resource.id])
+                if not resource_aggregates.empty:
+                    resource_aggregates = resource_aggregates[~resource_aggregates.index.isin(rollup.index)]
+                    rollup = _merge(rollup, resource_aggregates)
+
+                    # Buckets read while values were written or deleted may already be outdated and are not kept
+                    if version == self._version:
+                        rollups[resource.id] = rollup
+                        self._dirty.add(rollup_freq)
+
+                rollup = rollup[(rollup.index >= first) & (rollup.index <= last)]
+                aggregates[resource.id] = _concat(
+                    _aggregate(_get_column(head, resource.id), freq),
+                    combine_aggregates(rollup, freq) if freq != rollup_freq else rollup,
+                    _aggregate(_get_column(tail, resource.id), freq),
+                )
+
+        return {id: combine_aggregates(a, None) for id, a in aggregates.items()}
+
+    def update(self, data: pd.DataFrame, indices: Dict[str, Optional[pd.Timestamp]]) -> None:
+        """
+        Update the rollups of the written values, with the last index of each resource known before the write.
+
+        Values of resources without a known last index, or not written after it, invalidate the affected buckets.
+        """
+        data = data.select_dtypes(include="number").dropna(axis="columns", how="all")
+        if data.empty:
+            return
+        data.index = data.index.tz_convert(self.timezone)
+
+        with self._lock:
+            self._version += 1
+            for column in data.columns:
+                column_data = data[column].dropna()
+                if len(column_data) == 0:
+                    continue
+
+                if column not in indices or (indices[column] is not None and column_data.index[0] <= indices[column]):
+                    self.__invalidate(column, column_data.index[0], column_data.index[-1])
+                    continue
+
+                for freq, rollups in self._rollups.items():
+                    rollup = _get_rollup(rollups, column)
+                    aggregates = _aggregate(column_data, freq)
+
+                    last = indices[column]
+                    if last is not None:
+                        last_label = _ceil_date(to_date(last, timezone=self.timezone), self.timezone, freq)
+                        if last_label in rollup.index:
+                            # Buckets between the last known and the appended values are known to be empty
+                            labels = _iter_labels(last_label, aggregates.index[-1], self.timezone, freq)
+                            aggregates = _fill(aggregates, labels)
+                        aggregates = aggregates[(aggregates.index > last_label) | aggregates.index.isin(rollup.index)]
+                    if aggregates.empty:
+                        continue
+                    rollups[column] = _merge(rollup, aggregates)
+                    self._dirty.add(freq)
+
+    def invalidate(
+        self,
+        resources: Optional[Resources] = None,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+    ) -> None:
+        """
+        Remove all buckets of the resources overlapping the passed range.
+        """
+        start = to_date(start, timezone=self.timezone)
+        end = to_date(end, timezone=self.timezone)
+        with self._lock:
+            self._version += 1
+            for freq, rollups in self._rollups.items():
+                ids = resources.ids if resources is not None else list(rollups.keys())
+                for id in ids:
+                    self.__invalidate(id, start, end, freqs=[freq])
+
+    def __invalidate(
+        self,
+        id: str,
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp],
+        freqs: Optional[Collection[str]] = None,
+    ) -> None:
+        for freq in freqs if freqs is not None else self.freqs:
+            rollups = self._rollups[freq]
+            if id not in rollups:
+                continue
+            rollup = rollups[id]
+            overlapping = pd.Series(True, index=rollup.index)
+            if start is not None:
+                overlapping &= rollup.index >= _ceil_date(start, self.timezone, freq)
+            if end is not None:
+                overlapping &= rollup.index <= _ceil_date(end, self.timezone, freq)
+            if overlapping.any():
+                rollups[id] = rollup[~overlapping]
+                self._dirty.add(freq)
+
+    def save(self) -> None:
+        with self._lock:
+            if self.directory is None:
+                return
+            for freq in list(self._dirty):
+                path = os.path.join(self.directory, f"{freq}.pkl")
+                try:
+                    os.makedirs(self.directory, exist_ok=True)
+                    pd.to_pickle(self._rollups[freq], f"{path}.tmp")
+                    os.replace(f"{path}.tmp", path)
+                    self._dirty.discard(freq)
+
+                except IOError as e:
+                    self._logger.warning(f"Unable to persist rollups to '{path}': {e}")
+
+    def _load(self) -> None:
+        for freq in self.freqs:
+            path = os.path.join(self.directory, f"{freq}.pkl")
+            if not os.path.isfile(path):
+                continue
+            try:
+                self._rollups[freq] = pd.read_pickle(path)
+            except (IOError, ValueError, EOFError) as e:
+                self._logger.warning(f"Unable to load rollups from '{path}': {e}")
+
+
+def to_resampled(
+    aggregates: pd.DataFrame,
+    method: Literal["sum", "mean", "min", "max", "last"],
+) -> pd.Series:
+    if method == "mean":
+        data = aggregates["sum"] / aggregates["count"]
+    elif method in ["sum", "min", "max", "last"]:
+        data = aggregates[method]
+    else:
+        raise ValueError(f"Invalid resampling function '{method}'")
+    return data[aggregates["count"] > 0]
+
+
+def _validate_freq(freq: str) -> str:
+    try:
+        freq = parse_freq(freq)
+        delta = to_timedelta(freq)
+    except ValueError:
+        raise ConfigurationError(f"Invalid rollup frequency '{freq}'")
+
+    # Buckets of frequencies evenly dividing a day are aligned the same way when resampling, regardless of the origin
+    if not isinstance(delta, pd.Timedelta) or (freq != "D" and pd.Timedelta(days=1) % delta != pd.Timedelta(0)):
+        raise ConfigurationError(f"Invalid rollup frequency '{freq}', not evenly dividing a day")
+    return freq
+
+
+def _ceil_date(date: pd.Timestamp, timezone: tz.BaseTzInfo, freq: str) -> pd.Timestamp:
+    floor = floor_date(date, timezone, freq=freq)
+    return floor if floor == date else floor_date(floor + to_timedelta(freq), timezone, freq=freq)
+
+
+def _ceil_index(index: pd.DatetimeIndex, freq: str) -> pd.DatetimeIndex:
+    if freq == "D":
+        return index.ceil(freq)
+    # Frequencies below a day are aligned in absolute time, independent of daylight saving time
+    return index.tz_convert(tz.UTC).ceil(freq).tz_convert(index.tz)
+
+
+def _iter_labels(
+    first: pd.Timestamp,
+    last: pd.Timestamp,
+    timezone: tz.BaseTzInfo,
+    freq: str,
+) -> Iterator[pd.Timestamp]:
+    label = first
+    while label <= last:
+        yield label
+        label = floor_date(label + to_timedelta(freq), timezone, freq=freq)
+
+
+def _group_labels(labels: List[pd.Timestamp], timezone: tz.BaseTzInfo, freq: str) -> List[tuple]:
+    groups = []
+    for label in labels:
+        if len(groups) > 0 and floor_date(groups[-1][1] + to_timedelta(freq), timezone, freq=freq) == label:
+            groups[-1] = (groups[-1][0], label)
+        else:
+            groups.append((label, label))
+    return groups
+
+
+def _get_column(data: pd.DataFrame, column: str) -> pd.Series:
+    if data is None or data.empty or column not in data.columns:
+        return pd.Series(dtype=float)
+    return data[column].dropna()
+
+
+def _get_rollup(rollups: Dict[str, pd.DataFrame], id: str) -> pd.DataFrame:
+    if id not in rollups:
+        return _empty()
+    return rollups[id]
+
+
+def _empty(labels: Collection[pd.Timestamp] = ()) -> pd.DataFrame:
+    labels = pd.DatetimeIndex(list(labels))
+    return pd.DataFrame(
+        {
+            "min": np.full(len(labels), np.nan),
+            "max": np.full(len(labels), np.nan),
+            "sum": np.zeros(len(labels)),
+            "count": np.zeros(len(labels), dtype=int),
+            "last": np.full(len(labels), np.nan),
+        },
+        index=labels,
+    )
+
+
+def _concat(*aggregates: pd.DataFrame) -> pd.DataFrame:
+    aggregates = [a for a in aggregates if not a.empty]
+    if len(aggregates) == 0:
+        return _empty()
+    if len(aggregates) == 1:
+        return aggregates[0]
+    return pd.concat(aggregates, axis="index")
+
+
+def _aggregate(data: pd.Series, freq: str) -> pd.DataFrame:
+    if len(data) == 0:
+        return _empty()
+    labels = _ceil_index(data.index, freq)
+    grouped = data.groupby(labels, sort=True)
+    return pd.DataFrame(
+        {
+            "min": grouped.min(),
+            "max": grouped.max(),
+            "sum": grouped.sum(),
+            "count": grouped.count(),
+            "last": grouped.last(),
+        }
+    )
+
+
+def _fill(aggregates: pd.DataFrame, labels: Iterator[pd.Timestamp]) -> pd.DataFrame:
+    labels = [label for label in labels if label not in aggregates.index]
+    if len(labels) == 0:
+        return aggregates
+    return _concat(aggregates, _empty(labels)).sort_index(kind="stable")
+
+
+def combine_aggregates(aggregates: pd.DataFrame, freq: Optional[str] = None) -> pd.DataFrame:
+    if aggregates.empty:
+        return aggregates
+    labels = aggregates.index if freq is None else _ceil_index(aggregates.index, freq)
+    grouped = aggregates.groupby(labels, sort=True)
+    return pd.DataFrame(
+        {
+            "min": grouped["min"].min(),
+            "max": grouped["max"].max(),
+            "sum": grouped["sum"].sum(),
+            "count": grouped["count"].sum(),
+            "last": grouped["last"].last(),
+        }
+    )
+
+
+def _merge(rollup: pd.DataFrame, aggregates: pd.DataFrame) -> pd.DataFrame:
+    if rollup.empty:
+        return aggregates.astype({"count": int})
+    # Aggregates of the same bucket are combined in order, as appended values are always more recent
+    return combine_aggregates(_concat(rollup, aggregates), None).astype({"count": int})
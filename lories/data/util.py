@@ -11,7 +11,7 @@ from __future__ import annotations
 import hashlib
 import re
 from copy import copy, deepcopy
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -25,13 +25,33 @@ try:
 except ImportError:
     from typing_extensions import Literal
 
+try:
+    import xxhash
+
+except ImportError:
+    xxhash = None
+
+BINARY_HASH_METHODS = ["blake2b", "xxh3"]
+
+AGGREGATE_METHODS = ["min", "max", "sum", "count"]
+
 
 # noinspection PyShadowingBuiltins
 def hash_data(
     data: pd.DataFrame,
-    method: Literal["MD5", "SHA1", "SHA256", "SHA512"] = "MD5",
+    method: Literal["MD5", "SHA1", "SHA256", "SHA512", "BLAKE2B", "XXH3"] = "MD5",
     encoding: str = "UTF-8",
 ) -> str:
+    """
+    Generate a checksum of the data, independent of its dtypes and the timezone of its index.
+
+    Textual methods like ``MD5`` hash the data formatted as CSV, matching the hashes generated server-side by
+    databases like SQL or InfluxDB. Binary methods like ``BLAKE2B`` or ``XXH3`` hash the data as NumPy buffers
+    instead, which avoids formatting the data as text and should be preferred when hashing data in memory.
+    """
+    if method.lower() in BINARY_HASH_METHODS:
+        return _hash_binary(data, method.lower())
+
     index_column = data.index.name if data.index is not None else "index"
     data_columns = data.columns
     data = deepcopy(data)
@@ -47,9 +67,69 @@ def hash_data(
     return hash_value(csv, method, encoding)
 
 
+def _hash_binary(data: pd.DataFrame, method: str) -> str:
+    # Rows without any values are skipped, like empty lines of textual hashes
+    data = data.dropna(axis="index", how="all")
+
+    hashes = [_hash_array(_to_epoch(data.index))]
+    for column in data.columns:
+        hashes.append(_hash_column(data[column]))
+
+    hashes = np.column_stack(hashes).astype("<u8")
+    digest = _get_digest(method)
+    digest.update(np.array(hashes.shape, dtype="<i8").tobytes())
+    digest.update(np.ascontiguousarray(hashes).tobytes())
+    return digest.hexdigest()
+
+
+def _hash_column(column: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+        return _hash_array(_to_epoch(pd.DatetimeIndex(column)))
+    if pd.api.types.is_bool_dtype(column.dtype) or pd.api.types.is_numeric_dtype(column.dtype):
+        # Compare numeric values independent of their dtype, e.g. to match float32 and float64 storage
+        return _hash_array(_normalize_floats(column.to_numpy(dtype="float64", na_value=np.nan)))
+
+    values = column.astype(object)
+    values = values.where(values.notna(), None)
+    return pd.util.hash_pandas_object(values, index=False, categorize=True).to_numpy()
+
+
+def _hash_array(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy()
+
+
+def _to_epoch(index: pd.DatetimeIndex) -> np.ndarray:
+    if index.tzinfo is None:
+        index = index.tz_localize(tz.UTC)
+    return index.tz_convert(tz.UTC).values.astype("datetime64[ns]").view(np.int64)
+
+
+def _normalize_floats(values: np.ndarray) -> np.ndarray:
+    # Round values to 10 significant digits, like the float format of textual hashes, and drop the sign of zeros
+    values = values.copy()
+    finite = np.isfinite(values) & (values != 0)
+    with np.errstate(over="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values[finite])))
+        scale = np.power(10.0, 9 - magnitude)
+        rounded = np.round(values[finite] * scale) / scale
+    values[finite] = np.where(np.isfinite(rounded), rounded, values[finite])
+    values[values == 0] = 0.0
+    return values
+
+
+def _get_digest(method: str) -> Any:
+    if method == "blake2b":
+        return hashlib.blake2b(digest_size=16)
+    if method == "xxh3":
+        if xxhash is None:
+            raise ValueError("Checksum method 'XXH3' requires the xxhash package to be installed")
+        return xxhash.xxh3_128()
+    raise ValueError(f"Invalid checksum method '{method}'")
+
+
 def hash_value(
     value: str,
-    method: Literal["MD5", "SHA1", "SHA256", "SHA512"],
+    method: Literal["MD5", "SHA1", "SHA256", "SHA512", "BLAKE2B", "XXH3"],
     encoding: str = "UTF-8",
 ) -> str:
     method = method.lower()
@@ -61,6 +141,10 @@ def hash_value(
         return hashlib.sha256(value.encode(encoding)).hexdigest()
     if method == "sha512":
         return hashlib.sha512(value.encode(encoding)).hexdigest()
+    if method in BINARY_HASH_METHODS:
+        digest = _get_digest(method)
+        digest.update(value.encode(encoding))
+        return digest.hexdigest()
     raise ValueError(f"Invalid checksum method '{method}'")
 
 
@@ -9,11 +9,68 @@ lories.data.validation
 from __future__ import annotations
 
 import datetime as dt
+from typing import Any, Optional
 
 import pandas as pd
+import pytz as tz
 from lories._core.typing import Timezone  # noqa
 from lories.core.errors import ResourceError  # noqa
 
+try:
+    import pyarrow as pa
+
+except ImportError:
+    pa = None
+
+
+def is_arrow(data: Any) -> bool:
+    return pa is not None and isinstance(data, (pa.Table, pa.RecordBatch))
+
+
+# noinspection PyUnresolvedReferences
+def validate_arrow(data: pa.Table | pa.RecordBatch, timezone: Optional[Timezone] = None) -> pd.DataFrame:
+    """
+    Convert Arrow data to a pandas frame, after converting the timezone of all timestamp columns natively.
+
+    As the timezone of Arrow timestamps is only part of the column type, conversions do not touch the values,
+    and the data is copied only once, when converted to pandas. Timestamps without timezone are expected to be UTC.
+    The index will be restored from the pandas schema metadata if available, or set to the timestamp column.
+    """
+    if isinstance(data, pa.RecordBatch):
+        data = pa.Table.from_batches([data])
+    if timezone is None:
+        timezone = tz.UTC
+
+    for index, field in enumerate(data.schema):
+        if not pa.types.is_timestamp(field.type):
+            continue
+        column = data.column(index)
+        if field.type.tz is None:
+            column = column.cast(pa.timestamp(field.type.unit, tz="UTC"))
+        column_type = pa.timestamp(field.type.unit, tz=str(timezone))
+        data = data.set_column(index, field.with_type(column_type), column.cast(column_type))
+
+    index_column = _get_arrow_index(data)
+    data = data.to_pandas(split_blocks=True)
+    if index_column is not None:
+        data = data.set_index(index_column)
+    return data
+
+
+# noinspection PyUnresolvedReferences
+def _get_arrow_index(data: pa.Table) -> Optional[str]:
+    metadata = data.schema.pandas_metadata
+    if metadata is not None and any(isinstance(c, str) for c in metadata.get("index_columns", [])):
+        # The index will be restored by pandas itself
+        return None
+    timestamps = [f.name for f in data.schema if pa.types.is_timestamp(f.type)]
+    for name in timestamps:
+        if name.lower() in ["timestamp", "time", "_time", "datetime", "index"]:
+            return name
+    if len(timestamps) > 0:
+        return timestamps[0]
+    return None
+
 
 def validate_index(data: pd.DataFrame | pd.Series) -> pd.DataFrame | pd.Series:
     if not isinstance(data.index, pd.DatetimeIndex):
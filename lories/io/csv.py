@@ -9,14 +9,47 @@ lories.io.csv
 from __future__ import annotations
 
 import glob
+import io
 import os
-from typing import List, Mapping, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Collection, Dict, Iterator, List, Mapping, Optional, Tuple
 
 import pandas as pd
 import pytz as tz
 from lories.core.errors import ResourceError
 from lories.typing import Timestamp, Timezone
-from lories.util import ceil_date, floor_date, to_date, to_timedelta
+from lories.util import floor_date, to_date, to_timedelta
+
+
+class CsvTail:
+    """
+    Header columns and last index of a CSV file, valid as long as the modification time and size of the file match.
+
+    """
+
+    __slots__ = ("stat", "columns", "index")
+
+    stat: Tuple[int, int]
+    columns: List[str]
+    index: pd.Timestamp
+
+    def __init__(self, stat: Tuple[int, int], columns: List[str], index: pd.Timestamp) -> None:
+        self.stat = stat
+        self.columns = columns
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(index={self.index}, columns={self.columns})"
+
+
+_tails: OrderedDict[str, CsvTail] = OrderedDict()
+_tails_lock = Lock()
+_tails_limit = 1024
+
+_filenames: Dict[Tuple[str, str, str], Tuple[int, List[str]]] = {}
+_filenames_lock = Lock()
 
 
 # noinspection PyShadowingBuiltins
@@ -40,23 +73,43 @@ def read_files(
     start: Optional[Timestamp | str] = None,
     end: Optional[Timestamp | str] = None,
     timezone: Optional[Timezone] = None,
+    cache: Optional[CsvFileCache] = None,
+    workers: Optional[int] = None,
     **kwargs,
 ) -> pd.DataFrame:
+    """
+    Reads the content of the CSV files of a directory in a range.
+
+    Several files are parsed concurrently and concatenated once, after all files were read.
+
+    :param cache:
+        the cache of parsed files to read unchanged files from, if not None.
+    :type cache:
+        :class:`lories.io.csv.CsvFileCache`
+
+    :param workers:
+        the maximum number of files to parse concurrently, or None to use the number of processors.
+    :type workers:
+        int
+    """
     data = pd.DataFrame()
     start = to_date(start, timezone)
     end = to_date(end, timezone)
+    _read_file = cache.read if cache is not None else read_file
 
     files = get_files(path, freq, format, start, end, timezone)
     if len(files) == 0:
         return data
     elif len(files) == 1:
-        data = read_file(files[0], timezone=timezone, **kwargs)
+        data = _read_file(files[0], timezone=timezone, **kwargs)
     else:
-        for file in get_files(path, freq, format, start, end, timezone):
-            if not data.empty and (end is not None and data.index[-1] > end):
-                break
-            file_data = read_file(file, timezone=timezone, **kwargs)
-            data = pd.concat([data, file_data], axis="index")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max(min(workers, len(files)), 1)) as executor:
+            files_data = list(executor.map(lambda f: _read_file(f, timezone=timezone, **kwargs), files))
+        files_data = [d for d in files_data if not d.empty]
+        if len(files_data) > 0:
+            data = pd.concat(files_data, axis="index")
 
     if data.empty:
         return data
@@ -67,6 +120,93 @@ def read_files(
     return data
 
 
+# noinspection PyShadowingBuiltins
+def iter_files(
+    path: str,
+    freq: str,
+    format: str,
+    start: Optional[Timestamp | str] = None,
+    end: Optional[Timestamp | str] = None,
+    timezone: Optional[Timezone] = None,
+    chunksize: Optional[int] = None,
+    cache: Optional[CsvFileCache] = None,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Iterates the content of the CSV files of a directory in time order, one file or chunk of lines at a time.
+
+    :param chunksize:
+        the number of lines to read at once, or None to read each file as a whole.
+    :type chunksize:
+        int
+
+    :param cache:
+        the cache of parsed files to read whole files from, if not None.
+    :type cache:
+        :class:`lories.io.csv.CsvFileCache`
+    """
+    start = to_date(start, timezone)
+    end = to_date(end, timezone)
+    _read_file = cache.read if cache is not None else read_file
+
+    for file in get_files(path, freq, format, start, end, timezone):
+        if chunksize is None:
+            file_chunks = [_read_file(file, timezone=timezone, **kwargs)]
+        else:
+            file_chunks = read_file_chunks(file, chunksize, timezone=timezone, **kwargs)
+        for data in file_chunks:
+            if data.empty:
+                continue
+            if not pd.isna(start):
+                data = data.loc[data.index >= start, :]
+            if not pd.isna(end):
+                if data.index[0] > end:
+                    return
+                data = data.loc[data.index <= end, :]
+            if not data.empty:
+                yield data
+
+
+def read_file_chunks(
+    path: str,
+    chunksize: int,
+    index_column: str = "Timestamp",
+    index_type: str = "Timestamp",
+    timezone: Optional[tz.tzinfo] = None,
+    separator: str = ",",
+    decimal: str = ".",
+    rename: Optional[Mapping[str, str]] = None,
+    encoding: str = "utf-8-sig",
+    usecols: Optional[Collection[str]] = None,
+    dtype: Optional[Mapping[str, Any]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads the content of a specified CSV file in chunks of lines, to avoid holding large files in memory.
+
+    :param chunksize:
+        the number of lines to read at once.
+    :type chunksize:
+        int
+
+    :returns:
+        the retrieved columns of each chunk, indexed by their timestamp
+    :rtype:
+        :class:`pandas.DataFrame`
+    """
+    usecols, dtype = _get_columns(path, index_column, separator, encoding, usecols, dtype)
+    with pd.read_csv(
+        path,
+        sep=separator,
+        decimal=decimal,
+        encoding=encoding,
+        usecols=usecols,
+        dtype=dtype,
+        chunksize=chunksize,
+    ) as reader:
+        for data in reader:
+            yield _parse_data(data, index_column, index_type, timezone, rename)
+
+
 def read_file(
     path: str,
     index_column: str = "Timestamp",
@@ -76,6 +216,9 @@ def read_file(
     decimal: str = ".",
     rename: Optional[Mapping[str, str]] = None,
     encoding: str = "utf-8-sig",
+    usecols: Optional[Collection[str]] = None,
+    dtype: Optional[Mapping[str, Any]] = None,
+    engine: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Reads the content of a specified CSV file.
@@ -120,13 +263,142 @@ def read_file(
     :type encoding:
         string
 
+    :param usecols:
+        the columns to parse besides the index, if not None. Columns missing in the file are ignored.
+    :type usecols:
+        list
+
+    :param dtype:
+        the data types of columns, to avoid inferring them. Columns missing in the file are ignored.
+    :type dtype:
+        dict
+
+    :param engine:
+        the parser engine to use, e.g. "pyarrow" to parse the file multithreaded, if installed.
+    :type engine:
+        string
+
 
     :returns:
         the retrieved columns, indexed by their timestamp
     :rtype:
         :class:`pandas.DataFrame`
     """
-    data = pd.read_csv(path, sep=separator, decimal=decimal, encoding=encoding)
+    usecols, dtype = _get_columns(path, index_column, separator, encoding, usecols, dtype)
+    data = pd.read_csv(
+        path,
+        sep=separator,
+        decimal=decimal,
+        encoding=encoding,
+        usecols=usecols,
+        dtype=dtype,
+        engine=engine,
+    )
+    return _parse_data(data, index_column, index_type, timezone, rename)
+
+
+def _get_columns(
+    path: str,
+    index_column: str,
+    separator: str,
+    encoding: str,
+    usecols: Optional[Collection[str]] = None,
+    dtype: Optional[Mapping[str, Any]] = None,
+) -> Tuple[Optional[List[str]], Optional[Dict[str, Any]]]:
+    if usecols is None and dtype is None:
+        return None, None
+
+    # Only select columns available in the header, as the parser raises errors for missing columns
+    with open(path, "r", encoding=encoding) as file:
+        header = file.readline().rstrip("\r\n")
+    if '"' in header:
+        header = list(pd.read_csv(io.StringIO(header), sep=separator).columns)
+    else:
+        header = header.split(separator)
+    if usecols is not None:
+        usecols = [c for c in header if c in usecols or c.lower() == index_column.lower()]
+    if dtype is not None:
+        dtype = {c: t for c, t in dtype.items() if c in header and (usecols is None or c in usecols)}
+    return usecols, dtype
+
+
+def read_file_tail(
+    path: str,
+    index_column: str = "Timestamp",
+    index_type: str = "Timestamp",
+    timezone: Optional[tz.tzinfo] = None,
+    separator: str = ",",
+    decimal: str = ".",
+    rename: Optional[Mapping[str, str]] = None,
+    encoding: str = "utf-8-sig",
+) -> pd.DataFrame:
+    """
+    Reads only the last line of a specified CSV file, without parsing the whole file.
+
+    :returns:
+        the retrieved columns of the last line, indexed by its timestamp
+    :rtype:
+        :class:`pandas.DataFrame`
+    """
+    data = _read_last_line(path, separator, decimal, encoding)
+    if data is None:
+        return pd.DataFrame()
+    return _parse_data(data, index_column, index_type, timezone, rename)
+
+
+class CsvFileCache:
+    """
+    Least recently used cache of parsed CSV files, valid as long as the modification time and size of a file match.
+
+    Cached files are returned as copies, to be safe to modify by the caller.
+
+    """
+
+    __slots__ = ("_lock", "_files", "limit")
+
+    _lock: Lock
+    _files: OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], pd.DataFrame]]
+
+    limit: int
+
+    def __init__(self, limit: int = 32) -> None:
+        self._lock = Lock()
+        self._files = OrderedDict()
+        self.limit = limit
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(files={len(self._files)}, limit={self.limit})"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+
+    def read(self, path: str, **kwargs) -> pd.DataFrame:
+        # Files read with different options, like a selection of columns, are cached separately
+        key = (path, repr(sorted(kwargs.items(), key=lambda i: i[0])))
+        stat = _get_stat(path)
+        with self._lock:
+            file = self._files.get(key)
+            if file is not None and file[0] == stat:
+                self._files.move_to_end(key)
+                return file[1].copy()
+
+        data = read_file(path, **kwargs)
+        with self._lock:
+            self._files[key] = (stat, data.copy())
+            self._files.move_to_end(key)
+            while len(self._files) > self.limit:
+                self._files.popitem(last=False)
+        return data
+
+
+def _parse_data(
+    data: pd.DataFrame,
+    index_column: str = "Timestamp",
+    index_type: str = "Timestamp",
+    timezone: Optional[tz.tzinfo] = None,
+    rename: Optional[Mapping[str, str]] = None,
+) -> pd.DataFrame:
     if not data.empty:
         if index_column not in data.columns:
             if index_column.islower():
@@ -193,12 +465,12 @@ def write_files(
     elif data.index.tzinfo != timezone:
         data.index = data.index.tz_convert(timezone)
 
-    time_step = floor_date(data.index[0], freq=freq)
+    time_step = floor_date(data.index[0], timezone=timezone, freq=freq)
 
     def next_step() -> pd.Timestamp:
         return floor_date(time_step + to_timedelta(freq), timezone=timezone, freq=freq)
 
-    while time_step < data.index[-1]:
+    while time_step <= data.index[-1]:
         time_next = next_step()
 
         file = time_step.strftime(format) + ".csv"
@@ -229,6 +501,10 @@ def write_file(
         data.index = data.index.tz_convert(timezone)
 
     if not override and os.path.isfile(path):
+        # Rows strictly after the last row of the file are appended, instead of reading and rewriting the whole file
+        if _append_file(data.rename(columns=rename) if rename else data, path, separator, decimal, encoding):
+            return
+
         index = data.index.name
         csv = read_file(
             path,
@@ -236,7 +512,7 @@ def write_file(
             timezone=timezone,
             separator=separator,
             decimal=decimal,
-            rename={column: name for name, column in rename.items()} if not None else None,
+            rename={column: name for name, column in rename.items()} if rename is not None else None,
             encoding=encoding,
         )
 
@@ -244,14 +520,100 @@ def write_file(
             if all(name in list(csv.columns) for name in list(data.columns)):
                 data = data.combine_first(csv)
             else:
-                data = pd.concat([csv, data], axis="index")
+                data = pd.concat([csv, data], axis="index").sort_index()
 
     if rename:
         data = data.rename(columns=rename)
     if data.index.name is None:
         data.index.name = "timestamp"
 
+    if not os.path.isfile(path):
+        _clear_filenames(os.path.dirname(path))
     data.to_csv(path, sep=separator, decimal=decimal, encoding=encoding)
+    if not data.empty:
+        _set_tail(path, list(data.columns), data.index.max())
+
+
+def _append_file(data: pd.DataFrame, path: str, separator: str, decimal: str, encoding: str) -> bool:
+    if data.empty:
+        return False
+    tail = _get_tail(path, separator, decimal, encoding)
+    if tail is None or not all(c in tail.columns for c in data.columns):
+        return False
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index()
+    if data.index[0] <= tail.index:
+        return False
+
+    data = data.reindex(columns=tail.columns)
+    with open(path, "a", encoding=encoding, newline="") as file:
+        data.to_csv(file, sep=separator, decimal=decimal, header=False)
+
+    _set_tail(path, tail.columns, data.index[-1])
+    return True
+
+
+def _get_tail(path: str, separator: str, decimal: str, encoding: str) -> Optional[CsvTail]:
+    stat = _get_stat(path)
+    with _tails_lock:
+        tail = _tails.get(path)
+        if tail is not None and tail.stat == stat:
+            _tails.move_to_end(path)
+            return tail
+
+    data = _read_last_line(path, separator, decimal, encoding)
+    if data is None:
+        return None
+    try:
+        index = pd.to_datetime(data.iloc[0, 0], utc=True)
+    except ValueError:
+        return None
+    if pd.isna(index):
+        return None
+
+    return _set_tail(path, list(data.columns[1:]), index, stat)
+
+
+def _read_last_line(path: str, separator: str, decimal: str, encoding: str) -> Optional[pd.DataFrame]:
+    # Only read the header and the last line of the file, by reading blocks backwards from its end
+    with open(path, "rb") as file:
+        header = file.readline()
+        position = file.seek(0, os.SEEK_END)
+        block = b""
+        while position > len(header) and block.rstrip(b"\r\n").count(b"\n") < 1:
+            size = min(8192, position)
+            position = file.seek(position - size)
+            block = file.read(size) + block
+    lines = block[max(len(header) - position, 0) :].rstrip(b"\r\n").splitlines()
+    if len(lines) == 0:
+        return None
+    try:
+        header = header.decode(encoding)
+        line = lines[-1].decode(encoding)
+        if line.count(separator) != header.count(separator):
+            return None
+
+        data = pd.read_csv(io.StringIO(header + line), sep=separator, decimal=decimal)
+    except (ValueError, pd.errors.ParserError):
+        return None
+    if len(data) != 1:
+        return None
+    return data
+
+
+def _set_tail(path: str, columns: List[str], index: pd.Timestamp, stat: Optional[Tuple[int, int]] = None) -> CsvTail:
+    tail = CsvTail(stat if stat is not None else _get_stat(path), columns, index)
+    with _tails_lock:
+        _tails[path] = tail
+        _tails.move_to_end(path)
+        while len(_tails) > _tails_limit:
+            _tails.popitem(last=False)
+    return tail
+
+
+def _get_stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
 
 
 # noinspection PyShadowingBuiltins
@@ -266,29 +628,14 @@ def get_files(
 ) -> List[str]:
     end = to_date(end, timezone)
     start = to_date(start, timezone)
+    filenames = _get_filenames(path, format, timezone)
     if start is None or end is None:
-        filenames = [os.path.basename(f) for f in glob.glob(os.path.join(path, "*.csv"))]
-        if len(filenames) > 0:
-            filenames.sort()
-
-            def _validate(filename: str) -> bool:
-                try:
-                    _date = to_date(filename, timezone=timezone, format=f"{format}.csv")
-                    return True
-                except ValueError:
-                    return False
-
-            if start is None and end is None:
-                return [os.path.join(path, f) for f in filenames if _validate(f)]
-
-            if start is None:
-                start_str = filenames[0].replace(".csv", "")
-                start = to_date(start_str, timezone=timezone, format=f"{format}.csv")
-
-                if end is None:
-                    end_str = filenames[-1].replace(".csv", "")
-                    end = to_date(end_str, timezone=timezone, format=f"{format}.csv")
-                    end = ceil_date(end, timezone=timezone, freq=freq)
+        if start is None and end is None:
+            return [os.path.join(path, f) for f in filenames]
+        if start is None:
+            if len(filenames) == 0:
+                return []
+            start = to_date(filenames[0], timezone=timezone, format=f"{format}.csv")
 
     date = floor_date(start, timezone=timezone, freq=freq)
 
@@ -304,21 +651,53 @@ def get_files(
                 ResourceError(f"Unable to increment date for freq '{freq}'")
         return next_date
 
+    filenames = set(filenames)
+
     files = []
     file = date.strftime(format) + ".csv"
-    file_path = os.path.join(path, file)
-    if os.path.isfile(file_path) or not exists_only:
-        files.append(file_path)
+    if file in filenames or not exists_only:
+        files.append(os.path.join(path, file))
     if end is not None:
         date = next_date()
         while date <= end:
             file = date.strftime(format) + ".csv"
-            file_path = os.path.join(path, file)
-            if os.path.isfile(file_path) or not exists_only:
-                files.append(file_path)
+            if file in filenames or not exists_only:
+                files.append(os.path.join(path, file))
             date = next_date()
 
     # TODO: Implement or validate if custom sorting by file format is necessary
     files.sort()
 
     return files
+
+
+def _get_filenames(path: str, format: str, timezone: tz.tzinfo) -> List[str]:
+    # Directories only change their modification time, when files get added or removed
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    key = (path, format, str(timezone))
+    with _filenames_lock:
+        filenames = _filenames.get(key)
+        if filenames is not None and filenames[0] == mtime:
+            return filenames[1]
+
+    def _validate(filename: str) -> bool:
+        try:
+            to_date(filename, timezone=timezone, format=f"{format}.csv")
+            return True
+        except ValueError:
+            return False
+
+    filenames = sorted(f for f in (os.path.basename(f) for f in glob.glob(os.path.join(path, "*.csv"))) if _validate(f))
+    with _filenames_lock:
+        _filenames[key] = (mtime, filenames)
+    return filenames
+
+
+def _clear_filenames(path: str) -> None:
+    # Modification times of directories may not be granular enough, to notice files created in quick succession
+    with _filenames_lock:
+        for key in [k for k in _filenames.keys() if k[0] == path]:
+            del _filenames[key]